@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+    Timings of the kernels for multiplying row vectors by a 3x3 matrix, to
+    find the crossover points used by
+    :func:`python_geometry.transformations._multiply`.
+
+    Run with ``python benchmarks/benchmark_transformations.py``.
+
+"""
+from __future__ import division, print_function
+
+import timeit
+
+from numpy import dot, einsum, float32, int64, matmul
+from numpy.random import RandomState
+
+from python_geometry.transformations import AffineTransformation
+
+
+SIZES = [1, 10, 100, 1000, 10**4, 10**5, 10**6]
+
+
+def _hand_rolled(vectors, matrix):
+    x, y, z = vectors.tolist()
+    m = matrix.tolist()
+    return [
+        x*m[0][0] + y*m[1][0] + z*m[2][0],
+        x*m[0][1] + y*m[1][1] + z*m[2][1],
+        x*m[0][2] + y*m[1][2] + z*m[2][2]]
+
+
+KERNELS = [
+    ('einsum', lambda v, m: einsum('...i,ij->...j', v, m)),
+    ('einsum optimize', lambda v, m: einsum(
+        '...i,ij->...j', v, m, optimize=True)),
+    ('dot', lambda v, m: dot(v, m)),
+    ('matmul', lambda v, m: matmul(v.reshape(-1, 3), m)),
+]
+
+
+def time_call(function, *arguments):
+    # Best of three runs of about 0.1 s each, in seconds per call
+    timer = timeit.Timer(lambda: function(*arguments))
+    number = max(1, int(0.1 / max(timer.timeit(1), 1e-7)))
+    return min(timer.repeat(3, number)) / number
+
+
+def print_table(title, make_vectors, matrix):
+    transformation = AffineTransformation(*matrix)
+    names = [name for name, _ in KERNELS] + ['pushforward']
+    print(title)
+    print(' '*10 + ''.join('{:>17}'.format(name) for name in names))
+    for size in SIZES:
+        vectors = make_vectors(size)
+        timings = [time_call(kernel, vectors, matrix) for _, kernel in KERNELS]
+        timings.append(time_call(transformation.pushforward, vectors))
+        print('{:>10}'.format(size) + ''.join(
+            '{:>15.2f}us'.format(1e6*timing) for timing in timings))
+    print()
+
+
+def main():
+    random_state = RandomState(0)
+    matrix = random_state.rand(3, 3)
+
+    print_table(
+        'float64, C-contiguous (N, 3)',
+        lambda size: random_state.rand(size, 3),
+        matrix)
+    print_table(
+        'float64, transposed (N, 3) view',
+        lambda size: random_state.rand(3, size).T,
+        matrix)
+    print_table(
+        'float32, C-contiguous (N, 3)',
+        lambda size: random_state.rand(size, 3).astype(float32),
+        matrix.astype(float32))
+    print_table(
+        'int64, C-contiguous (N, 3)',
+        lambda size: random_state.randint(-9, 9, (size, 3)).astype(int64),
+        random_state.randint(-9, 9, (3, 3)).astype(int64))
+
+    vector = random_state.rand(3)
+    print('single vector')
+    for name, kernel in KERNELS + [('hand rolled', _hand_rolled)]:
+        print('{:>17}{:>15.2f}us'.format(
+            name, 1e6*time_call(kernel, vector, matrix)))
+
+
+if __name__ == '__main__':
+    main()
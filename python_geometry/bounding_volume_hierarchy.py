@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+    This module implements a bounding volume hierarchy to quickly find
+    candidates for intersections within collections of objects.
+
+    .. versionadded:: 0.4
+
+"""
+from numpy import (
+    all, arange, argmax, argpartition, array, asanyarray, concatenate, cumsum,
+    empty, int64, lexsort, repeat, zeros)
+
+from .bound_vector import BoundVector
+from .config import config
+from .line_segment import LineSegment
+from .simple_polygon import SimplePolygon
+from .utilities import (
+    INTERSECTION_NONE, get_intersection,
+    get_intersections_bound_vectors_bound_vectors)
+
+
+__all__ = ['BoundingVolumeHierarchy']
+
+
+def _get_bounding_box(object_):
+    if isinstance(object_, BoundVector):
+        points = [object_.initial_point, object_.terminal_point]
+    elif isinstance(object_, LineSegment):
+        points = [object_.end_point_0, object_.end_point_1]
+    elif isinstance(object_, SimplePolygon):
+        points = object_.vertices
+    else:
+        raise NotImplementedError(
+            'Bounding box of a {} is not yet implemented.'.format(
+                object_.__class__.__name__))
+    points = asanyarray(points)
+    return points.min(axis=0), points.max(axis=0)
+
+
+def _get_bounding_boxes(objects):
+    lower = empty((len(objects), 3))
+    upper = empty((len(objects), 3))
+    for i, object_ in enumerate(objects):
+        lower[i], upper[i] = _get_bounding_box(object_)
+    return lower, upper
+
+
+class BoundingVolumeHierarchy(object):
+    """Bounding volume hierarchy of axis-aligned bounding boxes.
+
+    The hierarchy is built once and can be queried any number of times.
+    Candidate pairs are found by overlapping bounding boxes before the exact
+    intersection is computed for them only.
+
+    Parameters
+    ----------
+    objects
+        Sequence of :class:`~python_geometry.bound_vector.BoundVector`,
+        :class:`~python_geometry.line_segment.LineSegment` or
+        :class:`~python_geometry.simple_polygon.SimplePolygon` objects.
+    leaf_size
+        Maximum number of objects per leaf.
+
+    """
+
+    def __init__(self, objects, leaf_size=4):
+        self.objects = list(objects)
+        self.lower, self.upper = _get_bounding_boxes(self.objects)
+        self.leaf_size = leaf_size
+        self._bound_vector_arrays = None
+        self._build()
+
+    def _build(self):
+        self._order = arange(len(self.objects))
+        node_lower = []
+        node_upper = []
+        children = []
+        ranges = []
+        centers = (self.lower + self.upper) / 2
+
+        def build(start, stop):
+            node = len(children)
+            indices = self._order[start:stop]
+            node_lower.append(self.lower[indices].min(axis=0))
+            node_upper.append(self.upper[indices].max(axis=0))
+            children.append([-1, -1])
+            ranges.append([start, stop])
+            if stop - start > self.leaf_size:
+                # Split at the median center along the longest extent
+                extent = (
+                    centers[indices].max(axis=0) -
+                    centers[indices].min(axis=0))
+                axis = argmax(extent)
+                middle = (stop - start) // 2
+                self._order[start:stop] = indices[argpartition(
+                    centers[indices, axis], middle)]
+                children[node] = [
+                    build(start, start + middle),
+                    build(start + middle, stop)]
+            return node
+
+        if len(self.objects):
+            build(0, len(self.objects))
+        self._node_lower = array(node_lower).reshape(-1, 3)
+        self._node_upper = array(node_upper).reshape(-1, 3)
+        self._children = array(children, dtype=int64).reshape(-1, 2)
+        self._ranges = array(ranges, dtype=int64).reshape(-1, 2)
+
+    def query_overlaps(self, other):
+        """Find all pairs of objects with overlapping bounding boxes.
+
+        Parameters
+        ----------
+        other
+            Another :class:`BoundingVolumeHierarchy` or a sequence of
+            objects.
+
+        Returns
+        -------
+        np.ndarray
+            (K, 2) array of indices into this hierarchy and into `other`,
+            sorted lexicographically.
+
+        """
+        if isinstance(other, BoundingVolumeHierarchy):
+            query_lower, query_upper = other.lower, other.upper
+        else:
+            query_lower, query_upper = _get_bounding_boxes(list(other))
+        atol = config['numbers_close_kwargs']['atol']
+        query_lower = query_lower - atol
+        query_upper = query_upper + atol
+
+        if len(self._children) == 0:
+            return zeros((0, 2), dtype=int64)
+
+        # All queries descend the hierarchy simultaneously
+        nodes = zeros(len(query_lower), dtype=int64)
+        queries = arange(len(query_lower))
+        found_objects = []
+        found_queries = []
+        while len(nodes):
+            mask = (
+                all(self._node_lower[nodes] <= query_upper[queries], axis=1) &
+                all(self._node_upper[nodes] >= query_lower[queries], axis=1))
+            nodes = nodes[mask]
+            queries = queries[mask]
+
+            is_leaf = self._children[nodes, 0] < 0
+            starts, stops = self._ranges[nodes[is_leaf]].T
+            counts = stops - starts
+            objects = self._order[
+                repeat(starts - cumsum(counts) + counts, counts) +
+                arange(counts.sum())]
+            leaf_queries = repeat(queries[is_leaf], counts)
+            mask = (
+                all(self.lower[objects] <= query_upper[leaf_queries], axis=1) &
+                all(self.upper[objects] >= query_lower[leaf_queries], axis=1))
+            found_objects.append(objects[mask])
+            found_queries.append(leaf_queries[mask])
+
+            nodes = self._children[nodes[~is_leaf]].T.reshape(-1)
+            queries = concatenate([queries[~is_leaf]]*2)
+
+        found_objects = concatenate(found_objects)
+        found_queries = concatenate(found_queries)
+        order = lexsort([found_queries, found_objects])
+        return array(
+            [found_objects[order], found_queries[order]],
+            dtype=int64).T.reshape(-1, 2)
+
+    def query_intersections(self, other):
+        """Find all pairs of intersecting objects.
+
+        Parameters
+        ----------
+        other
+            Another :class:`BoundingVolumeHierarchy` or a sequence of
+            objects.
+
+        Returns
+        -------
+        pairs : np.ndarray
+            (K, 2) array of indices into this hierarchy and into `other`.
+        intersections : list
+            The intersection of every pair as returned by
+            :func:`~python_geometry.utilities.get_intersection`.
+
+        Notes
+        -----
+        Intersections involving
+        :class:`~python_geometry.simple_polygon.SimplePolygon` objects are
+        not implemented yet. Such pairs are returned whenever their bounding
+        boxes overlap, as in :meth:`query_overlaps`, with an intersection of
+        ``None``.
+
+        """
+        other_objects = (
+            other.objects if isinstance(other, BoundingVolumeHierarchy)
+            else list(other))
+        pairs = self.query_overlaps(other)
+
+        if _are_bound_vectors(self.objects) and _are_bound_vectors(
+                other_objects):
+            if self._bound_vector_arrays is None:
+                self._bound_vector_arrays = _get_bound_vector_arrays(
+                    self.objects)
+            arrays = self._bound_vector_arrays
+            if isinstance(other, BoundingVolumeHierarchy):
+                if other._bound_vector_arrays is None:
+                    other._bound_vector_arrays = _get_bound_vector_arrays(
+                        other_objects)
+                other_arrays = other._bound_vector_arrays
+            else:
+                other_arrays = _get_bound_vector_arrays(other_objects)
+            batch = get_intersections_bound_vectors_bound_vectors(
+                *[a[pairs[:, 0]] for a in arrays[:2]] +
+                [a[pairs[:, 1]] for a in other_arrays[:2]] +
+                [a[pairs[:, 0]] for a in arrays[2:]] +
+                [a[pairs[:, 1]] for a in other_arrays[2:]])
+            mask = batch.kind != INTERSECTION_NONE
+            return pairs[mask], [batch.get(i) for i in mask.nonzero()[0]]
+
+        mask = zeros(len(pairs), dtype=bool)
+        intersections = []
+        for k, (i, j) in enumerate(pairs.tolist()):
+            try:
+                intersection = get_intersection(
+                    self.objects[i], other_objects[j])
+            except NotImplementedError:
+                # Candidates without an exact test are kept
+                mask[k] = True
+                intersections.append(None)
+            else:
+                if intersection is not None:
+                    mask[k] = True
+                    intersections.append(intersection)
+        return pairs[mask], intersections
+
+
+def _are_bound_vectors(objects):
+    return all([isinstance(object_, BoundVector) for object_ in objects])
+
+
+def _get_bound_vector_arrays(bound_vectors):
+    return (
+        array([b.initial_point for b in bound_vectors]).reshape(-1, 3),
+        array([b.terminal_point for b in bound_vectors]).reshape(-1, 3),
+        array([b.initial_point_included for b in bound_vectors], dtype=bool),
+        array([b.terminal_point_included for b in bound_vectors], dtype=bool))
@@ -4,5 +4,7 @@ config = {
         'rtol': 1e-5,
         'atol': 1e-8,
         'equal_nan': False
-    }
+    },
+    'chunk_size': 2**16,
+    'cache_polygon_properties': True
 }
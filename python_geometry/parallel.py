@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+    This module implements running batch jobs in chunks on a pool of worker
+    processes.
+
+    .. versionadded:: 0.4
+
+"""
+from __future__ import division
+
+from multiprocessing import Pool
+
+from numpy import concatenate, cumsum, int64, linspace, searchsorted, unique
+
+from .config import config
+
+
+__all__ = ['get_chunk_bounds', 'parallel_map']
+
+
+def parallel_map(function, arguments, workers=None):
+    """Apply a function to several tuples of arguments.
+
+    Parameters
+    ----------
+    function
+        Function defined at module level, so that it can be sent to worker
+        processes.
+    arguments
+        Sequence of tuples of positional arguments.
+    workers
+        Number of worker processes. With ``None`` or 1 everything runs in
+        the calling process. The workers use the calling process'
+        `config`, whatever the start method of the processes.
+
+    Returns
+    -------
+    list
+        The results in the order of `arguments`, regardless of the order in
+        which the workers finish.
+
+    """
+    arguments = [tuple(chunk_arguments) for chunk_arguments in arguments]
+    if workers is None or workers <= 1 or len(arguments) <= 1:
+        return [function(*chunk_arguments) for chunk_arguments in arguments]
+    # Workers started by spawn or forkserver import a fresh config, so they
+    # are given the caller's
+    pool = Pool(
+        min(workers, len(arguments)),
+        initializer=_set_config, initargs=(dict(config),))
+    try:
+        return pool.map(
+            _apply,
+            [(function,) + chunk_arguments for chunk_arguments in arguments],
+            chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def get_chunk_bounds(sizes, workers):
+    """Divide items into contiguous chunks of about the same total size.
+
+    There are as many chunks as workers, or more if they would be larger
+    than ``config['chunk_size']``, but never more chunks than items. Without
+    items there is one empty chunk.
+
+    Parameters
+    ----------
+    sizes
+        (N,) array of the sizes of the items, e.g. the numbers of vertices
+        of polygons.
+    workers
+        Number of worker processes.
+
+    Returns
+    -------
+    np.ndarray
+        Indices of the first item of every chunk followed by N.
+
+    """
+    cumulative_sizes = concatenate([[0], cumsum(sizes, dtype=int64)])
+    chunk_count = max(
+        workers or 1,
+        -(-cumulative_sizes[-1] // config['chunk_size']))
+    bounds = unique(searchsorted(
+        cumulative_sizes,
+        linspace(0, cumulative_sizes[-1], chunk_count + 1)[1:-1]))
+    item_count = len(cumulative_sizes) - 1
+    return concatenate([
+        [0],
+        bounds[(bounds > 0) & (bounds < item_count)],
+        [item_count]]).astype(int64)
+
+
+def _apply(arguments):
+    return arguments[0](*arguments[1:])
+
+
+def _set_config(caller_config):
+    config.clear()
+    config.update(caller_config)
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
+from __future__ import division
+
 import re
 from itertools import tee
 
-from numpy import all, allclose, asanyarray, isclose, copy, roll, where
+from numpy import (
+    all, allclose, asanyarray, isclose, copy, cross, ndarray, roll, stack,
+    where)
+from numpy.linalg import norm
 
 from .config import config
 from .utilities import get_normal_vector
@@ -16,9 +21,24 @@ def _pairwise(iterable):
 
 
 class SimplePolygon(object):
+    """Polygon without self-intersections given by its vertices.
+
+    Parameters
+    ----------
+    vertices
+        (n, 3) array of the vertices in order around the polygon.
+
+    Notes
+    -----
+    With ``config['cache_polygon_properties']`` set, the array properties
+    are computed once and shared by all callers, so they are read-only;
+    modify a copy instead. Setting `vertices` anew clears them.
+
+    """
 
     def __init__(self, vertices):
         self._vertices = None
+        self._cache = {}
 
         self.vertices = vertices
 
@@ -29,12 +49,74 @@ class SimplePolygon(object):
     @vertices.setter
     def vertices(self, value):
         self._vertices = asanyarray(value)
+        # Modifying the vertices in place does not invalidate the cache, they
+        # have to be set anew
+        self._cache = {}
+
+    def _get_cached(self, name, compute):
+        if not config['cache_polygon_properties']:
+            return compute()
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = compute()
+            if isinstance(value, ndarray):
+                # Cached arrays are shared by all callers
+                value.setflags(write=False)
+            self._cache[name] = value
+            return value
 
     @property
     def normal_vector(self):
+        """Unit normal vector of the polygon."""
+        return self._get_cached('normal_vector', self._get_normal_vector)
+
+    def _get_normal_vector(self):
         vertex_list = self.vertices.tolist()
         return get_normal_vector(vertex_list + [vertex_list[0]])
 
+    @property
+    def edge_vectors(self):
+        """(n, 3) array of the vectors from each vertex to the next."""
+        return self._get_cached(
+            'edge_vectors',
+            lambda: roll(self.vertices, -1, axis=0) - self.vertices)
+
+    @property
+    def edges(self):
+        """(n, 2, 3) array of the initial and terminal points of all edges,
+        an array-backed alternative to `bound_vectors`.
+
+        """
+        return self._get_cached(
+            'edges',
+            lambda: stack(
+                [self.vertices, roll(self.vertices, -1, axis=0)], axis=1))
+
+    @property
+    def bounds(self):
+        """(2, 3) array of the minimum and maximum vertex coordinates."""
+        return self._get_cached(
+            'bounds',
+            lambda: stack(
+                [self.vertices.min(axis=0), self.vertices.max(axis=0)]))
+
+    @property
+    def vector_area(self):
+        """Normal to the polygon with the length of its area, oriented along
+        the vertex order.
+
+        """
+        return self._get_cached(
+            'vector_area',
+            lambda: cross(
+                self.vertices,
+                roll(self.vertices, -1, axis=0)).sum(axis=0) / 2)
+
+    @property
+    def area(self):
+        return self._get_cached('area', lambda: norm(self.vector_area))
+
     @property
     def bound_vectors(self):
         for initial_point, terminal_point in _pairwise(self.vertices):
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+    This module implements a container for large numbers of simple polygons
+    that stores all vertices in one flat buffer.
+
+    .. versionadded:: 0.4
+
+"""
+from __future__ import division
+
+import re
+
+from numpy import (
+    arange, asanyarray, bincount, concatenate, cross, cumsum, diff, full,
+    int64, isclose, maximum, minimum, nan, newaxis, repeat, stack, zeros)
+from numpy.linalg import norm
+
+from .simple_polygon import SimplePolygon
+
+
+__all__ = ['SimplePolygonArray']
+
+
+class SimplePolygonArray(object):
+    """Packed ragged array of simple polygons.
+
+    The vertices of all polygons are stored in one (total_vertices, 3) array.
+    Polygon ``i`` consists of the vertices ``offsets[i]:offsets[i + 1]``.
+
+    Parameters
+    ----------
+    vertices
+        (total_vertices, 3) array of the vertices of all polygons.
+    offsets
+        (N + 1,) array of non-decreasing indices into `vertices`, starting
+        at 0 and ending at ``total_vertices``.
+
+    """
+
+    def __init__(self, vertices, offsets):
+        vertices = asanyarray(vertices, dtype=float).reshape(-1, 3)
+        offsets = asanyarray(offsets, dtype=int64)
+        if (
+                offsets.ndim != 1 or len(offsets) == 0 or
+                offsets[0] != 0 or offsets[-1] != len(vertices) or
+                (diff(offsets) < 0).any()):
+            raise ValueError(
+                'Offsets have to increase from 0 to the number of vertices.')
+        self.vertices = vertices
+        self.offsets = offsets
+
+    @classmethod
+    def from_polygons(cls, polygons):
+        """Pack a sequence of :class:`SimplePolygon` objects."""
+        polygon_vertices = [
+            asanyarray(polygon.vertices, dtype=float).reshape(-1, 3)
+            for polygon in polygons]
+        counts = [len(vertices) for vertices in polygon_vertices]
+        return cls(
+            vertices=concatenate(polygon_vertices + [zeros((0, 3))]),
+            offsets=concatenate([[0], cumsum(counts, dtype=int64)]))
+
+    def to_polygons(self):
+        """Unpack into a list of :class:`SimplePolygon` objects.
+
+        The vertices of the polygons are views into :attr:`vertices`.
+
+        """
+        return list(self)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Polygon index out of range.')
+        return SimplePolygon(
+            self.vertices[self.offsets[index]:self.offsets[index + 1]])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def counts(self):
+        """Number of vertices of every polygon."""
+        return diff(self.offsets)
+
+    @property
+    def polygon_indices(self):
+        """Index of the polygon of every vertex."""
+        return repeat(arange(len(self)), self.counts)
+
+    @property
+    def next_vertex_indices(self):
+        """Index of the next vertex along every polygon's boundary."""
+        next_indices = arange(1, len(self.vertices) + 1)
+        nonempty = self.counts > 0
+        next_indices[self.offsets[1:][nonempty] - 1] = (
+            self.offsets[:-1][nonempty])
+        return next_indices
+
+    @property
+    def normal_vectors(self):
+        """(N, 3) array of the normal vectors of all polygons.
+
+        They equal
+        :attr:`~python_geometry.simple_polygon.SimplePolygon.normal_vector`
+        of each polygon up to round off, which is the normalized mean of the
+        cross products of consecutive edges.
+
+        """
+        next_indices = self.next_vertex_indices
+        edges = self.vertices[next_indices] - self.vertices
+        crosses = cross(edges, edges[next_indices])
+        # The cross product of the last and the first edge is not included
+        crosses[self.offsets[1:][self.counts > 0] - 1] = 0
+        normal_vectors = self._sum(crosses)
+        counts = self.counts
+        has_crosses = counts > 1
+        normal_vectors[has_crosses] /= (counts[has_crosses] - 1)[:, newaxis]
+        is_zero = isclose(normal_vectors, 0).all(axis=1)
+        normal_vectors[is_zero] = 0
+        normal_vectors[~is_zero] /= norm(
+            normal_vectors[~is_zero], axis=1)[:, newaxis]
+        return normal_vectors
+
+    @property
+    def vector_areas(self):
+        """(N, 3) array of the vector areas of all polygons."""
+        return self._sum(
+            cross(self.vertices, self.vertices[self.next_vertex_indices])) / 2
+
+    @property
+    def areas(self):
+        """(N,) array of the areas of all polygons."""
+        return norm(self.vector_areas, axis=1)
+
+    @property
+    def bounds(self):
+        """(N, 2, 3) array of the lower and upper corners of the bounding
+        boxes of all polygons.
+
+        Polygons without vertices have bounds of NaN.
+
+        """
+        lower = full((len(self), 3), nan)
+        upper = full((len(self), 3), nan)
+        nonempty = self.counts > 0
+        starts = self.offsets[:-1][nonempty]
+        if len(starts):
+            lower[nonempty] = minimum.reduceat(self.vertices, starts, axis=0)
+            upper[nonempty] = maximum.reduceat(self.vertices, starts, axis=0)
+        return stack([lower, upper], axis=1)
+
+    def _sum(self, values):
+        # Sum of (total_vertices, 3) values per polygon
+        polygon_indices = self.polygon_indices
+        sums = zeros((len(self), 3))
+        for axis in range(3):
+            sums[:, axis] = bincount(
+                polygon_indices, weights=values[:, axis], minlength=len(self))
+        return sums
+
+    def __repr__(self):
+        return re.sub(r'\s+', ' ', (
+            '{self.__class__.__name__}('
+            'vertices={self.vertices!r}, '
+            'offsets={self.offsets!r}'
+            ')').format(self=self))
@@ -1,114 +1,1103 @@
 # -*- coding: utf-8 -*-
-from itertools import chain
-from copy import copy
+from collections import defaultdict, namedtuple
+from itertools import groupby
+from operator import itemgetter
 
-from numpy import allclose, int32, mean, sign
+from numpy import (
+    all, arange, argsort, array, asanyarray, bincount, broadcast_to,
+    concatenate, count_nonzero, cross, cumsum, diff, dot, errstate, identity,
+    int32, int64, isclose, lexsort, maximum, minimum, nan_to_num, newaxis,
+    ones, repeat, roll, searchsorted, sign, split, stack, where, zeros,
+    zeros_like)
+from numpy.linalg import norm
 
-from .simple_polygon import SimplePolygon
-from .utilities import get_intersection
-from .config import config
 from .bound_vector import BoundVector
 from .line_segment import LineSegment
+from .simple_polygon import SimplePolygon
+from .simple_polygon_array import SimplePolygonArray
+from .config import config
+from .parallel import get_chunk_bounds, parallel_map
+from .utilities import get_intersections_segments_planes
+
 
+SplitSegments = namedtuple('SplitSegments', [
+    'end_points_0', 'end_points_1', 'end_points_0_included',
+    'end_points_1_included', 'source_indices', 'sides'])
 
-def split_by_plane(object_to_split, plane):
+
+SIDE_NEGATIVE = -1
+SIDE_IN_PLANE = 0
+SIDE_POSITIVE = 1
+SIDE_BOTH = 2
+
+
+def split_by_plane(object_to_split, plane, workers=None):
+    # A single polygon yields a list of polygons. A sequence of polygons or a
+    # SimplePolygonArray yields a list of polygons and the index of the
+    # polygon each of them stems from. Those are split in chunks, by as many
+    # worker processes as given. Bound vectors and line segments are split
+    # likewise.
     if isinstance(object_to_split, SimplePolygon):
         split_objects = _split_polygon_by_plane(
             polygon_to_split=object_to_split,
             plane=plane)
+    elif isinstance(object_to_split, (BoundVector, LineSegment)):
+        split_objects = _split_segment_objects_by_plane(
+            [object_to_split], plane)[0]
+    elif isinstance(object_to_split, (list, tuple)) and any(
+            isinstance(object_, (BoundVector, LineSegment))
+            for object_ in object_to_split):
+        if not all([
+                isinstance(object_, (BoundVector, LineSegment))
+                for object_ in object_to_split]):
+            raise NotImplementedError(
+                'Splitting a mix of segments and other objects by a plane '
+                'is not yet implemented.')
+        split_objects = _split_segment_objects_by_plane(
+            object_to_split, plane, workers)
+    elif isinstance(object_to_split, (SimplePolygonArray, list, tuple)):
+        split_objects = _split_polygons_by_plane(
+            polygons_to_split=object_to_split,
+            plane=plane,
+            workers=workers)
     else:
         raise NotImplementedError(
-            'Splitting a "{}" by a plane is not yet implemented.')
+            'Splitting a "{}" by a plane is not yet implemented.'.format(
+                object_to_split.__class__.__name__))
     return split_objects
 
 
-def _split_polygon_by_plane(polygon_to_split, plane):
-    vertices_list = [[]]
-    for bound_vector in polygon_to_split.bound_vectors:
-        intersection = get_intersection(bound_vector, plane)
-        if (
-                isinstance(intersection, BoundVector) or
-                isinstance(intersection, LineSegment)):
-            continue
+def split_segments_by_plane(
+        segments,
+        plane,
+        initial_points_included=True,
+        terminal_points_included=True,
+        workers=None):
+    # Splits each of the N segments, given as (N, 2, 3) array of initial and
+    # terminal points, where it crosses the plane, following
+    # _get_intersection_bound_vector_plane. Segments merely touching the
+    # plane with an end point or lying in it are not split. The pieces keep
+    # the direction and the inclusion flags of the original end points, the
+    # points on the plane are included in both pieces. They are returned in
+    # the order of the segments as SplitSegments along with the index of the
+    # segment and the side of the plane every piece stems from.
+    segments = asanyarray(segments, dtype=float).reshape(-1, 2, 3)
+    initial_points_included = broadcast_to(
+        asanyarray(initial_points_included, dtype=bool), segments.shape[:1])
+    terminal_points_included = broadcast_to(
+        asanyarray(terminal_points_included, dtype=bool), segments.shape[:1])
+    chunk_bounds = get_chunk_bounds(
+        ones(len(segments), dtype=int64), workers)
+    results = parallel_map(
+        _split_segments_by_plane,
+        [
+            (
+                segments[start:stop],
+                initial_points_included[start:stop],
+                terminal_points_included[start:stop],
+                plane)
+            for start, stop in zip(chunk_bounds[:-1], chunk_bounds[1:])],
+        workers)
+    for start, result in zip(chunk_bounds.tolist(), results):
+        result.source_indices[:] += start
+    return SplitSegments(*[concatenate(field) for field in zip(*results)])
 
-        vertices_list[-1].append(bound_vector.initial_point)
 
-        # If there is no intersection we do not have to take any further
-        # actions
-        if intersection is None:
-            continue
+def iter_split_by_plane(polygons, plane, chunk_size=None):
+    # Lazily splits a SimplePolygonArray, whose vertices may be a memory
+    # mapped array, or an iterable of SimplePolygon and SimplePolygonArray
+    # objects. Chunks of about chunk_size vertices are split at a time and
+    # each yields a SimplePolygonArray of the resulting polygons and the
+    # indices of the polygons they stem from, counted over the whole input.
+    if chunk_size is None:
+        chunk_size = config['chunk_size']
+    if isinstance(polygons, SimplePolygonArray):
+        chunks = _iter_array_chunks(polygons, chunk_size)
+    else:
+        chunks = _iter_chunks(polygons, chunk_size)
 
-        # If the initial point coincides with the intersection we do not have
-        # to do anything
-        if allclose(
-                bound_vector.initial_point,
-                intersection,
-                **config['numbers_close_kwargs']):
-            continue
+    first_index = 0
+    for vertices, offsets in chunks:
+        result = _split_packed_polygons_by_plane(vertices, offsets, plane)
+        yield (
+            _gather_fragments(vertices, offsets, *result),
+            first_index + result[0])
+        first_index += len(offsets) - 1
+
+
+def classify_by_plane(object_to_classify, plane):
+    # Side of the plane a polygon lies on as one of the SIDE_* codes, or an
+    # array of them for a sequence of polygons or a SimplePolygonArray.
+    # Polygons touching the plane belong to the side of their other vertices,
+    # polygons with vertices on both sides get SIDE_BOTH. Nothing is split.
+    polygon_array = _as_polygon_array(object_to_classify, 'Classifying')
+    codes = _classify_polygons(
+        polygon_array, _get_sides(plane.distance(polygon_array.vertices)))
+    if isinstance(object_to_classify, SimplePolygon):
+        return int(codes[0])
+    return codes
+
+
+def area_split_by_plane(object_to_split, plane):
+    # Areas of a polygon on the negative side of the plane, in the plane and
+    # on the positive side, i.e. by SIDE_* code + 1, as the polygons
+    # split_by_plane would return have them. A sequence of polygons or a
+    # SimplePolygonArray yields an (N, 3) array. No fragments are built.
+    polygon_array = _as_polygon_array(object_to_split, 'Splitting')
+    distances = plane.distance(polygon_array.vertices)
+    sides = _get_sides(distances)
+    codes = _classify_polygons(polygon_array, sides)
+    vector_areas = polygon_array.vector_areas
+    polygon_areas = norm(vector_areas, axis=1)
+
+    areas = zeros((len(polygon_array), 3))
+    whole = (codes != SIDE_BOTH).nonzero()[0]
+    areas[whole, codes[whole] + 1] = polygon_areas[whole]
+    # Straddling polygons without area, e.g. collinear slivers, have no
+    # normal and keep zero areas on both sides
+    straddling_mask = (codes == SIDE_BOTH) & (polygon_areas != 0)
+    straddling = straddling_mask.nonzero()[0]
+    if len(straddling):
+        vertex_mask = straddling_mask[polygon_array.polygon_indices]
+        positive_areas = minimum(
+            _get_positive_areas(
+                SimplePolygonArray(
+                    polygon_array.vertices[vertex_mask],
+                    concatenate([
+                        [0], cumsum(polygon_array.counts[straddling])])),
+                distances[vertex_mask],
+                sides[vertex_mask],
+                vector_areas[straddling] /
+                polygon_areas[straddling, newaxis],
+                plane),
+            polygon_areas[straddling])
+        areas[straddling, 0] = polygon_areas[straddling] - positive_areas
+        areas[straddling, 2] = positive_areas
+
+    if isinstance(object_to_split, SimplePolygon):
+        return areas[0]
+    return areas
+
+
+def split_by_parallel_planes(
+        object_to_split, normal_vector, offsets, workers=None):
+    # Splits by all planes {x: dot(x, normal_vector) = offset} at once. The
+    # fragments between offsets[j - 1] and offsets[j] get the slab index j.
+    # A single polygon yields the fragments and their slab indices, a
+    # sequence of polygons or a SimplePolygonArray additionally the index of
+    # the polygon each fragment stems from in between.
+    normal_vector = asanyarray(normal_vector, dtype=float)
+    offsets = asanyarray(offsets, dtype=float).reshape(-1)
+    if (diff(offsets) <= 0).any():
+        raise ValueError('Offsets have to be strictly increasing.')
+
+    if isinstance(object_to_split, SimplePolygon):
+        split_objects = []
+        slab_indices = []
+        _split_polygon_by_parallel_planes(
+            object_to_split,
+            object_to_split.vertices.dot(normal_vector),
+            normal_vector,
+            offsets,
+            split_objects,
+            slab_indices)
+        return split_objects, array(slab_indices, dtype=int64)
+    elif isinstance(object_to_split, (SimplePolygonArray, list, tuple)):
+        split_objects, source_indices, (slab_indices,) = _split_polygons(
+            object_to_split,
+            _split_packed_polygons_by_parallel_planes,
+            (normal_vector, offsets),
+            workers)
+        return split_objects, source_indices, slab_indices
+    raise NotImplementedError(
+        'Splitting a "{}" by planes is not yet implemented.'.format(
+            object_to_split.__class__.__name__))
+
+
+def split_by_grid(object_to_split, origin, spacing, shape, workers=None):
+    # Clips polygons to the cells of a regular grid of the given shape whose
+    # first cell has its lower corner at origin. Cell (i, j, k) holds the
+    # points with origin + (i, j, k)*spacing <= x < origin + (i + 1, j + 1,
+    # k + 1)*spacing, parts outside of the grid are dropped. A single
+    # polygon yields the fragments and their (K, 3) cell indices, a sequence
+    # of polygons or a SimplePolygonArray additionally the index of the
+    # polygon each fragment stems from in between.
+    origin = asanyarray(origin, dtype=float).reshape(3)
+    spacing = broadcast_to(asanyarray(spacing, dtype=float), (3,))
+    shape = broadcast_to(asanyarray(shape, dtype=int64), (3,))
+    if (spacing <= 0).any() or (shape <= 0).any():
+        raise ValueError('Spacing and shape have to be positive.')
+
+    if isinstance(object_to_split, SimplePolygon):
+        split_objects = [object_to_split]
+    elif isinstance(object_to_split, (SimplePolygonArray, list, tuple)):
+        split_objects = object_to_split
+    else:
+        raise NotImplementedError(
+            'Splitting a "{}" by a grid is not yet implemented.'.format(
+                object_to_split.__class__.__name__))
+
+    # Each axis is done in one pass over the planes bounding its cells, which
+    # only cut a polygon where it extends beyond one cell
+    source_indices = arange(len(split_objects))
+    cell_indices = zeros((len(split_objects), 0), dtype=int64)
+    for axis in range(3):
+        split_objects, fragment_sources, slab_indices = (
+            split_by_parallel_planes(
+                split_objects,
+                normal_vector=identity(3)[axis],
+                offsets=origin[axis] + spacing[axis]*arange(shape[axis] + 1),
+                workers=workers))
+        inside = (slab_indices > 0) & (slab_indices <= shape[axis])
+        split_objects = [
+            split_object for split_object, is_inside in zip(
+                split_objects, inside.tolist()) if is_inside]
+        source_indices = source_indices[fragment_sources[inside]]
+        cell_indices = concatenate([
+            cell_indices[fragment_sources[inside]],
+            slab_indices[inside, newaxis] - 1], axis=1)
+
+    if isinstance(object_to_split, SimplePolygon):
+        return split_objects, cell_indices
+    return split_objects, source_indices, cell_indices
+
+
+class BinarySpacePartitioningTree(object):
+    """Binary space partitioning of polygons by successive plane splits.
+
+    Every inner node holds a plane, its first child the half space on the
+    negative and its second child the half space on the positive side of
+    it. Points and polygons in a plane are assigned to its positive side.
+    Leaves hold the fragments of the polygons within their cell.
+
+    Parameters
+    ----------
+    polygons
+        Sequence of :class:`~python_geometry.simple_polygon.SimplePolygon`
+        objects to partition.
+    planes
+        Sequence of :class:`~python_geometry.plane.Plane` objects inserted
+        in order, see :meth:`insert_plane`.
+
+    """
+
+    def __init__(self, polygons=(), planes=()):
+        self.polygons = list(polygons)
+        self.planes = []
+        self._node_planes = [None]
+        self._children = [[-1, -1]]
+        # The fragments of all leaves share one vertex buffer
+        self._fragments = list(self.polygons)
+        self._fragment_array = SimplePolygonArray.from_polygons(
+            self._fragments)
+        self._fragment_leaves = zeros(len(self._fragments), dtype=int64)
+        self._source_indices = arange(len(self._fragments))
+        for plane in planes:
+            self.insert_plane(plane)
+
+    def insert_plane(self, plane):
+        """Insert a plane and split all leaves by it.
+
+        Only leaves with fragments on both sides of the plane are split,
+        all others are left as they are. The vertices of all fragments are
+        classified at once and only fragments on both sides of the plane
+        are cut, using the same classification.
+
+        Parameters
+        ----------
+        plane
+            The :class:`~python_geometry.plane.Plane` to insert.
+
+        Returns
+        -------
+        int
+            The number of leaves that were split.
+
+        """
+        self.planes.append(plane)
+        fragment_count = len(self._fragments)
+        node_count = len(self._children)
+        distances = plane.distance(self._fragment_array.vertices)
+        sides = _get_sides(distances)
+        vertex_fragments = self._fragment_array.polygon_indices
+        has_positive = bincount(
+            vertex_fragments, sides > 0, fragment_count) > 0
+        has_negative = bincount(
+            vertex_fragments, sides < 0, fragment_count) > 0
+        split_leaves = (
+            (bincount(self._fragment_leaves, has_positive, node_count) > 0) &
+            (bincount(self._fragment_leaves, has_negative, node_count) > 0)
+        ).nonzero()[0]
+        if len(split_leaves) == 0:
+            return 0
+
+        children = zeros((node_count, 2), dtype=int64)
+        for leaf in split_leaves.tolist():
+            children[leaf] = self._add_children(leaf, plane)
+
+        # Fragments on one side of the plane only move to a child, those on
+        # both sides of it are cut
+        is_cut = has_positive & has_negative
+        in_split_leaf = zeros(node_count, dtype=bool)
+        in_split_leaf[split_leaves] = True
+        moving = in_split_leaf[self._fragment_leaves] & ~is_cut
+        self._fragment_leaves[moving] = children[
+            self._fragment_leaves[moving],
+            where(has_negative[moving], 0, 1)]
+
+        cut = is_cut.nonzero()[0]
+        new_fragments = []
+        new_leaves = []
+        new_source_indices = []
+        offsets = self._fragment_array.offsets
+        for i in cut.tolist():
+            split_fragments, fragment_sides = (
+                _split_polygon_by_plane_with_sides(
+                    self._fragments[i],
+                    plane,
+                    distances[offsets[i]:offsets[i + 1]]))
+            new_fragments.extend(split_fragments)
+            new_leaves.extend(
+                children[self._fragment_leaves[i], 0 if side < 0 else 1]
+                for side in fragment_sides)
+            new_source_indices.extend(
+                [self._source_indices[i]]*len(split_fragments))
+
+        kept = ones(fragment_count, dtype=bool)
+        kept[cut] = False
+        kept_counts = self._fragment_array.counts[kept]
+        new_counts = [len(fragment.vertices) for fragment in new_fragments]
+        self._fragment_array = SimplePolygonArray(
+            vertices=concatenate(
+                [self._fragment_array.vertices[kept[vertex_fragments]]] +
+                [fragment.vertices for fragment in new_fragments]),
+            offsets=concatenate([
+                [0], cumsum(concatenate([kept_counts, new_counts]))]))
+        self._fragments = [
+            fragment
+            for fragment, keep in zip(self._fragments, kept.tolist())
+            if keep] + new_fragments
+        self._fragment_leaves = concatenate([
+            self._fragment_leaves[kept],
+            array(new_leaves, dtype=int64)])
+        self._source_indices = concatenate([
+            self._source_indices[kept],
+            array(new_source_indices, dtype=int64)])
+        return len(split_leaves)
+
+    def _add_children(self, leaf, plane):
+        # Turns the leaf into an inner node holding the plane
+        children = [len(self._children), len(self._children) + 1]
+        self._children[leaf] = children
+        self._node_planes[leaf] = plane
+        for child in children:
+            self._children.append([-1, -1])
+            self._node_planes.append(None)
+        return children
 
-        vertices_list[-1].append(intersection)
+    def locate_point(self, point):
+        """Find the leaf whose cell contains a point.
 
-        # If the terminal point coincides with the intersection just provide a
-        # new empty list; the next initial point will be added anyway
-        if allclose(
-                bound_vector.terminal_point,
-                intersection,
+        Parameters
+        ----------
+        point
+            (3,) array.
+
+        Returns
+        -------
+        int
+            Index of the leaf.
+
+        """
+        point = asanyarray(point, dtype=float)
+        node = 0
+        while self._children[node][0] >= 0:
+            side = _get_sides(
+                self._node_planes[node].distance(point[newaxis]))[0]
+            node = self._children[node][0 if side < 0 else 1]
+        return node
+
+    def locate_polygon(self, polygon):
+        """Find all leaves whose cells the interior of a polygon overlaps.
+
+        Parameters
+        ----------
+        polygon
+            A :class:`~python_geometry.simple_polygon.SimplePolygon`.
+
+        Returns
+        -------
+        list
+            The indices of the leaves in ascending order.
+
+        """
+        vertices = asanyarray(polygon.vertices, dtype=float)
+        leaves = []
+        nodes = [0]
+        while nodes:
+            node = nodes.pop()
+            if self._children[node][0] < 0:
+                leaves.append(node)
+                continue
+            sides = _get_sides(self._node_planes[node].distance(vertices))
+            negative_child, positive_child = self._children[node]
+            if (sides < 0).any():
+                nodes.append(negative_child)
+            if (sides > 0).any() or not (sides < 0).any():
+                nodes.append(positive_child)
+        return sorted(leaves)
+
+    def iter_leaves(self):
+        """Iterate over all leaves.
+
+        Yields
+        ------
+        leaf : int
+            Index of the leaf.
+        fragments : list
+            The fragments of the polygons within the cell of the leaf.
+        source_indices : list
+            The index into :attr:`polygons` of every fragment.
+
+        """
+        order = lexsort(
+            [self._source_indices, self._fragment_leaves]).tolist()
+        leaf_fragments = dict(
+            (leaf, list(group))
+            for leaf, group in groupby(
+                order, key=lambda i: self._fragment_leaves[i]))
+        for leaf, (child, _) in enumerate(self._children):
+            if child >= 0:
+                continue
+            fragments = leaf_fragments.get(leaf, [])
+            yield (
+                leaf,
+                [self._fragments[i] for i in fragments],
+                self._source_indices[fragments].tolist())
+
+
+def _split_polygon_by_parallel_planes(
+        polygon, heights, normal_vector, offsets, split_objects,
+        slab_indices):
+    # Only the offsets strictly between the lowest and the highest vertex
+    # cut the polygon
+    if len(heights):
+        start = searchsorted(offsets, heights.min())
+        stop = searchsorted(offsets, heights.max(), side='right')
+        if start < stop and isclose(
+                offsets[start] - heights.min(),
+                0,
                 **config['numbers_close_kwargs']):
-            vertices_list.append([])
-            continue
+            start += 1
+        if start < stop and isclose(
+                offsets[stop - 1] - heights.max(),
+                0,
+                **config['numbers_close_kwargs']):
+            stop -= 1
+    else:
+        start = stop = 0
+    if start >= stop:
+        split_objects.append(polygon)
+        slab_indices.append(start)
+        return
+
+    chains, slabs, start_labels, end_labels = _get_slab_chains(
+        polygon, heights, offsets[start:stop])
+    direction = cross(normal_vector, polygon.vector_area)
+    groups = _merge_chains(chains, start_labels, end_labels, direction)
+    for group in sorted(groups, key=lambda group: slabs[group[0]]):
+        split_objects.append(SimplePolygon(
+            vertices=_concatenate_chains([chains[i] for i in group])))
+        slab_indices.append(start + slabs[group[0]])
+
+
+def _get_slab_chains(polygon, heights, offsets):
+    # Cuts the boundary of the polygon into chains of vertices that each lie
+    # in one slab between consecutive planes and start and end on planes.
+    # Points get levels, 2*j within slab j and 2*j + 1 on plane j.
+    vertices = asanyarray(polygon.vertices, dtype=float)
+    indices = searchsorted(offsets, heights)
+    levels = 2*indices
+    below = indices < len(offsets)
+    on_plane = zeros(len(heights), dtype=bool)
+    on_plane[below] = _get_sides(
+        heights[below] - offsets[indices[below]]) == 0
+    levels[on_plane] += 1
+    above = ~on_plane & (indices > 0)
+    on_plane[above] = _get_sides(
+        heights[above] - offsets[indices[above] - 1]) == 0
+    levels[above & on_plane] -= 1
 
-        vertices_list.append([intersection])
-
-    # The last and the first part may belong to one and the same polygon
-    if (len(vertices_list) > 1 and
-            allclose(
-                bound_vector.terminal_point,
-                polygon_to_split.vertices[0],
-                **config['numbers_close_kwargs'])):
-        last_vertices = vertices_list.pop()
-        vertices_list[0] = last_vertices + vertices_list[0]
-
-    i_that_needs_merging = None
-    j_that_are_merged = []
-    for i, vertices_i in enumerate(vertices_list):
-        side_i = sign(mean(plane.distance(vertices_i))).astype(int32)
-        other_vertices = chain(
-            enumerate(vertices_list[i+1:], start=i+1),
-            enumerate(vertices_list[:i], start=0))
-        for j, vertices_j in other_vertices:
-            side_j = sign(mean(plane.distance(vertices_j))).astype(int32)
-            if side_j == side_i:
-                bound_vector_i = BoundVector(
-                    initial_point=vertices_i[-1],
-                    terminal_point=vertices_i[0])
-                bound_vector_j = BoundVector(
-                    initial_point=vertices_j[-1],
-                    terminal_point=vertices_j[0])
-                intersection = get_intersection(bound_vector_i, bound_vector_j)
-                if (
-                        isinstance(intersection, LineSegment) or
-                        isinstance(intersection, BoundVector)):
-                    i_that_needs_merging = i
-                    j_that_are_merged.append(j)
-        if i_that_needs_merging is not None:
-            break
-
-    new_vertices_list = []
-    for i, vertices in enumerate(vertices_list):
-        if i in j_that_are_merged:
+    # Every edge crosses the planes strictly between the levels of its end
+    # points, in the order it meets them
+    next_levels = roll(levels, -1)
+    lower_levels = minimum(levels, next_levels)
+    upper_levels = maximum(levels, next_levels)
+    first_planes = (lower_levels + 1) // 2
+    counts = maximum(upper_levels // 2 - first_planes, 0)
+    edge_indices = repeat(arange(len(vertices)), counts)
+    ranks = arange(counts.sum()) - repeat(cumsum(counts) - counts, counts)
+    planes = where(
+        levels[edge_indices] < next_levels[edge_indices],
+        first_planes[edge_indices] + ranks,
+        first_planes[edge_indices] + counts[edge_indices] - 1 - ranks)
+    params = (
+        (offsets[planes] - heights[edge_indices]) /
+        (roll(heights, -1)[edge_indices] - heights[edge_indices]))
+    crossing_points = (
+        vertices[edge_indices] +
+        params[:, newaxis]*polygon.edge_vectors[edge_indices])
+
+    # Each vertex is followed by the crossing points of its edge
+    positions = arange(len(vertices)) + cumsum(counts) - counts
+    points = zeros((len(vertices) + len(planes), 3))
+    points[positions] = vertices
+    point_levels = zeros(len(points), dtype=int64)
+    point_levels[positions] = levels
+    crossing_positions = ones(len(points), dtype=bool)
+    crossing_positions[positions] = False
+    points[crossing_positions] = crossing_points
+    point_levels[crossing_positions] = 2*planes + 1
+
+    # Chains run from one point on a plane to the next one
+    breaks = (point_levels % 2 == 1).nonzero()[0]
+    points = concatenate([points[breaks[0]:], points[:breaks[0] + 1]])
+    point_levels = concatenate(
+        [point_levels[breaks[0]:], point_levels[:breaks[0] + 1]])
+    breaks = breaks - breaks[0]
+    chains = []
+    slabs = []
+    start_labels = []
+    end_labels = []
+    for chain_start, chain_stop in zip(
+            breaks.tolist(), breaks[1:].tolist() + [len(points) - 1]):
+        first_level, second_level, last_level = point_levels[
+            [chain_start, chain_start + 1, chain_stop]].tolist()
+        if chain_stop - chain_start == 1 and first_level == last_level:
+            # Edges lying in a plane are dropped
             continue
-        if i == i_that_needs_merging:
-            merged_vertices = copy(vertices)
-            for j in j_that_are_merged:
-                merged_vertices.extend(vertices_list[j])
-            new_vertices_list.append(merged_vertices)
-        else:
-            new_vertices_list.append(vertices)
+        slab = (first_level + second_level + 2) // 4
+        chains.append(points[chain_start:chain_stop + 1])
+        slabs.append(slab)
+        # Plane j + 1 carries the cuts of slab j + 1 above it and those of
+        # slab j below it, told apart by the sign
+        start_labels.append(_get_cut_label(first_level, slab))
+        end_labels.append(_get_cut_label(last_level, slab))
+    return chains, slabs, start_labels, end_labels
+
+
+def _get_cut_label(level, slab):
+    plane = (level - 1) // 2
+    return plane + 1 if plane < slab else -(plane + 1)
+
+
+def _split_polygon_by_plane(polygon_to_split, plane):
+    return _split_polygon_by_plane_with_sides(polygon_to_split, plane)[0]
+
+
+def _split_polygon_by_plane_with_sides(
+        polygon_to_split, plane, distances=None):
+    # Also yields the side of the plane every polygon lies on. Distances of
+    # the vertices to the plane that are already known are not recomputed.
+    chains, sides = _get_chains(polygon_to_split, plane, distances)
+    direction = cross(plane.normal_vector, polygon_to_split.vector_area)
 
     # Return proper polygons
     polygons = []
-    for vertices in new_vertices_list:
+    polygon_sides = []
+    for group in _merge_chains(chains, sides, sides, direction):
         polygons.append(SimplePolygon(
-            vertices=vertices))
+            vertices=_concatenate_chains([chains[i] for i in group])))
+        polygon_sides.append(sides[group[0]])
+
+    return polygons, polygon_sides
+
+
+def _split_polygons_by_plane(polygons_to_split, plane, workers=None):
+    split_objects, source_indices, _ = _split_polygons(
+        polygons_to_split,
+        _split_packed_polygons_by_plane,
+        (plane,),
+        workers)
+    return split_objects, source_indices
+
+
+def _split_segment_objects_by_plane(segment_objects, plane, workers=None):
+    segments = array([
+        (
+            [object_.initial_point, object_.terminal_point]
+            if isinstance(object_, BoundVector) else
+            [object_.end_point_0, object_.end_point_1])
+        for object_ in segment_objects], dtype=float).reshape(-1, 2, 3)
+    included = array([
+        (
+            [object_.initial_point_included, object_.terminal_point_included]
+            if isinstance(object_, BoundVector) else
+            [object_.end_point_0_included, object_.end_point_1_included])
+        for object_ in segment_objects], dtype=bool).reshape(-1, 2)
+    pieces = split_segments_by_plane(
+        segments, plane, included[:, 0], included[:, 1], workers)
+
+    # Pieces of segments that are not split are the segments themselves
+    is_split = bincount(pieces.source_indices, minlength=len(segments)) > 1
+    split_objects = []
+    for i, source in enumerate(pieces.source_indices.tolist()):
+        object_ = segment_objects[source]
+        if not is_split[source]:
+            split_objects.append(object_)
+        elif isinstance(object_, BoundVector):
+            split_objects.append(BoundVector(
+                initial_point=pieces.end_points_0[i],
+                terminal_point=pieces.end_points_1[i],
+                initial_point_included=pieces.end_points_0_included[i],
+                terminal_point_included=pieces.end_points_1_included[i]))
+        else:
+            split_objects.append(LineSegment(
+                end_point_0=pieces.end_points_0[i],
+                end_point_1=pieces.end_points_1[i],
+                end_point_0_included=pieces.end_points_0_included[i],
+                end_point_1_included=pieces.end_points_1_included[i]))
+    return split_objects, pieces.source_indices
+
+
+def _split_segments_by_plane(
+        segments, initial_points_included, terminal_points_included, plane):
+    intersections = get_intersections_segments_planes(
+        segments,
+        plane.point_in_plane,
+        plane.normal_vector,
+        initial_points_included,
+        terminal_points_included)
+    # End points on the plane have parameters of exactly 0 or 1
+    params = intersections.params[:, 0]
+    crossing = intersections.intersects[:, 0] & (params > 0) & (params < 1)
+
+    # Every segment yields one piece, crossing segments a second one
+    # starting at the crossing point
+    counts = 1 + crossing
+    sources = repeat(arange(len(segments)), counts)
+    is_second = zeros(len(sources), dtype=bool)
+    is_second[cumsum(counts)[crossing] - 1] = True
+    is_first_of_two = roll(is_second, -1)
+    points = intersections.points[sources, 0]
+    end_points_0 = where(
+        is_second[:, newaxis], points, segments[sources, 0])
+    end_points_1 = where(
+        is_first_of_two[:, newaxis], points, segments[sources, 1])
+    end_points_0_included = is_second | initial_points_included[sources]
+    end_points_1_included = (
+        is_first_of_two | terminal_points_included[sources])
+
+    # A piece lies on the side of its end point that is off the plane, the
+    # second piece of a crossing segment on the side of the terminal point
+    initial_sides = _get_sides(plane.distance(segments[:, 0]))[sources]
+    terminal_sides = _get_sides(plane.distance(segments[:, 1]))[sources]
+    return SplitSegments(
+        end_points_0=end_points_0,
+        end_points_1=end_points_1,
+        end_points_0_included=end_points_0_included,
+        end_points_1_included=end_points_1_included,
+        source_indices=sources,
+        sides=where(
+            is_second | (initial_sides == 0), terminal_sides, initial_sides))
+
+
+def _split_polygons(
+        polygons_to_split, split_packed_polygons, arguments, workers):
+    # Chunks of the polygons are split one after another or by worker
+    # processes. Only packed vertex buffers are sent back and forth, and
+    # polygons that are not split are passed on as they are.
+    if isinstance(polygons_to_split, SimplePolygonArray):
+        polygon_array = polygons_to_split
+    else:
+        polygon_array = SimplePolygonArray.from_polygons(polygons_to_split)
+    offsets = polygon_array.offsets
+    chunk_bounds = get_chunk_bounds(polygon_array.counts, workers)
+    results = parallel_map(
+        split_packed_polygons,
+        [
+            (
+                polygon_array.vertices[offsets[start]:offsets[stop]],
+                offsets[start:stop + 1] - offsets[start]) + arguments
+            for start, stop in zip(chunk_bounds[:-1], chunk_bounds[1:])],
+        workers)
+
+    split_objects = []
+    source_indices = []
+    fields = []
+    for start, result in zip(chunk_bounds.tolist(), results):
+        sources, is_new, vertices, fragment_offsets = result[:4]
+        new_vertices = iter(split(vertices, fragment_offsets[1:-1]))
+        for source, new in zip(sources.tolist(), is_new.tolist()):
+            if new:
+                split_objects.append(SimplePolygon(next(new_vertices)))
+            elif isinstance(polygons_to_split, SimplePolygonArray):
+                split_objects.append(polygon_array[start + source])
+            else:
+                split_objects.append(polygons_to_split[start + source])
+        source_indices.append(start + sources)
+        fields.append(result[4:])
+    return (
+        split_objects,
+        concatenate([zeros(0, dtype=int64)] + source_indices),
+        [
+            concatenate(chunk_fields)
+            for chunk_fields in zip(*fields)])
+
+
+def _iter_array_chunks(polygon_array, chunk_size):
+    # Only the vertices of the current chunk are read into memory
+    offsets = polygon_array.offsets
+    start = 0
+    while start < len(polygon_array):
+        stop = max(
+            start + 1,
+            searchsorted(
+                offsets, offsets[start] + chunk_size, side='right') - 1)
+        yield (
+            array(polygon_array.vertices[offsets[start]:offsets[stop]]),
+            array(offsets[start:stop + 1] - offsets[start]))
+        start = stop
+
+
+def _iter_chunks(polygons, chunk_size):
+    polygon_vertices = []
+    vertex_count = 0
+    for polygon in polygons:
+        if isinstance(polygon, SimplePolygonArray):
+            if polygon_vertices:
+                yield _pack_vertices(polygon_vertices)
+                polygon_vertices = []
+                vertex_count = 0
+            for chunk in _iter_array_chunks(polygon, chunk_size):
+                yield chunk
+            continue
+        polygon_vertices.append(
+            asanyarray(polygon.vertices, dtype=float).reshape(-1, 3))
+        vertex_count += len(polygon_vertices[-1])
+        if vertex_count >= chunk_size:
+            yield _pack_vertices(polygon_vertices)
+            polygon_vertices = []
+            vertex_count = 0
+    if polygon_vertices:
+        yield _pack_vertices(polygon_vertices)
+
+
+def _pack_vertices(polygon_vertices):
+    return (
+        concatenate(polygon_vertices),
+        concatenate([
+            [0],
+            cumsum(
+                [len(vertices) for vertices in polygon_vertices],
+                dtype=int64)]))
+
+
+def _gather_fragments(
+        vertices, offsets, sources, is_new, new_vertices, new_offsets):
+    # Packs the polygons that were passed on and the new ones in order
+    starts = offsets[sources]
+    counts = diff(offsets)[sources]
+    starts[is_new] = len(vertices) + new_offsets[:-1]
+    counts[is_new] = diff(new_offsets)
+    fragment_offsets = concatenate([[0], cumsum(counts, dtype=int64)])
+    indices = (
+        repeat(starts - fragment_offsets[:-1], counts) +
+        arange(fragment_offsets[-1]))
+    return SimplePolygonArray(
+        vertices=concatenate([vertices, new_vertices])[indices],
+        offsets=fragment_offsets)
+
+
+def _pack_fragments(sources, is_new, fragments):
+    # Sources and whether they are new for all resulting polygons, the
+    # vertices of the new ones in one buffer
+    return (
+        asanyarray(sources, dtype=int64),
+        asanyarray(is_new, dtype=bool),
+        concatenate(
+            [fragment.vertices for fragment in fragments] + [zeros((0, 3))]),
+        concatenate([
+            [0],
+            cumsum(
+                [len(fragment.vertices) for fragment in fragments],
+                dtype=int64)]))
+
+
+def _split_packed_polygons_by_plane(vertices, offsets, plane):
+    polygon_array = SimplePolygonArray(vertices, offsets)
+
+    # Only polygons with vertices on both sides of the plane are split, all
+    # others are passed on as they are
+    sides = _get_sides(plane.distance(polygon_array.vertices))
+    straddling = _classify_polygons(polygon_array, sides) == SIDE_BOTH
+
+    fragments = []
+    counts = ones(len(polygon_array), dtype=int64)
+    for i in straddling.nonzero()[0].tolist():
+        polygons = _split_polygon_by_plane(polygon_array[i], plane)
+        fragments.extend(polygons)
+        counts[i] = len(polygons)
+    sources = repeat(arange(len(polygon_array)), counts)
+    return _pack_fragments(sources, straddling[sources], fragments)
+
+
+def _split_packed_polygons_by_parallel_planes(
+        vertices, offsets, normal_vector, plane_offsets):
+    polygon_array = SimplePolygonArray(vertices, offsets)
+    # The vertices are projected onto the normal vector only once
+    heights = polygon_array.vertices.dot(normal_vector)
+
+    sources = []
+    is_new = []
+    fragments = []
+    slab_indices = []
+    for i in range(len(polygon_array)):
+        polygon = polygon_array[i]
+        split_objects = []
+        _split_polygon_by_parallel_planes(
+            polygon,
+            heights[offsets[i]:offsets[i + 1]],
+            normal_vector,
+            plane_offsets,
+            split_objects,
+            slab_indices)
+        for split_object in split_objects:
+            sources.append(i)
+            is_new.append(split_object is not polygon)
+            if split_object is not polygon:
+                fragments.append(split_object)
+    return _pack_fragments(sources, is_new, fragments) + (
+        array(slab_indices, dtype=int64),)
+
+
+def _as_polygon_array(polygons, action):
+    if isinstance(polygons, SimplePolygonArray):
+        return polygons
+    elif isinstance(polygons, SimplePolygon):
+        return SimplePolygonArray.from_polygons([polygons])
+    elif isinstance(polygons, (list, tuple)):
+        return SimplePolygonArray.from_polygons(polygons)
+    raise NotImplementedError(
+        '{} a "{}" by a plane is not yet implemented.'.format(
+            action, polygons.__class__.__name__))
+
+
+def _classify_polygons(polygon_array, sides):
+    polygon_indices = polygon_array.polygon_indices
+    has_positive = bincount(
+        polygon_indices, sides > 0, len(polygon_array)) > 0
+    has_negative = bincount(
+        polygon_indices, sides < 0, len(polygon_array)) > 0
+    return where(
+        has_positive & has_negative,
+        SIDE_BOTH,
+        has_positive.astype(int32) - has_negative.astype(int32))
+
+
+def _get_positive_areas(
+        polygon_array, distances, sides, normal_vectors, plane):
+    # The area on the positive side is the vector area of the boundary on
+    # that side, summed up relative to a point on the line where polygon and
+    # plane meet. The cuts along that line then contribute nothing and are
+    # not needed.
+    first_vertices = polygon_array.vertices[polygon_array.offsets[:-1]]
+    in_polygon_plane = (
+        plane.normal_vector -
+        (normal_vectors.dot(plane.normal_vector))[:, newaxis]*normal_vectors)
+    line_points = first_vertices - (
+        plane.distance(first_vertices) /
+        (in_polygon_plane*in_polygon_plane).sum(axis=1))[:, newaxis]*(
+        in_polygon_plane)
+
+    polygon_indices = polygon_array.polygon_indices
+    next_indices = polygon_array.next_vertex_indices
+    positions = polygon_array.vertices - line_points[polygon_indices]
+    next_positions = positions[next_indices]
+    next_distances = distances[next_indices]
+    next_sides = sides[next_indices]
+    crossing = sides*next_sides < 0
+    params = distances[crossing] / (
+        distances[crossing] - next_distances[crossing])
+    crossing_positions = zeros_like(positions)
+    crossing_positions[crossing] = positions[crossing] + params[
+        :, newaxis]*(next_positions[crossing] - positions[crossing])
+
+    products = zeros_like(positions)
+    kept = (sides >= 0) & (next_sides >= 0)
+    leaving = crossing & (sides > 0)
+    entering = crossing & (sides < 0)
+    products[kept] = cross(positions[kept], next_positions[kept])
+    products[leaving] = cross(
+        positions[leaving], crossing_positions[leaving])
+    products[entering] = cross(
+        crossing_positions[entering], next_positions[entering])
+    return bincount(
+        polygon_indices,
+        (products*normal_vectors[polygon_indices]).sum(axis=1),
+        len(polygon_array)) / 2
+
+
+def _get_sides(distances):
+    # Side of the plane every point lies on, 0 for points in the plane
+    sides = sign(distances).astype(int32)
+    sides[isclose(distances, 0, **config['numbers_close_kwargs'])] = 0
+    return sides
+
+
+def _merge_chains(chains, start_labels, end_labels, direction):
+    # Chains are joined by cuts along a plane into polygons. Chains starting
+    # or ending on the same side of the same plane share a nonzero label,
+    # which is positive on the positive side. Going around a polygon on the
+    # positive side its cuts run along the direction of the intersection
+    # line, the cross product of the normal vectors of plane and polygon, on
+    # the negative side against it. Sorting the end and start points of all
+    # chains with a label that way, the cuts join each end point to the
+    # following start point.
+    chain_ends = defaultdict(list)
+    chain_starts = defaultdict(list)
+    for i in range(len(chains)):
+        chain_ends[end_labels[i]].append(i)
+        chain_starts[start_labels[i]].append(i)
+    next_chains = list(range(len(chains)))
+    for label in set(chain_starts).union(chain_ends).difference([0]):
+        ends = chain_ends[label]
+        starts = chain_starts[label]
+        keys = sign(label)*dot(
+            [chains[i][-1] for i in ends] + [chains[i][0] for i in starts],
+            direction)
+        is_start = [False]*len(ends) + [True]*len(starts)
+        indices = ends + starts
+        order = argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        new_groups = ~isclose(
+            sorted_keys[1:],
+            sorted_keys[:-1],
+            **config['numbers_close_kwargs'])
+        group_indices = cumsum(concatenate([[0], new_groups]))
+
+        # End and start points have to alternate. Where the chains touch the
+        # plane they share points, whose order is chosen accordingly.
+        sequence = []
+        for _, group in groupby(
+                zip(order.tolist(), group_indices.tolist()),
+                key=itemgetter(1)):
+            group = [entry for entry, _ in group]
+            while group:
+                need_start = len(sequence) % 2 == 1
+                k = next(
+                    (
+                        k for k, entry in enumerate(group)
+                        if is_start[entry] == need_start),
+                    0)
+                sequence.append(group.pop(k))
+
+        label_next_chains = {}
+        for end, start in zip(sequence[::2], sequence[1::2]):
+            if not is_start[end] and is_start[start]:
+                label_next_chains[indices[end]] = indices[start]
+        # Chains are only joined if the cuts are consistent
+        if (
+                sorted(label_next_chains) == ends and
+                sorted(label_next_chains.values()) == starts):
+            for i, j in label_next_chains.items():
+                next_chains[i] = j
+    if sorted(next_chains) != list(range(len(chains))):
+        next_chains = list(range(len(chains)))
+
+    groups = []
+    merged = set()
+    for i in range(len(chains)):
+        if i in merged:
+            continue
+        group = [i]
+        merged.add(i)
+        while next_chains[group[-1]] != i:
+            group.append(next_chains[group[-1]])
+            merged.add(group[-1])
+        groups.append(group)
+    return groups
+
+
+def _concatenate_chains(chains):
+    # Chains joined where they touch the plane share that point, which
+    # must not become a duplicate vertex
+    vertices = concatenate(chains)
+    ends = cumsum([len(chain) for chain in chains]) - 1
+    duplicates = all(
+        isclose(
+            vertices[ends],
+            vertices[(ends + 1) % len(vertices)],
+            **config['numbers_close_kwargs']),
+        axis=1)
+    if duplicates.all():
+        duplicates[-1] = False
+    keep = ones(len(vertices), dtype=bool)
+    keep[ends[duplicates]] = False
+    return vertices[keep]
+
+
+def _get_chains(polygon_to_split, plane, distances=None):
+    # Cuts the boundary of the polygon into chains of vertices that each lie
+    # on one side of the plane and start and end on the plane. All signed
+    # distances and crossing points are computed at once.
+    vertices = asanyarray(polygon_to_split.vertices, dtype=float)
+    edge_vectors = polygon_to_split.edge_vectors
+    normal_vector = asanyarray(plane.normal_vector, dtype=float)
+    if distances is None:
+        distances = plane.distance(vertices)
+    projected_lengths = dot(edge_vectors, normal_vector)
+
+    # Edges lying in the plane are dropped
+    in_plane = (
+        isclose(distances, 0, **config['numbers_close_kwargs']) &
+        isclose(projected_lengths, 0, **config['numbers_close_kwargs']))
+    if in_plane.all():
+        # The whole polygon lies in the plane
+        return [vertices], zeros(1, dtype=int32)
+    with errstate(divide='ignore', invalid='ignore'):
+        params = nan_to_num(-distances / projected_lengths)
+    # Vertices in the plane are crossed exactly, even if round off puts the
+    # parameters slightly outside of [0, 1]
+    sides = _get_sides(distances)
+    params[sides == 0] = 0
+    params[roll(sides, -1) == 0] = 1
+    intersects = ~in_plane & (params >= 0) & (params <= 1)
+    points = vertices + where(intersects, params, 0)[:, newaxis]*edge_vectors
+    # Crossings at the initial point of an edge are handled by the previous
+    # edge; crossings at its terminal point do not start the next chain with
+    # the crossing point, the terminal point is added anyway. Both follow
+    # the classification of the vertices.
+    crossing = intersects & (sides != 0)
+    at_terminal_point = roll(sides, -1) == 0
+
+    # Every edge contributes its initial point, the crossing point ending
+    # the current chain and the crossing point starting the next chain
+    stream_points = stack([vertices, points, points], axis=1).reshape(-1, 3)
+    present = stack(
+        [~in_plane, crossing, crossing & ~at_terminal_point],
+        axis=1).reshape(-1)
+    new_chain = zeros((len(vertices), 3), dtype=bool)
+    new_chain[:, 2] = crossing
+    chain_indices = cumsum(new_chain.reshape(-1))[present]
+    stream_points = stream_points[present]
+    # Crossing points lie in the plane
+    stream_distances = stack(
+        [distances, zeros_like(distances), zeros_like(distances)],
+        axis=1).reshape(-1)[present]
+
+    # The last and the first chain are one and the same
+    if crossing.any():
+        last_chain = chain_indices == count_nonzero(crossing)
+        count = count_nonzero(last_chain)
+        chain_indices[last_chain] = 0
+        chain_indices = roll(chain_indices, count)
+        stream_points = roll(stream_points, count, axis=0)
+        stream_distances = roll(stream_distances, count)
 
-    return polygons
+    counts = bincount(chain_indices)
+    sides = sign(
+        bincount(chain_indices, weights=stream_distances) /
+        counts).astype(int32)
+    chains = split(stream_points, cumsum(counts)[:-1])
+    return chains, sides
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+    This module implements a sweep line search for all intersections in large
+    sets of coplanar bound vectors.
+
+    .. versionadded:: 0.4
+
+"""
+from __future__ import division
+
+from heapq import heappop, heappush
+from itertools import combinations
+
+from numpy import (
+    absolute, argmax, array, asanyarray, broadcast_to, concatenate, int64,
+    mean, zeros)
+from numpy.linalg import svd
+
+from .config import config
+from .utilities import (
+    INTERSECTION_NONE, Intersections,
+    get_intersections_bound_vectors_bound_vectors)
+
+
+__all__ = ['get_all_intersections']
+
+
+def get_all_intersections(
+        initial_points,
+        terminal_points,
+        initial_points_included=True,
+        terminal_points_included=True,
+        normal_vector=None):
+    """Find all pairs of intersecting bound vectors.
+
+    A Bentley-Ottmann sweep over the bound vectors projected onto their
+    common plane collects the candidate pairs. Events are queued and looked
+    up in :math:`O(\\log N)`, but the sweep status is a plain list whose
+    updates move all of its items, so the sweep takes :math:`O((N + K) S)`
+    time, where :math:`S \\le N` is the largest number of bound vectors
+    crossing the sweep line at once. Every candidate is then evaluated with
+    :func:`~python_geometry.utilities.get_intersections_bound_vectors_bound_vectors`,
+    so inclusion of end points and tolerances are exactly those of
+    :func:`~python_geometry.utilities.get_intersection`.
+
+    Parameters
+    ----------
+    initial_points, terminal_points
+        (N, 3) arrays of the end points of the bound vectors.
+    initial_points_included, terminal_points_included
+        Whether the end points belong to the bound vectors, either for all
+        or per bound vector.
+    normal_vector
+        Normal vector of the common plane. If it is not given it is fitted
+        to the end points. Bound vectors that are not coplanar are still
+        handled correctly, they merely yield more candidates.
+
+    Returns
+    -------
+    pairs : np.ndarray
+        (K, 2) array of the indices ``i < j`` of intersecting bound vectors.
+    intersections : Intersections
+        The intersection of bound vector ``i`` with bound vector ``j`` for
+        every pair.
+
+    """
+    initial_points = asanyarray(initial_points, dtype=float)
+    terminal_points = asanyarray(terminal_points, dtype=float)
+    initial_points_included = broadcast_to(
+        asanyarray(initial_points_included, dtype=bool),
+        initial_points.shape[:1])
+    terminal_points_included = broadcast_to(
+        asanyarray(terminal_points_included, dtype=bool),
+        initial_points.shape[:1])
+
+    if normal_vector is None:
+        normal_vector = _fit_normal_vector(
+            concatenate([initial_points, terminal_points]))
+    axes = [
+        axis for axis in range(3)
+        if axis != argmax(absolute(normal_vector))]
+
+    pairs = _sweep(
+        initial_points[:, axes].tolist(),
+        terminal_points[:, axes].tolist(),
+        config['numbers_close_kwargs']['atol'])
+    pairs = array(sorted(pairs), dtype=int64).reshape(-1, 2)
+
+    intersections = get_intersections_bound_vectors_bound_vectors(
+        initial_points[pairs[:, 0]],
+        terminal_points[pairs[:, 0]],
+        initial_points[pairs[:, 1]],
+        terminal_points[pairs[:, 1]],
+        initial_points_included[pairs[:, 0]],
+        terminal_points_included[pairs[:, 0]],
+        initial_points_included[pairs[:, 1]],
+        terminal_points_included[pairs[:, 1]])
+    mask = intersections.kind != INTERSECTION_NONE
+    return pairs[mask], Intersections(
+        *[field[mask] for field in intersections])
+
+
+def _fit_normal_vector(points):
+    if len(points) == 0:
+        return zeros(3)
+    return svd(points - mean(points, axis=0), full_matrices=False)[2][-1]
+
+
+class _Sweep(object):
+    # The sweep runs along x, ties are broken by y. Bound vectors are stored
+    # from their lexicographically smaller (left) to their larger (right)
+    # end point; vertical ones have an infinite slope.
+
+    def __init__(self, initial_points, terminal_points, tolerance):
+        self.tolerance = tolerance
+        self.left = []
+        self.right = []
+        self.slope = []
+        for initial_point, terminal_point in zip(
+                initial_points, terminal_points):
+            left, right = sorted([tuple(initial_point), tuple(terminal_point)])
+            self.left.append(left)
+            self.right.append(right)
+            if right[0] - left[0] > 0:
+                self.slope.append(
+                    (right[1] - left[1]) / (right[0] - left[0]))
+            else:
+                self.slope.append(float('inf'))
+
+        self.events = {}
+        self.queue = []
+        for i, (left, right) in enumerate(zip(self.left, self.right)):
+            self._schedule(left)[0].append(i)
+            self._schedule(right)[1].append(i)
+
+        self.status = []
+        self.scheduled_pairs = set()
+        self.pairs = set()
+
+    def _schedule(self, point):
+        # Each event keeps the bound vectors starting and ending in it
+        if point not in self.events:
+            self.events[point] = ([], [])
+            heappush(self.queue, point)
+        return self.events[point]
+
+    def _key(self, i, point):
+        # Position of bound vector i along the sweep line through point
+        (x0, y0), (x1, y1) = self.left[i], self.right[i]
+        if self.slope[i] == float('inf'):
+            return min(max(point[1], y0), y1)
+        if point[0] == x0:
+            return y0
+        if point[0] == x1:
+            return y1
+        return y0 + (point[0] - x0)*self.slope[i]
+
+    def _close(self, point_0, point_1):
+        return (
+            abs(point_0[0] - point_1[0]) <= self.tolerance and
+            abs(point_0[1] - point_1[1]) <= self.tolerance)
+
+    def _lower_bound(self, point):
+        lower, upper = 0, len(self.status)
+        while lower < upper:
+            middle = (lower + upper) // 2
+            if self._key(self.status[middle], point) < (
+                    point[1] - self.tolerance):
+                lower = middle + 1
+            else:
+                upper = middle
+        return lower
+
+    def _find_new_event(self, i, j, point):
+        pair = (i, j) if i < j else (j, i)
+        if pair in self.scheduled_pairs:
+            return
+        (ax, ay), (bx, by) = self.left[i], self.right[i]
+        (cx, cy), (dx, dy) = self.left[j], self.right[j]
+        denominator = (bx - ax)*(dy - cy) - (by - ay)*(dx - cx)
+        if denominator == 0:
+            # Parallel bound vectors only meet at end points, which are
+            # events anyway
+            return
+        param_i = ((cx - ax)*(dy - cy) - (cy - ay)*(dx - cx)) / denominator
+        param_j = ((cx - ax)*(by - ay) - (cy - ay)*(bx - ax)) / denominator
+        if not (0 <= param_i <= 1 and 0 <= param_j <= 1):
+            return
+        new_point = (ax + param_i*(bx - ax), ay + param_i*(by - ay))
+        if (
+                new_point[0] > point[0] + self.tolerance or (
+                    abs(new_point[0] - point[0]) <= self.tolerance and
+                    new_point[1] > point[1] + self.tolerance)):
+            self.scheduled_pairs.add(pair)
+            self._schedule(new_point)
+
+    def _passing(self, point):
+        # Bound vectors in the status that pass through the event point form
+        # a contiguous block
+        lower = self._lower_bound(point)
+        upper = lower
+        while upper < len(self.status) and self._key(
+                self.status[upper], point) <= point[1] + self.tolerance:
+            upper += 1
+        return lower, upper
+
+    def _handle_event(self, point, starting, ending):
+        lower, upper = self._passing(point)
+        missed = set(ending).difference(self.status[lower:upper])
+        if missed.intersection(self.status):
+            # Bound vectors that end here but were missed due to round off
+            self.status = [i for i in self.status if i not in missed]
+            lower, upper = self._passing(point)
+        passing = self.status[lower:upper]
+
+        involved = set(passing).union(starting, ending)
+        for pair in combinations(sorted(involved), 2):
+            self.pairs.add(pair)
+
+        continuing = [
+            i for i in passing + starting
+            if i not in ending and not self._close(self.right[i], point)]
+        continuing.sort(key=lambda i: (self.slope[i], i))
+        self.status[lower:upper] = continuing
+
+        if not continuing:
+            if 0 < lower < len(self.status):
+                self._find_new_event(
+                    self.status[lower - 1], self.status[lower], point)
+        else:
+            if lower > 0:
+                self._find_new_event(
+                    self.status[lower - 1], continuing[0], point)
+            upper = lower + len(continuing)
+            if upper < len(self.status):
+                self._find_new_event(
+                    continuing[-1], self.status[upper], point)
+
+    def run(self):
+        while self.queue:
+            point = heappop(self.queue)
+            starting, ending = self.events.pop(point)
+            # Merge events that only differ by round off
+            while self.queue and self._close(self.queue[0], point):
+                other_starting, other_ending = self.events.pop(
+                    heappop(self.queue))
+                starting = starting + other_starting
+                ending = ending + other_ending
+            self._handle_event(point, starting, ending)
+        return self.pairs
+
+
+def _sweep(initial_points, terminal_points, tolerance):
+    return _Sweep(initial_points, terminal_points, tolerance).run()
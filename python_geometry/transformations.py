@@ -5,9 +5,15 @@
     .. versionadded:: 0.1
 
 """
-from numpy import allclose, asanyarray, cross, dot, einsum, isclose
+import re
+
+from numpy import (
+    allclose, arange, asanyarray, can_cast, cross, diff, dot, einsum, empty,
+    int64, isclose, matmul, newaxis, searchsorted, stack, zeros)
 from numpy.linalg import inv, norm
 
+from .config import config
+
 
 def _build_row_vector_matrix(*vectors):
     # Copy makes sure that the data is contiguous in memory
@@ -18,6 +24,91 @@ def _are_orthogonal(vector_0, vector_1):
     return bool(isclose(dot(vector_0, vector_1), 0))
 
 
+def _multiply(vectors, matrix):
+    # Vectors are row vectors, the matrix acts from the right. Single vectors
+    # have the least overhead with dot. Arrays of numbers are viewed as rows
+    # of a matrix and multiplied by matmul, which uses BLAS for floating
+    # point numbers. Even if that takes a copy it is faster than einsum. See
+    # benchmarks/benchmark_transformations.py for timings.
+    if vectors.ndim == 1:
+        return dot(vectors, matrix)
+    if vectors.dtype.kind in 'iufc':
+        return matmul(vectors.reshape(-1, 3), matrix).reshape(vectors.shape)
+    return einsum('...i,ij->...j', vectors, matrix)
+
+
+def _is_chunked(vectors, out, chunk_size):
+    # Large strided arrays are transformed in chunks as well, so that only
+    # one chunk of them is copied at a time
+    return (
+        out is not None or
+        chunk_size is not None or
+        (
+            vectors.size > 3*config['chunk_size'] and
+            not vectors.flags.c_contiguous))
+
+
+def _transform(vectors, matrix, translation=None, out=None, chunk_size=None):
+    v = asanyarray(vectors)
+    if not _is_chunked(v, out, chunk_size):
+        return _translate(_multiply(v, matrix), translation)
+    return _transform_in_chunks(
+        lambda chunk: _translate(_multiply(v[chunk], matrix), translation),
+        v, out, chunk_size)
+
+
+def _translate(vectors, translation):
+    # In place, unless the vectors are integers
+    if translation is None:
+        return vectors
+    if vectors.dtype.kind not in 'fc':
+        vectors = vectors.astype(float)
+    vectors += translation
+    return vectors
+
+
+def _transform_in_chunks(transform, vectors, out, chunk_size):
+    # Chunks along the first axis are transformed one after another and
+    # written to out, which may be the vectors themselves. Only one chunk of
+    # transformed vectors is held at a time.
+    if out is not None and out.shape != vectors.shape:
+        raise ValueError('The output has to have the shape of the vectors.')
+    if chunk_size is None:
+        chunk_size = config['chunk_size']
+    if vectors.ndim < 2:
+        chunks = [Ellipsis]
+    else:
+        rows = max(1, chunk_size // max(1, vectors[0].size // 3))
+        chunks = [
+            slice(start, start + rows)
+            for start in range(0, len(vectors), rows)]
+    for chunk in chunks:
+        result = transform(chunk)
+        if out is None:
+            out = empty(vectors.shape, dtype=result.dtype)
+        elif chunk is chunks[0] and not can_cast(
+                result.dtype, out.dtype, 'same_kind'):
+            # Checked before anything is written, as all chunks share the
+            # dtype of the first one
+            raise TypeError(
+                'Cannot write {} results to an output of type {}.'.format(
+                    result.dtype, out.dtype))
+        out[chunk] = result
+    if out is None:
+        out = transform(Ellipsis)
+    return out
+
+
+def _compose_matrices(matrix_0, inverse_matrix_0, matrix_1, inverse_matrix_1):
+    # Vectors are row vectors, so the first transformation's matrix comes
+    # first. The inverse is only known without inverting if both are.
+    if inverse_matrix_0 is None or inverse_matrix_1 is None:
+        inverse_matrix = None
+    else:
+        inverse_matrix = matmul(inverse_matrix_1, inverse_matrix_0)
+    return matmul(matrix_0, matrix_1), inverse_matrix
+
+
 class AffineTransformation(object):
     """The affine transformation object implements the basic interface to
     affine coordinate transformations.
@@ -34,9 +125,7 @@ class AffineTransformation(object):
         self._y = y
         self._z = z
         self.transformation_matrix = self._build_transformation_matrix(x, y, z)
-        self.inverse_transformation_matrix = (
-            self._build_inverse_transformation_matrix(
-                self.transformation_matrix))
+        self._inverse_transformation_matrix = None
 
     @staticmethod
     def _build_transformation_matrix(x, y, z):
@@ -46,13 +135,84 @@ class AffineTransformation(object):
     def _build_inverse_transformation_matrix(transformation_matrix):
         return inv(transformation_matrix)
 
-    def pushforward(self, vectors):
+    @property
+    def inverse_transformation_matrix(self):
+        """Inverse of the transformation matrix, computed on first use."""
+        if self._inverse_transformation_matrix is None:
+            self._inverse_transformation_matrix = (
+                self._build_inverse_transformation_matrix(
+                    self.transformation_matrix))
+        return self._inverse_transformation_matrix
+
+    @inverse_transformation_matrix.setter
+    def inverse_transformation_matrix(self, value):
+        # None computes the inverse anew on next use
+        self._inverse_transformation_matrix = (
+            None if value is None else asanyarray(value, dtype=float))
+
+    def compose(self, other):
+        """Fuse this transformation and another one applied after it.
+
+        ``a @ b`` is the same as ``a.compose(b)``.
+
+        Parameters
+        ----------
+        other
+            :class:`AffineTransformation` from the target coordinate system
+            of this one to another one, or a :class:`TransformationArray`
+            of them.
+
+        Returns
+        -------
+        AffineTransformation
+            Transformation whose :meth:`pushforward` equals the pushforward
+            by this transformation followed by that of `other`, with a single
+            matrix. It is an :class:`OrthogonalTransformation` if both are.
+            A :class:`TransformationArray` if `other` is one.
+
+        """
+        if isinstance(other, TransformationArray):
+            return TransformationArray._from_transformation(self).compose(
+                other)
+        if isinstance(other, HomogeneousTransformation):
+            return HomogeneousTransformation._from_transformation(
+                self).compose(other)
+        matrix, inverse_matrix = _compose_matrices(
+            self.transformation_matrix,
+            self._inverse_transformation_matrix,
+            other.transformation_matrix,
+            other._inverse_transformation_matrix)
+        if (
+                isinstance(self, OrthogonalTransformation) and
+                isinstance(other, OrthogonalTransformation)):
+            cls = OrthogonalTransformation
+        else:
+            cls = AffineTransformation
+        # The fused basis needs no checks
+        transformation = cls.__new__(cls)
+        AffineTransformation.__init__(transformation, *matrix)
+        transformation._inverse_transformation_matrix = inverse_matrix
+        return transformation
+
+    def __matmul__(self, other):
+        if not isinstance(other, (AffineTransformation, TransformationArray)):
+            return NotImplemented
+        return self.compose(other)
+
+    def pushforward(self, vectors, out=None, chunk_size=None):
         """Transform vectors from reference to target coordinate system.
 
         Parameters
         ----------
         vectors
             Vectors in the reference coordinate system.
+        out
+            Array of the shape of `vectors` to write the result to. Passing
+            `vectors` itself transforms them in place.
+        chunk_size
+            Number of vectors transformed at a time, which bounds the
+            temporary memory. Defaults to ``config['chunk_size']`` if `out`
+            is given, otherwise all vectors are transformed at once.
 
         Returns
         -------
@@ -60,16 +220,24 @@ class AffineTransformation(object):
             Vectors in the target coordinate system.
 
         """
-        v = asanyarray(vectors)
-        return einsum('...i,ij->...j', v, self.transformation_matrix)
+        return _transform(
+            vectors, self.transformation_matrix, out=out,
+            chunk_size=chunk_size)
 
-    def pullback(self, vectors):
+    def pullback(self, vectors, out=None, chunk_size=None):
         """Transform vectors from target to reference coordinate system.
 
         Parameters
         ----------
         vectors
             Vectors in the target coordinate system.
+        out
+            Array of the shape of `vectors` to write the result to. Passing
+            `vectors` itself transforms them in place.
+        chunk_size
+            Number of vectors transformed at a time, which bounds the
+            temporary memory. Defaults to ``config['chunk_size']`` if `out`
+            is given, otherwise all vectors are transformed at once.
 
         Returns
         -------
@@ -77,8 +245,9 @@ class AffineTransformation(object):
             Vectors in the reference coordinate system.
 
         """
-        v = asanyarray(vectors)
-        return einsum('...i,ij->...j', v, self.inverse_transformation_matrix)
+        return _transform(
+            vectors, self.inverse_transformation_matrix, out=out,
+            chunk_size=chunk_size)
 
     def __repr__(self):
         return (
@@ -144,3 +313,395 @@ class OrthogonalTransformation(AffineTransformation):
         # The inverse of an orthonormal matrix
         # Copy makes sure that the data is contiguous in memory
         return transformation_matrix.T.copy()
+
+
+class HomogeneousTransformation(AffineTransformation):
+    """Affine transformation with a translation, i.e. of points between
+    coordinate systems with different origins.
+
+    Points ``p`` are transformed to ``p.dot(transformation_matrix) +
+    translation``, which is the product of ``[p, 1]`` and the 4x4
+    :attr:`homogeneous_matrix`. Direction vectors are not translated.
+
+    .. versionadded:: 0.4
+
+    Parameters
+    ----------
+    x, y, z
+        The new basis vectors expressed in the terms of the reference basis.
+    translation
+        Translation added to transformed points, i.e. the reference origin
+        in the target coordinate system.
+
+    """
+
+    def __init__(self, x, y, z, translation=(0, 0, 0)):
+        super(HomogeneousTransformation, self).__init__(x, y, z)
+        self.translation = asanyarray(translation, dtype=float)
+
+    @classmethod
+    def from_homogeneous_matrix(cls, homogeneous_matrix):
+        """Build the transformation from a 4x4 :attr:`homogeneous_matrix`."""
+        homogeneous_matrix = asanyarray(homogeneous_matrix, dtype=float)
+        if (
+                homogeneous_matrix.shape != (4, 4) or
+                not allclose(homogeneous_matrix[:, 3], [0, 0, 0, 1])):
+            raise ValueError(
+                'A homogeneous matrix is 4x4 with a last column of '
+                '(0, 0, 0, 1).')
+        return cls(*homogeneous_matrix[:3, :3], translation=(
+            homogeneous_matrix[3, :3]))
+
+    @classmethod
+    def _from_transformation(cls, transformation):
+        homogeneous_transformation = cls(*transformation.transformation_matrix)
+        homogeneous_transformation._inverse_transformation_matrix = (
+            transformation._inverse_transformation_matrix)
+        return homogeneous_transformation
+
+    @property
+    def homogeneous_matrix(self):
+        """4x4 matrix acting on points ``[p, 1]`` from the right."""
+        homogeneous_matrix = zeros((4, 4))
+        homogeneous_matrix[:3, :3] = self.transformation_matrix
+        homogeneous_matrix[3, :3] = self.translation
+        homogeneous_matrix[3, 3] = 1
+        return homogeneous_matrix
+
+    def pushforward(self, vectors, out=None, chunk_size=None, points=False):
+        """Transform vectors from reference to target coordinate system.
+
+        Parameters
+        ----------
+        vectors
+            Vectors in the reference coordinate system.
+        out
+            Array of the shape of `vectors` to write the result to. Passing
+            `vectors` itself transforms them in place.
+        chunk_size
+            Number of vectors transformed at a time, which bounds the
+            temporary memory. Defaults to ``config['chunk_size']`` if `out`
+            is given, otherwise all vectors are transformed at once.
+        points
+            Whether the vectors are points, which are translated, or
+            directions, which are not.
+
+        Returns
+        -------
+        np.ndarray
+            Vectors in the target coordinate system.
+
+        """
+        return _transform(
+            vectors, self.transformation_matrix,
+            self.translation if points else None, out, chunk_size)
+
+    def pullback(self, vectors, out=None, chunk_size=None, points=False):
+        """Transform vectors from target to reference coordinate system.
+
+        Parameters
+        ----------
+        vectors
+            Vectors in the target coordinate system.
+        out
+            Array of the shape of `vectors` to write the result to. Passing
+            `vectors` itself transforms them in place.
+        chunk_size
+            Number of vectors transformed at a time, which bounds the
+            temporary memory. Defaults to ``config['chunk_size']`` if `out`
+            is given, otherwise all vectors are transformed at once.
+        points
+            Whether the vectors are points, which are translated, or
+            directions, which are not.
+
+        Returns
+        -------
+        np.ndarray
+            Vectors in the reference coordinate system.
+
+        """
+        # The translation is transformed instead of every point
+        return _transform(
+            vectors, self.inverse_transformation_matrix,
+            -self.translation.dot(self.inverse_transformation_matrix)
+            if points else None,
+            out, chunk_size)
+
+    def compose(self, other):
+        """Fuse this transformation and another one applied after it.
+
+        ``a @ b`` is the same as ``a.compose(b)``.
+
+        Parameters
+        ----------
+        other
+            :class:`AffineTransformation` from the target coordinate system
+            of this one to another one.
+
+        Returns
+        -------
+        HomogeneousTransformation
+            Transformation whose :meth:`pushforward` equals the pushforward
+            by this transformation followed by that of `other`, with a single
+            matrix and translation.
+
+        """
+        if isinstance(other, TransformationArray):
+            raise NotImplementedError(
+                'Composing a HomogeneousTransformation with a '
+                'TransformationArray is not yet implemented.')
+        if not isinstance(other, HomogeneousTransformation):
+            other = HomogeneousTransformation._from_transformation(other)
+        matrix, inverse_matrix = _compose_matrices(
+            self.transformation_matrix,
+            self._inverse_transformation_matrix,
+            other.transformation_matrix,
+            other._inverse_transformation_matrix)
+        transformation = HomogeneousTransformation(
+            *matrix,
+            translation=(
+                self.translation.dot(other.transformation_matrix) +
+                other.translation))
+        transformation._inverse_transformation_matrix = inverse_matrix
+        return transformation
+
+    def __repr__(self):
+        return (
+            '{self.__class__.__name__}('
+            'x={self._x!r}, '
+            'y={self._y!r}, '
+            'z={self._z!r}, '
+            'translation={self.translation!r}'
+            ')').format(self=self)
+
+
+class TransformationArray(object):
+    """Stack of affine transformations applied to many sets of vectors at
+    once, e.g. one transformation per grain of a polycrystal.
+
+    .. versionadded:: 0.4
+
+    Parameters
+    ----------
+    transformation_matrices
+        (M, 3, 3) array of the transformation matrices, see
+        :attr:`AffineTransformation.transformation_matrix`.
+    inverse_transformation_matrices
+        (M, 3, 3) array of their inverses. If not given, they are computed on
+        first use.
+
+    """
+
+    def __init__(
+            self,
+            transformation_matrices,
+            inverse_transformation_matrices=None):
+        self.transformation_matrices = asanyarray(
+            transformation_matrices, dtype=float).reshape(-1, 3, 3)
+        if inverse_transformation_matrices is not None:
+            inverse_transformation_matrices = asanyarray(
+                inverse_transformation_matrices, dtype=float).reshape(-1, 3, 3)
+        self._inverse_transformation_matrices = (
+            inverse_transformation_matrices)
+
+    @classmethod
+    def from_transformations(cls, transformations):
+        """Stack a sequence of :class:`AffineTransformation` objects.
+
+        Their inverse matrices are reused if all of them are already known,
+        otherwise all are inverted at once on first use.
+
+        """
+        transformations = list(transformations)
+        for transformation in transformations:
+            _check_no_translation(transformation)
+        if not transformations:
+            return cls(asanyarray([]))
+        inverse_matrices = [
+            t._inverse_transformation_matrix for t in transformations]
+        return cls(
+            stack([t.transformation_matrix for t in transformations]),
+            None if any(m is None for m in inverse_matrices) else
+            stack(inverse_matrices))
+
+    @classmethod
+    def _from_transformation(cls, transformation):
+        _check_no_translation(transformation)
+        inverse_matrix = transformation._inverse_transformation_matrix
+        return cls(
+            transformation.transformation_matrix[newaxis],
+            None if inverse_matrix is None else inverse_matrix[newaxis])
+
+    @property
+    def inverse_transformation_matrices(self):
+        """Inverses of the transformation matrices, computed on first use."""
+        if self._inverse_transformation_matrices is None:
+            self._inverse_transformation_matrices = inv(
+                self.transformation_matrices)
+        return self._inverse_transformation_matrices
+
+    def __len__(self):
+        return len(self.transformation_matrices)
+
+    def compose(self, other):
+        """Fuse these transformations and others applied after them.
+
+        ``a @ b`` is the same as ``a.compose(b)``.
+
+        Parameters
+        ----------
+        other
+            :class:`TransformationArray` of the same length, or of length
+            one, or an :class:`AffineTransformation` that follows every
+            transformation.
+
+        Returns
+        -------
+        TransformationArray
+            Transformations whose matrices are the products of those of
+            both.
+
+        """
+        if isinstance(other, AffineTransformation):
+            other = TransformationArray._from_transformation(other)
+        return TransformationArray(*_compose_matrices(
+            self.transformation_matrices,
+            self._inverse_transformation_matrices,
+            other.transformation_matrices,
+            other._inverse_transformation_matrices))
+
+    def __matmul__(self, other):
+        if not isinstance(other, (AffineTransformation, TransformationArray)):
+            return NotImplemented
+        return self.compose(other)
+
+    def __rmatmul__(self, other):
+        if not isinstance(other, AffineTransformation):
+            return NotImplemented
+        return TransformationArray._from_transformation(other).compose(self)
+
+    def pushforward(
+            self, vectors, indices=None, offsets=None, out=None,
+            chunk_size=None):
+        """Transform vectors from reference to target coordinate systems.
+
+        Parameters
+        ----------
+        vectors
+            (N, 3) array of vectors in the reference coordinate systems.
+            Without `indices` and `offsets` an (M, ..., 3) array whose first
+            axis runs over the transformations.
+        indices
+            (N,) array of the index of the transformation of every vector.
+        offsets
+            (M + 1,) array of non-decreasing indices into `vectors`.
+            Transformation ``i`` applies to the vectors
+            ``offsets[i]:offsets[i + 1]``.
+        out
+            Array of the shape of `vectors` to write the result to. Passing
+            `vectors` itself transforms them in place.
+        chunk_size
+            Number of vectors transformed at a time, which bounds the
+            temporary memory. Defaults to ``config['chunk_size']`` if `out`
+            is given, otherwise all vectors are transformed at once.
+
+        Returns
+        -------
+        np.ndarray
+            Vectors in the target coordinate systems.
+
+        """
+        return self._apply(
+            self.transformation_matrices, vectors, indices, offsets, out,
+            chunk_size)
+
+    def pullback(
+            self, vectors, indices=None, offsets=None, out=None,
+            chunk_size=None):
+        """Transform vectors from target to reference coordinate systems.
+
+        Parameters
+        ----------
+        vectors
+            (N, 3) array of vectors in the target coordinate systems.
+            Without `indices` and `offsets` an (M, ..., 3) array whose first
+            axis runs over the transformations.
+        indices
+            (N,) array of the index of the transformation of every vector.
+        offsets
+            (M + 1,) array of non-decreasing indices into `vectors`.
+            Transformation ``i`` applies to the vectors
+            ``offsets[i]:offsets[i + 1]``.
+        out
+            Array of the shape of `vectors` to write the result to. Passing
+            `vectors` itself transforms them in place.
+        chunk_size
+            Number of vectors transformed at a time, which bounds the
+            temporary memory. Defaults to ``config['chunk_size']`` if `out`
+            is given, otherwise all vectors are transformed at once.
+
+        Returns
+        -------
+        np.ndarray
+            Vectors in the reference coordinate systems.
+
+        """
+        return self._apply(
+            self.inverse_transformation_matrices, vectors, indices, offsets,
+            out, chunk_size)
+
+    def _apply(self, matrices, vectors, indices, offsets, out, chunk_size):
+        v = asanyarray(vectors)
+        if indices is not None and offsets is not None:
+            raise ValueError('Either indices or offsets can be given.')
+        if indices is None and offsets is None:
+            # Vectors are row vectors, the matrices act from the right
+            matrices = matrices.reshape(
+                (len(matrices),) + (1,)*(v.ndim - 2) + (3, 3))
+
+            def transform(chunk):
+                return matmul(
+                    v[chunk][..., newaxis, :], matrices[chunk])[..., 0, :]
+        elif offsets is not None:
+            offsets = asanyarray(offsets, dtype=int64)
+            if (
+                    offsets.shape != (len(matrices) + 1,) or
+                    offsets[0] != 0 or offsets[-1] != len(v) or
+                    (diff(offsets) < 0).any()):
+                raise ValueError(
+                    'Offsets have to increase from 0 to the number of '
+                    'vectors, with one more than transformations.')
+
+            def transform(chunk):
+                rows = (
+                    arange(len(v)) if chunk is Ellipsis else
+                    arange(*chunk.indices(len(v))))
+                return einsum(
+                    '...i,...ij->...j',
+                    v[chunk],
+                    matrices[searchsorted(offsets, rows, side='right') - 1])
+        else:
+            indices = asanyarray(indices)
+
+            # Gathering the matrices is faster than padding the vectors of
+            # every transformation to the same number for a stacked matmul
+            def transform(chunk):
+                return einsum(
+                    '...i,...ij->...j', v[chunk], matrices[indices[chunk]])
+
+        if not _is_chunked(v, out, chunk_size):
+            return transform(Ellipsis)
+        return _transform_in_chunks(transform, v, out, chunk_size)
+
+    def __repr__(self):
+        return re.sub(r'\s+', ' ', (
+            '{self.__class__.__name__}('
+            'transformation_matrices={self.transformation_matrices!r}'
+            ')').format(self=self))
+
+
+def _check_no_translation(transformation):
+    if isinstance(transformation, HomogeneousTransformation):
+        raise NotImplementedError(
+            'Stacking transformations with a translation is not yet '
+            'implemented.')
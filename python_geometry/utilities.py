@@ -1,16 +1,68 @@
 # -*- coding: utf-8 -*-
 from __future__ import division
 
+from collections import namedtuple
+
 from numpy import (
-    allclose, asanyarray, cross, dot, errstate, isclose, mean, nan_to_num,
-    nanmean, newaxis, stack, zeros, zeros_like)
+    all, allclose, array, asanyarray, atleast_2d, broadcast_arrays,
+    broadcast_to, concatenate, count_nonzero, cross, einsum, empty, errstate,
+    full, int8, int64, isclose, isnan, mean, nan, nan_to_num, newaxis, ones,
+    sort, stack, where, zeros, zeros_like)
 from numpy.linalg import det, norm
 
 from .config import config
 from .bound_vector import BoundVector
 from .line_segment import LineSegment
+from .parallel import get_chunk_bounds, parallel_map
 from .plane import Plane
-from .vector_utilities import are_antiparallel, are_parallel
+from .vector_utilities import (
+    _add, _allclose, _are_antiparallel, _are_parallel, _cross, _det, _divide,
+    _dot, _isclose, _nanmean, _norm, _quotient, _scale, _subtract,
+    are_antiparallel_mask, are_parallel_mask)
+
+
+INTERSECTION_NONE = 0
+INTERSECTION_POINT = 1
+INTERSECTION_LINE_SEGMENT = 2
+INTERSECTION_BOUND_VECTOR = 3
+
+
+SegmentPlaneIntersections = namedtuple('SegmentPlaneIntersections', [
+    'params', 'intersects', 'in_plane', 'points'])
+
+
+class Intersections(namedtuple('Intersections', [
+        'kind', 'end_point_0', 'end_point_1', 'end_point_0_included',
+        'end_point_1_included'])):
+    """Element-wise intersections as returned by the batched routines.
+
+    ``kind`` holds one of the ``INTERSECTION_*`` codes per element. Points
+    are stored in both ``end_point_0`` and ``end_point_1``; for overlaps the
+    end points and their inclusion flags describe the resulting
+    :class:`LineSegment` or :class:`BoundVector`. Elements without an
+    intersection have ``nan`` coordinates.
+
+    """
+    __slots__ = ()
+
+    def get(self, index):
+        """Return the intersection at `index` as the scalar routines would."""
+        kind = self.kind[index]
+        if kind == INTERSECTION_POINT:
+            return self.end_point_0[index]
+        elif kind == INTERSECTION_LINE_SEGMENT:
+            return LineSegment(
+                end_point_0=self.end_point_0[index],
+                end_point_1=self.end_point_1[index],
+                end_point_0_included=self.end_point_0_included[index],
+                end_point_1_included=self.end_point_1_included[index])
+        elif kind == INTERSECTION_BOUND_VECTOR:
+            return BoundVector(
+                initial_point=self.end_point_0[index],
+                terminal_point=self.end_point_1[index],
+                initial_point_included=self.end_point_0_included[index],
+                terminal_point_included=self.end_point_1_included[index])
+        return None
 
 
 def get_normal_vector(points):
@@ -43,97 +95,407 @@ def get_tangent_vectors(points):
     return tangents
 
 
+# Maps pairs of types to the function computing their intersection and
+# whether the arguments have to be swapped before calling it
+_intersection_functions = {}
+_intersection_functions_cache = {}
+
+
+def register_intersection(type_0, type_1):
+    def decorator(function):
+        _intersection_functions[(type_0, type_1)] = (function, False)
+        if type_0 is not type_1:
+            _intersection_functions[(type_1, type_0)] = (function, True)
+        _intersection_functions_cache.clear()
+        return function
+    return decorator
+
+
+def _find_intersection_function(type_0, type_1):
+    # The most specific registered pair along both method resolution orders
+    # wins
+    for base_0 in type_0.__mro__:
+        for base_1 in type_1.__mro__:
+            if (base_0, base_1) in _intersection_functions:
+                return _intersection_functions[(base_0, base_1)]
+    return None, False
+
+
 def get_intersection(object_0, object_1):
-    if isinstance(object_0, BoundVector) and isinstance(object_1, BoundVector):
-        intersection = _get_intersection_bound_vector_bound_vector(
-            bound_vector_0=object_0,
-            bound_vector_1=object_1)
-    elif isinstance(object_0, BoundVector) and isinstance(object_1, Plane):
-        intersection = _get_intersection_bound_vector_plane(
-            bound_vector=object_0,
-            plane=object_1)
-    elif isinstance(object_0, Plane) and isinstance(object_1, BoundVector):
-        intersection = _get_intersection_bound_vector_plane(
-            bound_vector=object_1,
-            plane=object_0)
-    else:
+    types = (type(object_0), type(object_1))
+    try:
+        function, swapped = _intersection_functions_cache[types]
+    except KeyError:
+        function, swapped = _intersection_functions_cache.setdefault(
+            types, _find_intersection_function(*types))
+    if function is None:
         raise NotImplementedError(
             'Intersection of a {} and a {} is not yet implemented.'.format(
                 object_0.__class__.__name__,
                 object_1.__class__.__name__))
-    return intersection
-
-
-def _get_intersection_bound_vector_bound_vector(
-        bound_vector_0, bound_vector_1):
-    vectors_are_parallel = are_parallel(
-        bound_vector_0.free_vector, bound_vector_1.free_vector)
-
-    initial_point_vector = BoundVector(
-        initial_point=bound_vector_0.initial_point,
-        terminal_point=bound_vector_1.initial_point)
-
-    vectors_in_plane = bool(isclose(
-        det(stack(
+    if swapped:
+        return function(object_1, object_0)
+    return function(object_0, object_1)
+
+
+def get_intersections_bound_vectors_bound_vectors(
+        initial_points_0,
+        terminal_points_0,
+        initial_points_1,
+        terminal_points_1,
+        initial_points_0_included=True,
+        terminal_points_0_included=True,
+        initial_points_1_included=True,
+        terminal_points_1_included=True,
+        workers=None):
+    # Element-wise counterpart of _get_intersection_bound_vector_bound_vector
+    # that works on (..., 3) arrays; every decision below mirrors the scalar
+    # implementation so that both yield identical results. With several
+    # workers, chunks of the elements are handled by worker processes.
+    ip0, tp0, ip1, tp1 = broadcast_arrays(
+        asanyarray(initial_points_0, dtype=float),
+        asanyarray(terminal_points_0, dtype=float),
+        asanyarray(initial_points_1, dtype=float),
+        asanyarray(terminal_points_1, dtype=float))
+    shape = ip0.shape[:-1]
+    ip0_inc, tp0_inc, ip1_inc, tp1_inc = [
+        broadcast_to(asanyarray(included, dtype=bool), shape).reshape(-1)
+        for included in (
+            initial_points_0_included,
+            terminal_points_0_included,
+            initial_points_1_included,
+            terminal_points_1_included)]
+    ip0, tp0, ip1, tp1 = [
+        points.reshape(-1, 3) for points in (ip0, tp0, ip1, tp1)]
+
+    if workers is not None and workers > 1:
+        chunk_bounds = get_chunk_bounds(ones(len(ip0), dtype=int64), workers)
+        results = parallel_map(
+            get_intersections_bound_vectors_bound_vectors,
+            [
+                [
+                    values[start:stop]
+                    for values in (
+                        ip0, tp0, ip1, tp1,
+                        ip0_inc, tp0_inc, ip1_inc, tp1_inc)]
+                for start, stop in zip(chunk_bounds[:-1], chunk_bounds[1:])],
+            workers)
+        return Intersections(*[
+            concatenate(field).reshape(shape + field[0].shape[1:])
+            for field in zip(*results)])
+
+    fv0 = tp0 - ip0
+    fv1 = tp1 - ip1
+    ipv = ip1 - ip0
+
+    vectors_are_parallel = are_parallel_mask(fv0, fv1)
+    vectors_in_plane = isclose(det(stack([fv0, fv1, ipv], axis=-1)), 0)
+    vectors_in_line = (
+        isclose(
+            norm(cross(ipv, fv0), axis=-1),
+            0,
+            **config['numbers_close_kwargs']) &
+        isclose(
+            norm(cross(ipv, fv1), axis=-1),
+            0,
+            **config['numbers_close_kwargs']) &
+        vectors_are_parallel)
+
+    kind = full(ip0_inc.shape, INTERSECTION_NONE, dtype=int8)
+    end_point_0 = full(ip0.shape, nan)
+    end_point_1 = full(ip0.shape, nan)
+    end_point_0_included = zeros(ip0_inc.shape, dtype=bool)
+    end_point_1_included = zeros(ip0_inc.shape, dtype=bool)
+
+    # Collinear bound vectors
+    with errstate(divide='ignore', invalid='ignore'):
+        bv0_bv1_ip_param = _nanmean_rows(ipv / fv0)
+        bv0_bv1_tp_param = _nanmean_rows((tp1 - ip0) / fv0)
+    params = sort(
+        stack(
             [
-                bound_vector_0.free_vector,
-                bound_vector_1.free_vector,
-                initial_point_vector.free_vector
+                bv0_bv1_ip_param,
+                bv0_bv1_tp_param,
+                zeros(ip0_inc.shape),
+                zeros(ip0_inc.shape) + 1
             ],
-            axis=-1)),
-        0))
+            axis=-1),
+        axis=-1)
+    with errstate(invalid='ignore'):
+        disjoint = (
+            (
+                (params[:, 1] < 0) &
+                ~isclose(params[:, 1], 0, **config['numbers_close_kwargs'])) |
+            (
+                (params[:, 2] > 1) &
+                ~isclose(params[:, 2], 1, **config['numbers_close_kwargs'])))
+    touching = vectors_in_line & ~disjoint
+    antiparallel = are_antiparallel_mask(fv0, fv1)
+    # The end point of bound_vector_1 that lies at the start and at the end
+    # of the overlap, depending on its orientation relative to bound_vector_0
+    partner_start_included = where(antiparallel, tp1_inc, ip1_inc)
+    partner_end_included = where(antiparallel, ip1_inc, tp1_inc)
+
+    tips_touch = touching & isclose(
+        params[:, 1], 1, **config['numbers_close_kwargs'])
+    origins_touch = touching & ~tips_touch & isclose(
+        params[:, 2], 0, **config['numbers_close_kwargs'])
+    overlap = touching & ~tips_touch & ~origins_touch
+
+    mask = tips_touch & tp0_inc & partner_start_included
+    kind[mask] = INTERSECTION_POINT
+    end_point_0[mask] = tp0[mask]
+    end_point_1[mask] = tp0[mask]
+
+    mask = origins_touch & ip0_inc & partner_end_included
+    kind[mask] = INTERSECTION_POINT
+    end_point_0[mask] = ip0[mask]
+    end_point_1[mask] = ip0[mask]
+
+    kind[overlap & antiparallel] = INTERSECTION_LINE_SEGMENT
+    kind[overlap & ~antiparallel] = INTERSECTION_BOUND_VECTOR
+    end_point_0[overlap] = (
+        ip0[overlap] + params[overlap, 1, newaxis]*fv0[overlap])
+    end_point_1[overlap] = (
+        ip0[overlap] + params[overlap, 2, newaxis]*fv0[overlap])
+    end_point_0_included[overlap] = where(
+        isclose(params[:, 1], 0, **config['numbers_close_kwargs']),
+        where(
+            isclose(params[:, 0], 0, **config['numbers_close_kwargs']),
+            ip0_inc & partner_start_included,
+            ip0_inc),
+        partner_start_included)[overlap]
+    end_point_1_included[overlap] = where(
+        isclose(params[:, 2], 1, **config['numbers_close_kwargs']),
+        where(
+            isclose(params[:, 3], 1, **config['numbers_close_kwargs']),
+            tp0_inc & partner_end_included,
+            tp0_inc),
+        partner_end_included)[overlap]
+
+    # Crossing bound vectors
+    crossing = ~vectors_are_parallel & vectors_in_plane
+    with errstate(divide='ignore', invalid='ignore'):
+        denominator = norm(cross(fv0, fv1), axis=-1)
+        param_0 = norm(cross(fv1, ipv), axis=-1) / denominator
+        param_1 = norm(cross(fv0, ipv), axis=-1) / denominator
+    param_0[are_antiparallel_mask(cross(fv1, ipv), cross(fv1, fv0))] *= -1
+    param_1[
+        are_antiparallel_mask(cross(fv0, ip0 - ip1), cross(fv0, fv1))] *= -1
+
+    atol = config['numbers_close_kwargs']['atol']
+    with errstate(invalid='ignore'):
+        crossing &= where(ip0_inc, param_0 >= 0 - atol, param_0 > 0 - atol)
+        crossing &= where(tp0_inc, param_0 <= 1 + atol, param_0 < 1 + atol)
+        crossing &= where(ip1_inc, param_1 >= 0 - atol, param_1 > 0 - atol)
+        crossing &= where(tp1_inc, param_1 <= 1 + atol, param_1 < 1 + atol)
+    kind[crossing] = INTERSECTION_POINT
+    end_point_0[crossing] = (
+        ip0[crossing] + param_0[crossing, newaxis]*fv0[crossing])
+    end_point_1[crossing] = end_point_0[crossing]
+
+    end_point_0_included[kind == INTERSECTION_POINT] = True
+    end_point_1_included[kind == INTERSECTION_POINT] = True
+
+    # Bound vectors of zero length are degenerate and rare, they are left to
+    # the scalar implementation so that both keep yielding identical results
+    degenerate = all(fv0 == 0, axis=-1) | all(fv1 == 0, axis=-1)
+    for i in degenerate.nonzero()[0]:
+        intersection = _get_intersection_bound_vector_bound_vector(
+            BoundVector(ip0[i], tp0[i], ip0_inc[i], tp0_inc[i]),
+            BoundVector(ip1[i], tp1[i], ip1_inc[i], tp1_inc[i]))
+        kind[i] = INTERSECTION_NONE
+        end_point_0[i] = end_point_1[i] = nan
+        end_point_0_included[i] = end_point_1_included[i] = False
+        if isinstance(intersection, BoundVector):
+            kind[i] = INTERSECTION_BOUND_VECTOR
+            end_point_0[i] = intersection.initial_point
+            end_point_1[i] = intersection.terminal_point
+            end_point_0_included[i] = intersection.initial_point_included
+            end_point_1_included[i] = intersection.terminal_point_included
+        elif isinstance(intersection, LineSegment):
+            kind[i] = INTERSECTION_LINE_SEGMENT
+            end_point_0[i] = intersection.end_point_0
+            end_point_1[i] = intersection.end_point_1
+            end_point_0_included[i] = intersection.end_point_0_included
+            end_point_1_included[i] = intersection.end_point_1_included
+        elif intersection is not None:
+            kind[i] = INTERSECTION_POINT
+            end_point_0[i] = end_point_1[i] = intersection
+            end_point_0_included[i] = end_point_1_included[i] = True
+
+    return Intersections(
+        kind=kind.reshape(shape),
+        end_point_0=end_point_0.reshape(shape + (3,)),
+        end_point_1=end_point_1.reshape(shape + (3,)),
+        end_point_0_included=end_point_0_included.reshape(shape),
+        end_point_1_included=end_point_1_included.reshape(shape))
+
+
+def get_intersections_segments_planes(
+        segments,
+        points_in_plane,
+        normal_vectors,
+        initial_points_included=True,
+        terminal_points_included=True,
+        chunk_size=None,
+        workers=None):
+    # Intersects each of the N segments, given as (N, 2, 3) array of initial
+    # and terminal points, with each of the M planes. The (N, M) results
+    # follow _get_intersection_bound_vector_plane: params are the positions
+    # along the segments, in_plane marks segments lying in a plane and
+    # points are nan wherever there is no point intersection. The work is
+    # done in blocks of about chunk_size segment/plane pairs, by as many
+    # worker processes as given.
+    segments = asanyarray(segments, dtype=float)
+    points_in_plane = atleast_2d(asanyarray(points_in_plane, dtype=float))
+    normal_vectors = atleast_2d(asanyarray(normal_vectors, dtype=float))
+    initial_points_included = broadcast_to(
+        asanyarray(initial_points_included, dtype=bool), segments.shape[:1])
+    terminal_points_included = broadcast_to(
+        asanyarray(terminal_points_included, dtype=bool), segments.shape[:1])
+    if chunk_size is None:
+        chunk_size = config['chunk_size']
+
+    n_segments = len(segments)
+    n_planes = len(normal_vectors)
+    if workers is not None and workers > 1:
+        chunk_bounds = get_chunk_bounds(
+            full(n_segments, n_planes, dtype=int64), workers)
+        results = parallel_map(
+            get_intersections_segments_planes,
+            [
+                (
+                    segments[start:stop],
+                    points_in_plane,
+                    normal_vectors,
+                    initial_points_included[start:stop],
+                    terminal_points_included[start:stop],
+                    chunk_size)
+                for start, stop in zip(chunk_bounds[:-1], chunk_bounds[1:])],
+            workers)
+        return SegmentPlaneIntersections(*[
+            concatenate(field) for field in zip(*results)])
+
+    params = empty((n_segments, n_planes))
+    intersects = empty((n_segments, n_planes), dtype=bool)
+    in_plane = empty((n_segments, n_planes), dtype=bool)
+    points = full((n_segments, n_planes, 3), nan)
+
+    segments_per_chunk = max(1, chunk_size // max(1, n_planes))
+    for start in range(0, n_segments, segments_per_chunk):
+        chunk = slice(start, start + segments_per_chunk)
+        initial_points = segments[chunk, 0]
+        free_vectors = segments[chunk, 1] - initial_points
+
+        # Every end point is on a plane or on one of its sides by its own
+        # distance, as the vertices are when splitting polygons, so that
+        # the result does not depend on the direction of the segment
+        initial_distances = einsum(
+            'nmk,mk->nm',
+            initial_points[:, newaxis] - points_in_plane[newaxis],
+            normal_vectors)
+        terminal_distances = einsum(
+            'nmk,mk->nm',
+            segments[chunk, 1, newaxis] - points_in_plane[newaxis],
+            normal_vectors)
+        at_initial_point = isclose(
+            initial_distances, 0, **config['numbers_close_kwargs'])
+        at_terminal_point = isclose(
+            terminal_distances, 0, **config['numbers_close_kwargs'])
+        in_plane[chunk] = at_initial_point & at_terminal_point
+
+        with errstate(divide='ignore', invalid='ignore'):
+            chunk_params = nan_to_num(
+                initial_distances / (initial_distances - terminal_distances))
+        chunk_params[at_initial_point & ~in_plane[chunk]] = 0
+        chunk_params[at_terminal_point & ~in_plane[chunk]] = 1
+        chunk_intersects = ~in_plane[chunk] & (
+            (at_initial_point & initial_points_included[chunk, newaxis]) |
+            (at_terminal_point & terminal_points_included[chunk, newaxis]) |
+            (
+                ~at_initial_point & ~at_terminal_point &
+                (initial_distances*terminal_distances < 0)))
+        params[chunk] = chunk_params
+        intersects[chunk] = chunk_intersects
+
+        i, j = chunk_intersects.nonzero()
+        points[start + i, j] = (
+            initial_points[i] + chunk_params[i, j, newaxis]*free_vectors[i])
+
+    return SegmentPlaneIntersections(
+        params=params,
+        intersects=intersects,
+        in_plane=in_plane,
+        points=points)
+
+
+def _nanmean_rows(values):
+    # Same as nanmean(values, axis=-1) but silent for all-nan rows
+    valid = ~isnan(values)
+    return where(valid, values, 0).sum(axis=-1) / count_nonzero(valid, axis=-1)
+
+
+@register_intersection(BoundVector, BoundVector)
+def _get_intersection_bound_vector_bound_vector(
+        bound_vector_0, bound_vector_1):
+    # All computations are done on plain floats, which is a lot faster than
+    # NumPy for single 3-vectors
+    initial_point_0 = bound_vector_0.initial_point.tolist()
+    terminal_point_0 = bound_vector_0.terminal_point.tolist()
+    initial_point_1 = bound_vector_1.initial_point.tolist()
+    terminal_point_1 = bound_vector_1.terminal_point.tolist()
+    free_vector_0 = _subtract(terminal_point_0, initial_point_0)
+    free_vector_1 = _subtract(terminal_point_1, initial_point_1)
+    initial_point_vector = _subtract(initial_point_1, initial_point_0)
+
+    vectors_are_parallel = _are_parallel(free_vector_0, free_vector_1)
+
+    vectors_in_plane = _isclose(
+        _det(free_vector_0, free_vector_1, initial_point_vector),
+        0)
 
     vectors_in_line = (
-            bool(isclose(
-                norm(
-                    cross(
-                        initial_point_vector.free_vector,
-                        bound_vector_0.free_vector)),
+            _isclose(
+                _norm(_cross(initial_point_vector, free_vector_0)),
                 0,
-                **config['numbers_close_kwargs'])) and
-            bool(isclose(
-                norm(
-                    cross(
-                        initial_point_vector.free_vector,
-                        bound_vector_1.free_vector)),
+                **config['numbers_close_kwargs']) and
+            _isclose(
+                _norm(_cross(initial_point_vector, free_vector_1)),
                 0,
-                **config['numbers_close_kwargs'])) and
+                **config['numbers_close_kwargs']) and
             vectors_are_parallel)
 
     if vectors_in_line:
         # TODO: work with get_intersection(Point, BoundVector), should it
         # ever exist
-        with errstate(invalid='ignore'):
-            bv0_bv1_ip_param = nanmean(
-                (bound_vector_1.initial_point -
-                 bound_vector_0.initial_point) /
-                bound_vector_0.free_vector)
-            bv0_bv1_tp_param = nanmean(
-                (bound_vector_1.terminal_point -
-                 bound_vector_0.initial_point) /
-                bound_vector_0.free_vector)
+        bv0_bv1_ip_param = _nanmean(
+            _divide(initial_point_vector, free_vector_0))
+        bv0_bv1_tp_param = _nanmean(
+            _divide(
+                _subtract(terminal_point_1, initial_point_0),
+                free_vector_0))
 
         params = sorted([bv0_bv1_ip_param, bv0_bv1_tp_param, 0, 1])
 
         if (
                 (
                     params[1] < 0 and
-                    not isclose(
+                    not _isclose(
                         params[1],
                         0,
                         **config['numbers_close_kwargs'])) or
                 (
                     params[-2] > 1 and
-                    not isclose(
+                    not _isclose(
                         params[-2],
                         1,
                         **config['numbers_close_kwargs']))):
             intersection = None
-        elif are_antiparallel(
-                bound_vector_0.free_vector, bound_vector_1.free_vector):
+        elif _are_antiparallel(free_vector_0, free_vector_1):
             new_end_point_0_param = params[1]
             new_end_point_1_param = params[-2]
-            if isclose(
+            if _isclose(
                     new_end_point_0_param,
                     1,
                     **config['numbers_close_kwargs']):
@@ -145,7 +507,7 @@ def _get_intersection_bound_vector_bound_vector(
                     intersection = bound_vector_0.terminal_point
                 else:
                     intersection = None
-            elif isclose(
+            elif _isclose(
                     new_end_point_1_param,
                     0,
                     **config['numbers_close_kwargs']):
@@ -159,18 +521,18 @@ def _get_intersection_bound_vector_bound_vector(
                     intersection = None
             else:
                 # If we are here it means that there is an overlap
-                new_end_point_0 = (
-                    bound_vector_0.initial_point +
-                    new_end_point_0_param*bound_vector_0.free_vector)
-                new_end_point_1 = (
-                    bound_vector_0.initial_point +
-                    new_end_point_1_param*bound_vector_0.free_vector)
-
-                if isclose(
+                new_end_point_0 = _add(
+                    initial_point_0,
+                    _scale(free_vector_0, new_end_point_0_param))
+                new_end_point_1 = _add(
+                    initial_point_0,
+                    _scale(free_vector_0, new_end_point_1_param))
+
+                if _isclose(
                         new_end_point_0_param,
                         0,
                         **config['numbers_close_kwargs']):
-                    if isclose(
+                    if _isclose(
                             params[0],
                             0,
                             **config['numbers_close_kwargs']):
@@ -184,11 +546,11 @@ def _get_intersection_bound_vector_bound_vector(
                     new_end_point_0_included = (
                         bound_vector_1.terminal_point_included)
 
-                if isclose(
+                if _isclose(
                         new_end_point_1_param,
                         1,
                         **config['numbers_close_kwargs']):
-                    if isclose(
+                    if _isclose(
                             params[-1],
                             1,
                             **config['numbers_close_kwargs']):
@@ -203,14 +565,14 @@ def _get_intersection_bound_vector_bound_vector(
                         bound_vector_1.initial_point_included)
 
                 intersection = LineSegment(
-                    end_point_0=new_end_point_0,
-                    end_point_1=new_end_point_1,
+                    end_point_0=array(new_end_point_0),
+                    end_point_1=array(new_end_point_1),
                     end_point_0_included=new_end_point_0_included,
                     end_point_1_included=new_end_point_1_included)
         else:
             new_initial_point_param = params[1]
             new_terminal_point_param = params[-2]
-            if isclose(
+            if _isclose(
                     new_initial_point_param,
                     1,
                     **config['numbers_close_kwargs']):
@@ -222,7 +584,7 @@ def _get_intersection_bound_vector_bound_vector(
                     intersection = bound_vector_0.terminal_point
                 else:
                     intersection = None
-            elif isclose(
+            elif _isclose(
                     new_terminal_point_param,
                     0,
                     **config['numbers_close_kwargs']):
@@ -236,18 +598,19 @@ def _get_intersection_bound_vector_bound_vector(
                     intersection = None
             else:
                 # If we are here it means that there is an overlap
-                new_initial_point = (
-                    bound_vector_0.initial_point +
-                    new_initial_point_param*bound_vector_0.free_vector)
-                new_terminal_point = (
-                    bound_vector_0.initial_point +
-                    new_terminal_point_param*bound_vector_0.free_vector)
-
-                if isclose(
+                new_initial_point = _add(
+                    initial_point_0,
+                    _scale(free_vector_0, new_initial_point_param))
+                new_terminal_point = _add(
+                    initial_point_0,
+                    _scale(free_vector_0, new_terminal_point_param))
+
+                if _isclose(
                         new_initial_point_param,
                         0,
                         **config['numbers_close_kwargs']):
-                    if isclose(params[0], 0, **config['numbers_close_kwargs']):
+                    if _isclose(
+                            params[0], 0, **config['numbers_close_kwargs']):
                         new_initial_point_included = (
                             bound_vector_0.initial_point_included and
                             bound_vector_1.initial_point_included)
@@ -258,11 +621,11 @@ def _get_intersection_bound_vector_bound_vector(
                     new_initial_point_included = (
                         bound_vector_1.initial_point_included)
 
-                if isclose(
+                if _isclose(
                         new_terminal_point_param,
                         1,
                         **config['numbers_close_kwargs']):
-                    if isclose(
+                    if _isclose(
                             params[-1],
                             1,
                             **config['numbers_close_kwargs']):
@@ -277,44 +640,32 @@ def _get_intersection_bound_vector_bound_vector(
                         bound_vector_1.terminal_point_included)
 
                 intersection = BoundVector(
-                    initial_point=new_initial_point,
-                    terminal_point=new_terminal_point,
+                    initial_point=array(new_initial_point),
+                    terminal_point=array(new_terminal_point),
                     initial_point_included=new_initial_point_included,
                     terminal_point_included=new_terminal_point_included)
     elif not vectors_are_parallel and vectors_in_plane:
-        denominator = norm(
-            cross(bound_vector_0.free_vector, bound_vector_1.free_vector))
-        param_0 = (
-            norm(
-                cross(
-                    bound_vector_1.free_vector,
-                    initial_point_vector.free_vector)) /
+        denominator = _norm(_cross(free_vector_0, free_vector_1))
+        # The denominator vanishes for bound vectors of zero length
+        param_0 = _quotient(
+            _norm(_cross(free_vector_1, initial_point_vector)),
             denominator)
-        param_1 = (
-            norm(
-                cross(
-                    bound_vector_0.free_vector,
-                    initial_point_vector.free_vector)) /
+        param_1 = _quotient(
+            _norm(_cross(free_vector_0, initial_point_vector)),
             denominator)
 
-        if are_antiparallel(
-                cross(
-                    bound_vector_1.free_vector,
-                    bound_vector_1.initial_point -
-                    bound_vector_0.initial_point),
-                cross(
-                    bound_vector_1.free_vector,
-                    bound_vector_0.free_vector)):
+        if _are_antiparallel(
+                _cross(
+                    free_vector_1,
+                    _subtract(initial_point_1, initial_point_0)),
+                _cross(free_vector_1, free_vector_0)):
             param_0 *= -1
 
-        if are_antiparallel(
-                cross(
-                    bound_vector_0.free_vector,
-                    bound_vector_0.initial_point -
-                    bound_vector_1.initial_point),
-                cross(
-                    bound_vector_0.free_vector,
-                    bound_vector_1.free_vector)):
+        if _are_antiparallel(
+                _cross(
+                    free_vector_0,
+                    _subtract(initial_point_0, initial_point_1)),
+                _cross(free_vector_0, free_vector_1)):
             param_1 *= -1
 
         if bound_vector_0.initial_point_included:
@@ -350,21 +701,21 @@ def _get_intersection_bound_vector_bound_vector(
                 intersection_behind_of_bound_vector_0_terminal_point and
                 intersection_ahead_of_bound_vector_1_initial_point and
                 intersection_behind_of_bound_vector_1_terminal_point):
-            bound_vector_0_intersection = (
-                bound_vector_0.initial_point +
-                param_0 * bound_vector_0.free_vector)
-            bound_vector_1_intersection = (
-                bound_vector_1.initial_point +
-                param_1 * bound_vector_1.free_vector)
+            bound_vector_0_intersection = _add(
+                initial_point_0,
+                _scale(free_vector_0, param_0))
+            bound_vector_1_intersection = _add(
+                initial_point_1,
+                _scale(free_vector_1, param_1))
 
             # Just to be on the safe side, make sure they are actually the
             # same
-            assert allclose(
+            assert _allclose(
                 bound_vector_0_intersection,
                 bound_vector_1_intersection,
                 **config['numbers_close_kwargs'])
 
-            intersection = bound_vector_0_intersection
+            intersection = array(bound_vector_0_intersection)
         else:
             intersection = None
     else:
@@ -372,36 +723,83 @@ def _get_intersection_bound_vector_bound_vector(
     return intersection
 
 
+@register_intersection(BoundVector, Plane)
 def _get_intersection_bound_vector_plane(bound_vector, plane):
-    distance_to_plane = dot(
-        plane.point_in_plane - bound_vector.initial_point,
-        plane.normal_vector)
-    projected_vector_length = dot(
-        bound_vector.free_vector,
-        plane.normal_vector)
-
-    distance_to_plane_close_to_zero = isclose(
-        distance_to_plane,
-        0,
-        **config['numbers_close_kwargs'])
-    projected_vector_length_close_to_zero = isclose(
-        projected_vector_length,
-        0,
-        **config['numbers_close_kwargs'])
-    if (
-            distance_to_plane_close_to_zero and
-            projected_vector_length_close_to_zero):
+    initial_point = bound_vector.initial_point.tolist()
+    terminal_point = bound_vector.terminal_point.tolist()
+    normal_vector = plane.normal_vector.tolist()
+    free_vector = _subtract(terminal_point, initial_point)
+    point_in_plane = plane.point_in_plane.tolist()
+    initial_distance = _dot(
+        _subtract(initial_point, point_in_plane), normal_vector)
+    terminal_distance = _dot(
+        _subtract(terminal_point, point_in_plane), normal_vector)
+
+    # Each end point is decided by its own distance to the plane, as in
+    # get_intersections_segments_planes
+    at_initial_point = _isclose(
+        initial_distance, 0, **config['numbers_close_kwargs'])
+    at_terminal_point = _isclose(
+        terminal_distance, 0, **config['numbers_close_kwargs'])
+    if at_initial_point and at_terminal_point:
         return bound_vector
 
-    with errstate(divide='ignore'):
-        param = nan_to_num(distance_to_plane / projected_vector_length)
-
-    # TODO: add distinction for included and excluded initial and terminal
-    # points
-    if 0 <= param <= 1:
-        intersection = (
-            bound_vector.initial_point +
-            param*(bound_vector.terminal_point - bound_vector.initial_point))
+    if at_initial_point:
+        param = 0. if bound_vector.initial_point_included else None
+    elif at_terminal_point:
+        param = 1. if bound_vector.terminal_point_included else None
+    elif initial_distance*terminal_distance < 0:
+        param = initial_distance / (initial_distance - terminal_distance)
     else:
+        param = None
+
+    if param is None:
         intersection = None
+    else:
+        intersection = array(
+            _add(initial_point, _scale(free_vector, param)))
+    return intersection
+
+
+def _as_bound_vector(line_segment):
+    return BoundVector(
+        initial_point=line_segment.end_point_0,
+        terminal_point=line_segment.end_point_1,
+        initial_point_included=line_segment.end_point_0_included,
+        terminal_point_included=line_segment.end_point_1_included)
+
+
+def _as_line_segment(intersection):
+    # Overlaps involving line segments have no direction
+    if isinstance(intersection, BoundVector):
+        return LineSegment(
+            end_point_0=intersection.initial_point,
+            end_point_1=intersection.terminal_point,
+            end_point_0_included=intersection.initial_point_included,
+            end_point_1_included=intersection.terminal_point_included)
+    return intersection
+
+
+@register_intersection(LineSegment, LineSegment)
+def _get_intersection_line_segment_line_segment(
+        line_segment_0, line_segment_1):
+    return _as_line_segment(_get_intersection_bound_vector_bound_vector(
+        bound_vector_0=_as_bound_vector(line_segment_0),
+        bound_vector_1=_as_bound_vector(line_segment_1)))
+
+
+@register_intersection(LineSegment, BoundVector)
+def _get_intersection_line_segment_bound_vector(line_segment, bound_vector):
+    return _as_line_segment(_get_intersection_bound_vector_bound_vector(
+        bound_vector_0=_as_bound_vector(line_segment),
+        bound_vector_1=bound_vector))
+
+
+@register_intersection(LineSegment, Plane)
+def _get_intersection_line_segment_plane(line_segment, plane):
+    intersection = _get_intersection_bound_vector_plane(
+        bound_vector=_as_bound_vector(line_segment),
+        plane=plane)
+    if isinstance(intersection, BoundVector):
+        return line_segment
     return intersection
@@ -1,5 +1,11 @@
 # -*- coding: utf-8 -*-
-from numpy import allclose, array_equal, asanyarray, cross, isclose
+from __future__ import division
+
+from math import copysign, isinf, isnan, sqrt
+
+from numpy import (
+    asanyarray, broadcast_arrays, concatenate, cross, errstate, isclose,
+    newaxis, zeros)
 from numpy.linalg import norm
 
 from .config import config
@@ -8,24 +14,169 @@ from .config import config
 def are_parallel(a, b):
     a_array = asanyarray(a)
     b_array = asanyarray(b)
-    if not array_equal(a_array == 0, b_array == 0):
-        return False
-    return isclose(
-        norm(cross(a_array, b_array)),
-        0,
-        **config['numbers_close_kwargs'])
+    if a_array.shape == b_array.shape == (3,):
+        return _are_parallel(a_array.tolist(), b_array.tolist())
+    return bool(are_parallel_mask(a_array, b_array).all())
 
 
 def are_antiparallel(a, b):
     a_array = asanyarray(a)
     b_array = asanyarray(b)
+    if a_array.shape == b_array.shape == (3,):
+        return _are_antiparallel(a_array.tolist(), b_array.tolist())
+    return bool(are_antiparallel_mask(a_array, b_array).all())
+
+
+def are_parallel_mask(a, b):
+    """Element-wise version of :func:`are_parallel`.
+
+    Parameters
+    ----------
+    a, b
+        (..., 3) or (..., 2) arrays of vectors, broadcast against each
+        other. Two-dimensional vectors lie in the xy-plane.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of the broadcast shape without the last axis.
+
+    """
+    a, b = broadcast_arrays(_as_3d_vectors(a), _as_3d_vectors(b))
+    return (
+        ((a == 0) == (b == 0)).all(axis=-1) &
+        isclose(
+            norm(cross(a, b), axis=-1),
+            0,
+            **config['numbers_close_kwargs']))
+
+
+def are_antiparallel_mask(a, b):
+    """Element-wise version of :func:`are_antiparallel`.
+
+    Parameters
+    ----------
+    a, b
+        (..., 3) or (..., 2) arrays of vectors, broadcast against each
+        other. Two-dimensional vectors lie in the xy-plane.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of the broadcast shape without the last axis.
+
+    """
+    a, b = broadcast_arrays(_as_3d_vectors(a), _as_3d_vectors(b))
+    a_norm = norm(a, axis=-1)[..., newaxis]
+    b_norm = norm(b, axis=-1)[..., newaxis]
+    with errstate(divide='ignore', invalid='ignore'):
+        return (
+            ~isclose(a, 0, **config['numbers_close_kwargs']).all(axis=-1) &
+            ~isclose(b, 0, **config['numbers_close_kwargs']).all(axis=-1) &
+            isclose(
+                a/a_norm,
+                -b/b_norm,
+                **config['numbers_close_kwargs']).all(axis=-1))
+
+
+def _as_3d_vectors(vectors):
+    vectors = asanyarray(vectors, dtype=float)
+    if vectors.ndim == 0 or vectors.shape[-1] not in (2, 3):
+        raise ValueError('Vectors have to have 2 or 3 components.')
+    if vectors.shape[-1] == 2:
+        vectors = concatenate(
+            [vectors, zeros(vectors.shape[:-1] + (1,))], axis=-1)
+    return vectors
+
+
+# The following functions work on single 3-vectors given as sequences of
+# floats. For those, plain Python arithmetic is a lot faster than calling into
+# NumPy.
+
+def _add(a, b):
+    return [a[0] + b[0], a[1] + b[1], a[2] + b[2]]
+
+
+def _subtract(a, b):
+    return [a[0] - b[0], a[1] - b[1], a[2] - b[2]]
+
+
+def _scale(a, factor):
+    return [a[0]*factor, a[1]*factor, a[2]*factor]
+
+
+def _quotient(a, b):
+    # Division with NumPy's results for division by zero
+    if b != 0:
+        return a / b
+    if a == 0 or isnan(a):
+        return float('nan')
+    return copysign(float('inf'), a)*copysign(1, b)
+
+
+def _divide(a, b):
+    return [_quotient(a_i, b_i) for a_i, b_i in zip(a, b)]
+
+
+def _nanmean(values):
+    values = [value for value in values if not isnan(value)]
+    if not values:
+        return float('nan')
+    return sum(values) / len(values)
+
+
+def _dot(a, b):
+    return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]
+
+
+def _cross(a, b):
+    return [
+        a[1]*b[2] - a[2]*b[1],
+        a[2]*b[0] - a[0]*b[2],
+        a[0]*b[1] - a[1]*b[0]]
+
+
+def _norm(a):
+    return sqrt(a[0]*a[0] + a[1]*a[1] + a[2]*a[2])
+
+
+def _det(a, b, c):
+    # Determinant of the 3x3 matrix with rows (or columns) a, b and c
+    return _dot(a, _cross(b, c))
+
+
+def _isclose(a, b, rtol=1e-05, atol=1e-08, equal_nan=False):
+    if isnan(a) or isnan(b):
+        return equal_nan and isnan(a) and isnan(b)
+    if isinf(a) or isinf(b):
+        return a == b
+    return abs(a - b) <= atol + rtol*abs(b)
+
+
+def _allclose(a, b, rtol=1e-05, atol=1e-08, equal_nan=False):
+    return (
+        _isclose(a[0], b[0], rtol, atol, equal_nan) and
+        _isclose(a[1], b[1], rtol, atol, equal_nan) and
+        _isclose(a[2], b[2], rtol, atol, equal_nan))
+
+
+def _are_parallel(a, b):
+    if [a_i == 0 for a_i in a] != [b_i == 0 for b_i in b]:
+        return False
+    return _isclose(
+        _norm(_cross(a, b)),
+        0,
+        **config['numbers_close_kwargs'])
+
+
+def _are_antiparallel(a, b):
     if (
-            allclose(a_array, 0, **config['numbers_close_kwargs']) or
-            allclose(b_array, 0, **config['numbers_close_kwargs'])):
+            _allclose(a, [0, 0, 0], **config['numbers_close_kwargs']) or
+            _allclose(b, [0, 0, 0], **config['numbers_close_kwargs'])):
         return False
-    if allclose(
-            a_array/norm(a_array),
-            -b_array/norm(b_array),
-            **config['numbers_close_kwargs']):
-        return True
-    return False
+    a_norm = _norm(a)
+    b_norm = _norm(b)
+    return _allclose(
+        [a_i / a_norm for a_i in a],
+        [-b_i / b_norm for b_i in b],
+        **config['numbers_close_kwargs'])
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import pytest
+from numpy import argwhere, array, maximum, minimum
+from numpy.random import RandomState
+from numpy.testing import assert_allclose, assert_array_equal
+
+from python_geometry.bound_vector import BoundVector
+from python_geometry.bounding_volume_hierarchy import BoundingVolumeHierarchy
+from python_geometry.line_segment import LineSegment
+from python_geometry.plane import Plane
+from python_geometry.simple_polygon import SimplePolygon
+from python_geometry.utilities import get_intersection
+
+
+def _random_bound_vectors(random_state, number):
+    initial_points = random_state.rand(number, 3) * 10
+    terminal_points = initial_points + random_state.rand(number, 3) - 0.5
+    initial_points[:, 2] = 0
+    terminal_points[:, 2] = 0
+    return [
+        BoundVector(initial_point, terminal_point)
+        for initial_point, terminal_point in zip(
+            initial_points, terminal_points)]
+
+
+class TestQueryOverlaps(object):
+
+    def test_RandomBoundVectors_ReturnSameAsBruteForce(self):
+        random_state = RandomState(0)
+        bound_vectors = _random_bound_vectors(random_state, 200)
+        queries = _random_bound_vectors(random_state, 100)
+        hierarchy = BoundingVolumeHierarchy(bound_vectors)
+
+        def bounds(bound_vectors):
+            initial_points = array([b.initial_point for b in bound_vectors])
+            terminal_points = array([b.terminal_point for b in bound_vectors])
+            return (
+                minimum(initial_points, terminal_points),
+                maximum(initial_points, terminal_points))
+
+        lower, upper = bounds(bound_vectors)
+        query_lower, query_upper = bounds(queries)
+        expected = argwhere(
+            (lower[:, None] <= query_upper[None]).all(axis=2) &
+            (upper[:, None] >= query_lower[None]).all(axis=2))
+        assert_array_equal(hierarchy.query_overlaps(queries), expected)
+        assert_array_equal(
+            hierarchy.query_overlaps(BoundingVolumeHierarchy(queries)),
+            expected)
+
+    def test_Polygons_ReturnOverlappingPairs(self):
+        polygons = [
+            SimplePolygon([(0, 0, 0), (1, 0, 0), (1, 1, 0)]),
+            SimplePolygon([(2, 0, 0), (3, 0, 0), (3, 1, 0)]),
+            SimplePolygon([(0, 0, 1), (1, 0, 1), (1, 1, 1)])
+        ]
+        queries = [
+            LineSegment((0.5, 0.5, -1), (0.5, 0.5, 2)),
+            LineSegment((5, 5, 5), (6, 6, 6))
+        ]
+        hierarchy = BoundingVolumeHierarchy(polygons, leaf_size=1)
+        assert_array_equal(hierarchy.query_overlaps(queries), [(0, 0), (2, 0)])
+
+    def test_EmptyHierarchy_ReturnNoPairs(self):
+        hierarchy = BoundingVolumeHierarchy([])
+        queries = [BoundVector((0, 0, 0), (1, 0, 0))]
+        assert hierarchy.query_overlaps(queries).shape == (0, 2)
+
+    def test_UnsupportedObject_RaiseNotImplementedError(self):
+        with pytest.raises(NotImplementedError):
+            BoundingVolumeHierarchy([Plane((0, 0, 0), (0, 0, 1))])
+
+
+class TestQueryIntersections(object):
+
+    def test_RandomBoundVectors_ReturnSameAsBruteForce(self):
+        random_state = RandomState(1)
+        bound_vectors = _random_bound_vectors(random_state, 60)
+        queries = _random_bound_vectors(random_state, 30)
+        hierarchy = BoundingVolumeHierarchy(bound_vectors)
+        pairs, intersections = hierarchy.query_intersections(queries)
+        expected_pairs = []
+        expected_intersections = []
+        for i, bound_vector in enumerate(bound_vectors):
+            for j, query in enumerate(queries):
+                intersection = get_intersection(bound_vector, query)
+                if intersection is not None:
+                    expected_pairs.append((i, j))
+                    expected_intersections.append(intersection)
+        assert [tuple(pair) for pair in pairs.tolist()] == expected_pairs
+        for actual, expected in zip(intersections, expected_intersections):
+            assert_allclose(actual, expected)
+
+    def test_RepeatedQueries_ReturnSameResults(self):
+        random_state = RandomState(2)
+        hierarchy = BoundingVolumeHierarchy(
+            _random_bound_vectors(random_state, 100))
+        queries = BoundingVolumeHierarchy(
+            _random_bound_vectors(random_state, 100))
+        pairs_0, _ = hierarchy.query_intersections(queries)
+        pairs_1, _ = hierarchy.query_intersections(queries)
+        assert_array_equal(pairs_0, pairs_1)
+
+    def test_TouchingAndOverlappingBoundVectors_ReturnIntersections(self):
+        bound_vectors = [
+            BoundVector((0, 0, 0), (2, 0, 0)),
+            BoundVector((0, 1, 0), (2, 1, 0))
+        ]
+        queries = [
+            BoundVector((1, -1, 0), (1, 0.5, 0)),
+            BoundVector((1, 0, 0), (3, 0, 0))
+        ]
+        pairs, intersections = BoundingVolumeHierarchy(
+            bound_vectors).query_intersections(queries)
+        assert_array_equal(pairs, [(0, 0), (0, 1)])
+        assert_allclose(intersections[0], (1, 0, 0))
+        assert intersections[1] == BoundVector((1, 0, 0), (2, 0, 0))
+
+    def test_OverlappingPolygons_ReturnCandidatesWithoutIntersections(self):
+        polygons = [
+            SimplePolygon([(0, 0, 0), (1, 0, 0), (1, 1, 0)]),
+            SimplePolygon([(2, 0, 0), (3, 0, 0), (3, 1, 0)])
+        ]
+        queries = [
+            SimplePolygon([(0.5, 0, 0), (1.5, 0, 0), (1.5, 1, 0)]),
+            BoundVector((2.5, -1, 0), (2.5, 2, 0))
+        ]
+        pairs, intersections = BoundingVolumeHierarchy(
+            polygons).query_intersections(queries)
+        assert_array_equal(pairs, [(0, 0), (1, 1)])
+        assert intersections == [None, None]
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from numpy import array
+from numpy.testing import assert_array_equal
+
+from python_geometry.config import config
+from python_geometry.parallel import get_chunk_bounds, parallel_map
+
+
+class TestParallelMap(object):
+
+    def test_Workers_ReturnResultsInOrder(self):
+        actual = parallel_map(pow, [(i, 2) for i in range(10)], workers=3)
+        assert actual == [i**2 for i in range(10)]
+
+    def test_NoWorkers_ReturnResultsInOrder(self):
+        actual = parallel_map(pow, [(i, 2) for i in range(10)])
+        assert actual == [i**2 for i in range(10)]
+
+    def test_NoArguments_ReturnEmptyList(self):
+        assert parallel_map(pow, [], workers=2) == []
+
+
+class TestGetChunkBounds(object):
+
+    def test_EqualSizes_ReturnChunkPerWorker(self):
+        actual = get_chunk_bounds(array([3]*10), workers=3)
+        assert_array_equal(actual, [0, 4, 7, 10])
+
+    def test_UnequalSizes_ReturnChunksOfSimilarSize(self):
+        actual = get_chunk_bounds(array([10, 1, 1, 1, 1, 1, 1, 10]), 2)
+        assert_array_equal(actual, [0, 4, 8])
+
+    def test_MoreWorkersThanItems_ReturnChunkPerItem(self):
+        actual = get_chunk_bounds(array([3, 3]), workers=4)
+        assert_array_equal(actual, [0, 1, 2])
+
+    def test_NoItems_ReturnOneEmptyChunk(self):
+        actual = get_chunk_bounds(array([], dtype=int), workers=4)
+        assert_array_equal(actual, [0, 0])
+
+    def test_LargeItems_ReturnChunksOfChunkSize(self, monkeypatch):
+        monkeypatch.setitem(config, 'chunk_size', 10)
+        actual = get_chunk_bounds(array([5]*6), workers=None)
+        assert_array_equal(actual, [0, 2, 4, 6])
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
+import pytest
+
 from numpy import array
 from numpy.testing import assert_allclose
 
+from python_geometry.config import config
 from python_geometry.simple_polygon import SimplePolygon
 
 
@@ -108,3 +111,107 @@ class TestNormalVector(object):
             ]))
         expected = array([0, 0, -1])
         assert_allclose(simple_polygon.normal_vector, expected)
+
+
+class TestCachedProperties(object):
+
+    def test_SimplePolygonProperties_ReturnProperties(self):
+        simple_polygon = SimplePolygon(
+            array([
+                (0, 0, 0),
+                (2, 0, 0),
+                (2, 1, 0),
+                (0, 1, 0)
+            ]))
+        assert_allclose(
+            simple_polygon.edge_vectors,
+            [(2, 0, 0), (0, 1, 0), (-2, 0, 0), (0, -1, 0)])
+        assert_allclose(simple_polygon.bounds, [(0, 0, 0), (2, 1, 0)])
+        assert_allclose(simple_polygon.area, 2)
+
+    def test_SimplePolygonEdges_ReturnEndPointsOfBoundVectors(self):
+        simple_polygon = SimplePolygon(
+            array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (1, 1, 0)
+            ]))
+        assert simple_polygon.edges.shape == (3, 2, 3)
+        for edge, bound_vector in zip(
+                simple_polygon.edges, simple_polygon.bound_vectors):
+            assert_allclose(edge[0], bound_vector.initial_point)
+            assert_allclose(edge[1], bound_vector.terminal_point)
+
+    def test_RepeatedAccess_ReturnCachedNormalVector(self):
+        simple_polygon = SimplePolygon(
+            array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (1, 1, 0),
+                (0, 1, 0)
+            ]))
+        assert simple_polygon.normal_vector is simple_polygon.normal_vector
+
+    @pytest.mark.parametrize(
+        'name', ['normal_vector', 'edge_vectors', 'edges', 'bounds',
+                 'vector_area'])
+    def test_CachedArray_RaiseOnInPlaceModification(self, name):
+        simple_polygon = SimplePolygon(
+            array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (1, 1, 0),
+                (0, 1, 0)
+            ]))
+        value = getattr(simple_polygon, name)
+        with pytest.raises(ValueError):
+            value *= 2
+        copied_value = value.copy()
+        copied_value *= 2
+        assert_allclose(copied_value, 2*getattr(simple_polygon, name))
+
+    @pytest.mark.parametrize(
+        'name', ['normal_vector', 'edge_vectors', 'edges', 'bounds',
+                 'vector_area'])
+    def test_CachingDisabled_ReturnWritableArray(self, monkeypatch, name):
+        monkeypatch.setitem(config, 'cache_polygon_properties', False)
+        simple_polygon = SimplePolygon(
+            array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (1, 1, 0),
+                (0, 1, 0)
+            ]))
+        assert getattr(simple_polygon, name).flags.writeable
+
+    def test_SetVertices_InvalidateCache(self):
+        simple_polygon = SimplePolygon(
+            array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (1, 1, 0),
+                (0, 1, 0)
+            ]))
+        assert_allclose(simple_polygon.normal_vector, [0, 0, 1])
+        assert_allclose(simple_polygon.area, 1)
+        simple_polygon.vertices = array([
+            (0, 0, 0),
+            (0, 2, 0),
+            (2, 2, 0),
+            (2, 0, 0)
+        ])
+        assert_allclose(simple_polygon.normal_vector, [0, 0, -1])
+        assert_allclose(simple_polygon.area, 4)
+
+    def test_CachingDisabled_ReturnNewNormalVector(self, monkeypatch):
+        monkeypatch.setitem(config, 'cache_polygon_properties', False)
+        simple_polygon = SimplePolygon(
+            array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (1, 1, 0),
+                (0, 1, 0)
+            ]))
+        assert (
+            simple_polygon.normal_vector is not simple_polygon.normal_vector)
+        assert simple_polygon._cache == {}
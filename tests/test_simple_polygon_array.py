@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from numpy import array, cos, pi, shares_memory, sin, stack, zeros
+from numpy.random import RandomState
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from python_geometry.simple_polygon import SimplePolygon
+from python_geometry.simple_polygon_array import SimplePolygonArray
+
+
+def _get_random_polygons(number, random_state):
+    polygons = []
+    for _ in range(number):
+        count = random_state.randint(1, 9)
+        angles = 2*pi*random_state.uniform(0, 1, count)
+        angles.sort()
+        radii = random_state.uniform(0.5, 2, count)
+        vertices = stack(
+            [radii*cos(angles), radii*sin(angles), zeros(count)], axis=1)
+        rotation = random_state.normal(size=(3, 3))
+        polygons.append(SimplePolygon(
+            vertices.dot(rotation) + random_state.normal(size=3)))
+    return polygons
+
+
+@pytest.fixture
+def polygons():
+    return _get_random_polygons(200, RandomState(0))
+
+
+class TestSimplePolygonArray(object):
+
+    def test_FromPolygons_ReturnEqualPolygons(self, polygons):
+        polygon_array = SimplePolygonArray.from_polygons(polygons)
+        assert len(polygon_array) == len(polygons)
+        assert polygon_array.to_polygons() == polygons
+        assert polygon_array[-1] == polygons[-1]
+
+    def test_GetPolygon_ReturnView(self, polygons):
+        polygon_array = SimplePolygonArray.from_polygons(polygons)
+        assert shares_memory(polygon_array[3].vertices, polygon_array.vertices)
+
+    def test_NormalVectors_ReturnSameAsPolygons(self, polygons):
+        polygon_array = SimplePolygonArray.from_polygons(polygons)
+        assert_allclose(
+            polygon_array.normal_vectors,
+            [polygon.normal_vector for polygon in polygons],
+            atol=1e-12)
+
+    def test_Areas_ReturnAreasOfPolygons(self):
+        polygon_array = SimplePolygonArray.from_polygons([
+            SimplePolygon([(0, 0, 0), (2, 0, 0), (2, 1, 0), (0, 1, 0)]),
+            SimplePolygon([(0, 0, 1), (0, 0, 0), (0, 3, 0)]),
+            SimplePolygon([(0, 0, 0), (1, 1, 1)])])
+        assert_allclose(polygon_array.areas, [2, 1.5, 0])
+
+    def test_Bounds_ReturnBoundingBoxes(self, polygons):
+        polygon_array = SimplePolygonArray.from_polygons(polygons)
+        assert_array_equal(
+            polygon_array.bounds,
+            [
+                [polygon.vertices.min(axis=0), polygon.vertices.max(axis=0)]
+                for polygon in polygons])
+
+    def test_EmptyPolygons_ReturnEmptyProperties(self):
+        polygon_array = SimplePolygonArray(array([[1, 2, 3]]), [0, 0, 1, 1])
+        assert_array_equal(polygon_array.counts, [0, 1, 0])
+        assert_array_equal(polygon_array.normal_vectors, zeros((3, 3)))
+        assert_array_equal(polygon_array.areas, zeros(3))
+        assert_array_equal(polygon_array.bounds[1], [[1, 2, 3], [1, 2, 3]])
+
+    def test_NoPolygons_ReturnEmptyArrays(self):
+        polygon_array = SimplePolygonArray.from_polygons([])
+        assert len(polygon_array) == 0
+        assert polygon_array.normal_vectors.shape == (0, 3)
+        assert polygon_array.bounds.shape == (0, 2, 3)
+
+    @pytest.mark.parametrize('offsets', [[1, 2], [0, 2, 1], [0, 1]])
+    def test_InvalidOffsets_RaiseValueError(self, offsets):
+        with pytest.raises(ValueError):
+            SimplePolygonArray(zeros((2, 3)), offsets)
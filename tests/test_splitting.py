@@ -1,14 +1,60 @@
 # -*- coding: utf-8 -*-
+import warnings
+
 import pytest
-from numpy import array
+from numpy import (
+    arange, array, concatenate, cos, load, pi, save, sin, stack, zeros)
+from numpy.testing import assert_array_equal
 
+from python_geometry.bound_vector import BoundVector
+from python_geometry.line_segment import LineSegment
 from python_geometry.plane import Plane
 from python_geometry.simple_polygon import SimplePolygon
-from python_geometry.splitting import split_by_plane
+from python_geometry.simple_polygon_array import SimplePolygonArray
+from python_geometry.splitting import (
+    SIDE_BOTH, SIDE_IN_PLANE, SIDE_NEGATIVE, SIDE_POSITIVE,
+    BinarySpacePartitioningTree, area_split_by_plane, classify_by_plane,
+    iter_split_by_plane, split_by_grid, split_by_parallel_planes,
+    split_by_plane, split_segments_by_plane)
+from python_geometry.utilities import get_intersection
 
 
 class TestSplitByPlane:
 
+    def test_PolygonWithManyVertices_ReturnCorrectPolygons(self):
+        angles = 2*pi*(arange(200) + 0.5)/200
+        polygon = SimplePolygon(
+            vertices=stack([cos(angles), sin(angles), zeros(200)], axis=1))
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        actual = split_by_plane(
+            object_to_split=polygon,
+            plane=plane)
+        assert len(actual) == 2
+        for split_polygon in actual:
+            assert len(split_polygon.vertices) == 102
+        assert (plane.distance(actual[0].vertices) > -1e-12).all()
+        assert (plane.distance(actual[1].vertices) < 1e-12).all()
+        assert actual[0].area + actual[1].area == pytest.approx(
+            polygon.area)
+
+    def test_PolygonInPlane_ReturnPolygon(self):
+        polygon = SimplePolygon(
+            vertices=array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (1, 1, 0),
+                (0, 1, 0)
+            ]))
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([0, 0, 1]))
+        actual = split_by_plane(
+            object_to_split=polygon,
+            plane=plane)
+        assert actual == [polygon]
+
     def test_ConcavePolygonThatIsNotSplit_ReturnCorrectPolygons(self):
         polygon = SimplePolygon(
             vertices=array([
@@ -179,6 +225,122 @@ class TestSplitByPlane:
         ]
         assert actual == expected
 
+    def test_PlaneThroughRoundedVertices_ReturnTwoPolygons(self):
+        angles = 2*pi*arange(20)/20
+        polygon = SimplePolygon(
+            vertices=stack([cos(angles), sin(angles), zeros(20)], axis=1))
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([0, 1, 0]))
+        actual = split_by_plane(
+            object_to_split=polygon,
+            plane=plane)
+        assert len(actual) == 2
+        for split_polygon in actual:
+            assert len(split_polygon.vertices) == 11
+        assert actual[0].area + actual[1].area == pytest.approx(
+            polygon.area)
+
+    def test_VertexCloseToPlane_ReturnPolygonsOnEitherSide(self):
+        polygon = SimplePolygon(
+            vertices=array([
+                (-1.079706617840313, -0.8115355312192176, 1.808048850965756),
+                (-1.0523669841452234, -0.8933195379839495, 1.794754359101301),
+                (-1.3754641761738926, -1.170546974634689, 1.539500511890273),
+                (-1.4232183199373467, -1.1457284358814017, 1.523587594515536),
+                (-1.5913737555233884, -0.559991286521574, 1.632781445071906)
+            ]))
+        plane = Plane(
+            point_in_plane=array(
+                [-2.6150154802936365, 0.5915413090598527, -2.254180064128843]),
+            normal_vector=array(
+                [-0.886391639662404, -1.0514267804095447, -0.0434957005967774]))
+        actual = split_by_plane(
+            object_to_split=polygon,
+            plane=plane)
+        assert len(actual) == 2
+        assert (plane.distance(actual[0].vertices) < 1e-12).all()
+        assert (plane.distance(actual[1].vertices) > -1e-12).all()
+        assert actual[0].area + actual[1].area == pytest.approx(
+            polygon.area)
+
+    def test_PolygonWithTwoMergeGroups_ReturnCorrectPolygons(self):
+        polygon = SimplePolygon(
+            vertices=array([
+                (2, -2, 0),
+                (7, -2, 0),
+                (7, 1, 0),
+                (8, 1, 0),
+                (8, -1, 0),
+                (9, -1, 0),
+                (9, 2, 0),
+                (6, 2, 0),
+                (6, -1, 0),
+                (3, -1, 0),
+                (3, 2, 0),
+                (0, 2, 0),
+                (0, -1, 0),
+                (1, -1, 0),
+                (1, 1, 0),
+                (2, 1, 0)
+            ]))
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([0, 1, 0]))
+        actual = split_by_plane(
+            object_to_split=polygon,
+            plane=plane)
+        expected = [
+            SimplePolygon(
+                vertices=array([
+                    (2, 0, 0),
+                    (2, -2, 0),
+                    (7, -2, 0),
+                    (7, 0, 0),
+                    (6, 0, 0),
+                    (6, -1, 0),
+                    (3, -1, 0),
+                    (3, 0, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (7, 0, 0),
+                    (7, 1, 0),
+                    (8, 1, 0),
+                    (8, 0, 0),
+                    (9, 0, 0),
+                    (9, 2, 0),
+                    (6, 2, 0),
+                    (6, 0, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (8, 0, 0),
+                    (8, -1, 0),
+                    (9, -1, 0),
+                    (9, 0, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (3, 0, 0),
+                    (3, 2, 0),
+                    (0, 2, 0),
+                    (0, 0, 0),
+                    (1, 0, 0),
+                    (1, 1, 0),
+                    (2, 1, 0),
+                    (2, 0, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (0, 0, 0),
+                    (0, -1, 0),
+                    (1, -1, 0),
+                    (1, 0, 0)
+                ]))
+        ]
+        assert actual == expected
+
     @pytest.mark.parametrize(
         ('point_in_plane', 'normal_vector'),
         [
@@ -376,3 +538,774 @@ class TestSplitByPlane:
                 ]))
         ]
         assert actual == expected
+
+
+class TestSplitPolygonsByPlane:
+
+    @pytest.fixture
+    def polygons(self):
+        return [
+            SimplePolygon(
+                vertices=array([
+                    (0, 0, 0),
+                    (1, 0, 0),
+                    (1, 1, 0),
+                    (0, 1, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (0, 0, 0),
+                    (2, 0, 0),
+                    (2, 2, 0),
+                    (0, 2, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (1, 0, 0),
+                    (2, 0, 0),
+                    (2, 1, 0)
+                ]))
+        ]
+
+    @pytest.fixture
+    def plane(self):
+        return Plane(
+            point_in_plane=array([1, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+
+    def test_PolygonList_ReturnFragmentsAndSourceIndices(
+            self, polygons, plane):
+        actual, source_indices = split_by_plane(
+            object_to_split=polygons,
+            plane=plane)
+        expected = (
+            [polygons[0]] +
+            split_by_plane(object_to_split=polygons[1], plane=plane) +
+            [polygons[2]])
+        assert actual == expected
+        assert_array_equal(source_indices, [0, 1, 1, 2])
+
+    def test_PolygonList_ReturnPolygonsOnOneSideUnchanged(
+            self, polygons, plane):
+        actual, _ = split_by_plane(
+            object_to_split=polygons,
+            plane=plane)
+        assert actual[0] is polygons[0]
+        assert actual[-1] is polygons[-1]
+
+    def test_SimplePolygonArray_ReturnSameAsPolygonList(
+            self, polygons, plane):
+        actual, source_indices = split_by_plane(
+            object_to_split=SimplePolygonArray.from_polygons(polygons),
+            plane=plane)
+        expected, expected_source_indices = split_by_plane(
+            object_to_split=polygons,
+            plane=plane)
+        assert actual == expected
+        assert_array_equal(source_indices, expected_source_indices)
+
+    def test_Workers_ReturnSameAsSingleProcess(self, polygons, plane):
+        actual, source_indices = split_by_plane(
+            object_to_split=polygons*5,
+            plane=plane,
+            workers=2)
+        expected, expected_source_indices = split_by_plane(
+            object_to_split=polygons*5,
+            plane=plane)
+        assert actual == expected
+        assert actual[0] is polygons[0]
+        assert_array_equal(source_indices, expected_source_indices)
+
+    def test_NoPolygons_ReturnNoFragments(self, plane):
+        actual, source_indices = split_by_plane(
+            object_to_split=[],
+            plane=plane)
+        assert actual == []
+        assert len(source_indices) == 0
+
+
+class TestSplitSegmentsByPlane:
+
+    @pytest.fixture
+    def plane(self):
+        return Plane(
+            point_in_plane=array([1, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+
+    @pytest.fixture
+    def segments(self):
+        return array([
+            [(0, 0, 0), (2, 2, 0)],
+            [(0, 0, 0), (1, 1, 0)],
+            [(1, 0, 0), (1, 1, 0)],
+            [(3, 0, 0), (0, 1, 0)],
+            [(2, 0, 0), (3, 0, 0)]
+        ])
+
+    def test_Segments_ReturnPiecesInOrder(self, segments, plane):
+        actual = split_segments_by_plane(
+            segments=segments,
+            plane=plane,
+            initial_points_included=[True, True, True, False, True],
+            terminal_points_included=[True, True, True, True, False])
+        assert_array_equal(actual.source_indices, [0, 0, 1, 2, 3, 3, 4])
+        assert_array_equal(actual.sides, [-1, 1, -1, 0, 1, -1, 1])
+        assert_array_equal(actual.end_points_0, [
+            (0, 0, 0), (1, 1, 0), (0, 0, 0), (1, 0, 0), (3, 0, 0),
+            (1, 2./3, 0), (2, 0, 0)])
+        assert_array_equal(actual.end_points_1, [
+            (1, 1, 0), (2, 2, 0), (1, 1, 0), (1, 1, 0), (1, 2./3, 0),
+            (0, 1, 0), (3, 0, 0)])
+        assert_array_equal(
+            actual.end_points_0_included,
+            [True, True, True, True, False, True, True])
+        assert_array_equal(
+            actual.end_points_1_included,
+            [True, True, True, True, True, True, False])
+
+    def test_ExcludedEndPointOnPlane_ReturnSegmentUnchanged(self, plane):
+        actual = split_segments_by_plane(
+            segments=array([[(1, 0, 0), (2, 0, 0)]]),
+            plane=plane,
+            initial_points_included=False)
+        assert_array_equal(actual.source_indices, [0])
+        assert_array_equal(actual.end_points_0, [(1, 0, 0)])
+        assert_array_equal(actual.end_points_0_included, [False])
+
+    def test_ReversedSegmentNearPlane_ReturnReversedPieces(self):
+        plane = Plane(
+            point_in_plane=array([0.999995, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        actual = split_segments_by_plane(
+            segments=array([[(0, 0, 0), (1, 0, 0)]]),
+            plane=plane)
+        reversed_actual = split_segments_by_plane(
+            segments=array([[(1, 0, 0), (0, 0, 0)]]),
+            plane=plane)
+        assert_array_equal(actual.sides, [-1, 1])
+        assert_array_equal(reversed_actual.sides, [1, -1])
+
+    def test_RandomSegments_ReturnPiecesMeetingAtIntersection(self, plane):
+        segments = (
+            arange(60).reshape(10, 2, 3) % 7 -
+            array([3, 0, 0])) / 2.
+        actual = split_segments_by_plane(
+            segments=segments,
+            plane=plane)
+        for i, segment in enumerate(segments):
+            pieces = (actual.source_indices == i).nonzero()[0]
+            intersection = get_intersection(
+                BoundVector(segment[0], segment[1]), plane)
+            assert_array_equal(actual.end_points_0[pieces[0]], segment[0])
+            assert_array_equal(actual.end_points_1[pieces[-1]], segment[1])
+            if len(pieces) == 2:
+                assert_array_equal(
+                    actual.end_points_1[pieces[0]], intersection)
+                assert_array_equal(
+                    actual.end_points_0[pieces[1]], intersection)
+
+    def test_Workers_ReturnSameAsSingleProcess(self, segments, plane):
+        actual = split_segments_by_plane(
+            segments=concatenate([segments]*5),
+            plane=plane,
+            workers=2)
+        expected = split_segments_by_plane(
+            segments=concatenate([segments]*5),
+            plane=plane)
+        for actual_field, expected_field in zip(actual, expected):
+            assert_array_equal(actual_field, expected_field)
+
+    def test_NoSegments_ReturnNoPieces(self, plane):
+        actual = split_segments_by_plane(
+            segments=zeros((0, 2, 3)),
+            plane=plane)
+        assert actual.end_points_0.shape == (0, 3)
+        assert len(actual.source_indices) == 0
+
+    def test_BoundVector_ReturnBoundVectors(self, plane):
+        bound_vector = BoundVector(
+            initial_point=array([0, 0, 0]),
+            terminal_point=array([2, 2, 0]),
+            initial_point_included=False)
+        actual = split_by_plane(
+            object_to_split=bound_vector,
+            plane=plane)
+        assert actual == [
+            BoundVector(
+                initial_point=array([0, 0, 0]),
+                terminal_point=array([1, 1, 0]),
+                initial_point_included=False),
+            BoundVector(
+                initial_point=array([1, 1, 0]),
+                terminal_point=array([2, 2, 0]))]
+
+    def test_LineSegmentList_ReturnPiecesAndSourceIndices(
+            self, segments, plane):
+        line_segments = [
+            LineSegment(end_point_0=segment[0], end_point_1=segment[1])
+            for segment in segments]
+        actual, source_indices = split_by_plane(
+            object_to_split=line_segments,
+            plane=plane)
+        assert actual[2] is line_segments[1]
+        assert actual[1] == LineSegment(
+            end_point_0=array([1, 1, 0]),
+            end_point_1=array([2, 2, 0]))
+        assert_array_equal(source_indices, [0, 0, 1, 2, 3, 3, 4])
+
+    def test_SegmentsAndPolygons_RaiseNotImplementedError(
+            self, segments, plane):
+        objects = [
+            LineSegment(end_point_0=segments[0, 0], end_point_1=segments[0, 1]),
+            SimplePolygon(vertices=array([
+                (0, 0, 0),
+                (2, 0, 0),
+                (2, 2, 0)
+            ]))]
+        with pytest.raises(NotImplementedError, match='mix'):
+            split_by_plane(
+                object_to_split=objects,
+                plane=plane)
+
+    def test_UnsupportedObject_RaiseNotImplementedError(self, plane):
+        with pytest.raises(NotImplementedError, match='Plane'):
+            split_by_plane(
+                object_to_split=plane,
+                plane=plane)
+
+
+class TestClassifyByPlane:
+
+    @pytest.fixture
+    def polygons(self):
+        return [
+            SimplePolygon(
+                vertices=array([
+                    (0, 0, 0),
+                    (1, 0, 0),
+                    (1, 1, 0),
+                    (0, 1, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (0, 0, 0),
+                    (2, 0, 0),
+                    (2, 2, 0),
+                    (0, 2, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (1, 0, 0),
+                    (2, 0, 0),
+                    (2, 1, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (1, 0, 0),
+                    (1, 1, 0),
+                    (1, 1, 1)
+                ]))
+        ]
+
+    @pytest.fixture
+    def plane(self):
+        return Plane(
+            point_in_plane=array([1, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+
+    def test_PolygonList_ReturnSides(self, polygons, plane):
+        actual = classify_by_plane(polygons, plane)
+        assert_array_equal(
+            actual,
+            [SIDE_NEGATIVE, SIDE_BOTH, SIDE_POSITIVE, SIDE_IN_PLANE])
+
+    def test_Polygon_ReturnSide(self, polygons, plane):
+        assert classify_by_plane(polygons[1], plane) == SIDE_BOTH
+
+    def test_SimplePolygonArray_ReturnSameAsPolygonList(
+            self, polygons, plane):
+        actual = classify_by_plane(
+            SimplePolygonArray.from_polygons(polygons), plane)
+        assert_array_equal(actual, classify_by_plane(polygons, plane))
+
+    def test_PolygonList_ReturnAreasOnEitherSide(self, polygons, plane):
+        actual = area_split_by_plane(polygons, plane)
+        assert actual == pytest.approx(array([
+            (1, 0, 0),
+            (2, 0, 2),
+            (0, 0, 0.5),
+            (0, 0.5, 0)
+        ]))
+
+    def test_CirclesAtAngles_ReturnAreasOfSplitPolygons(self, plane):
+        angles = 2*pi*(arange(30) + 0.25)/30
+        polygons = [
+            SimplePolygon(
+                vertices=stack([
+                    0.7 + cos(angles),
+                    sin(angles),
+                    slope*cos(angles)], axis=1))
+            for slope in [-2, 0, 0.5]]
+        actual = area_split_by_plane(polygons, plane)
+        split_polygons, source_indices = split_by_plane(polygons, plane)
+        expected = zeros((3, 3))
+        for split_polygon, source_index in zip(
+                split_polygons, source_indices):
+            side = 0 if plane.distance(split_polygon.vertices).min() < (
+                -1e-12) else 2
+            expected[source_index, side] += split_polygon.area
+        assert actual == pytest.approx(expected)
+
+    def test_Polygon_ReturnAreas(self, polygons, plane):
+        actual = area_split_by_plane(polygons[1], plane)
+        assert actual == pytest.approx(array([2, 0, 2]))
+
+    def test_StraddlingSliver_ReturnZeroAreas(self, polygons, plane):
+        sliver = SimplePolygon(
+            vertices=array([
+                (0, 0, 0),
+                (1, 0, 0),
+                (2, 0, 0)
+            ]))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            actual = area_split_by_plane([sliver, polygons[1]], plane)
+        assert actual == pytest.approx(array([(0, 0, 0), (2, 0, 2)]))
+
+    def test_NoPolygons_ReturnNoAreas(self, plane):
+        assert area_split_by_plane([], plane).shape == (0, 3)
+        assert len(classify_by_plane([], plane)) == 0
+
+
+class TestIterSplitByPlane:
+
+    @pytest.fixture
+    def polygons(self):
+        angles = 2*pi*arange(5)/5
+        pentagon = stack([cos(angles), sin(angles), zeros(5)], axis=1)
+        return [
+            SimplePolygon(vertices=pentagon + (0.4*i, 0, 0))
+            for i in range(-4, 5)]
+
+    @pytest.fixture
+    def plane(self):
+        return Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([1, 0.2, 0]))
+
+    def _collect(self, batches):
+        fragments = []
+        source_indices = []
+        for batch, batch_source_indices in batches:
+            assert isinstance(batch, SimplePolygonArray)
+            fragments.extend(batch.to_polygons())
+            source_indices.append(batch_source_indices)
+        return fragments, concatenate(source_indices)
+
+    def test_PolygonIterable_ReturnSameAsSplitByPlane(
+            self, polygons, plane):
+        actual, source_indices = self._collect(iter_split_by_plane(
+            polygons=iter(polygons),
+            plane=plane,
+            chunk_size=12))
+        expected, expected_source_indices = split_by_plane(
+            object_to_split=polygons,
+            plane=plane)
+        assert actual == expected
+        assert_array_equal(source_indices, expected_source_indices)
+
+    def test_SmallChunks_YieldBatchPerChunk(self, polygons, plane):
+        batches = list(iter_split_by_plane(
+            polygons=SimplePolygonArray.from_polygons(polygons),
+            plane=plane,
+            chunk_size=10))
+        assert len(batches) == 5
+
+    def test_MemoryMappedVertices_ReturnSameAsSplitByPlane(
+            self, polygons, plane, tmpdir):
+        polygon_array = SimplePolygonArray.from_polygons(polygons)
+        path = str(tmpdir.join('vertices.npy'))
+        save(path, polygon_array.vertices)
+        actual, source_indices = self._collect(iter_split_by_plane(
+            polygons=SimplePolygonArray(
+                vertices=load(path, mmap_mode='r'),
+                offsets=polygon_array.offsets),
+            plane=plane,
+            chunk_size=12))
+        expected, expected_source_indices = split_by_plane(
+            object_to_split=polygons,
+            plane=plane)
+        assert actual == expected
+        assert_array_equal(source_indices, expected_source_indices)
+
+    def test_MixedIterable_ReturnSameAsSplitByPlane(self, polygons, plane):
+        actual, source_indices = self._collect(iter_split_by_plane(
+            polygons=(
+                [SimplePolygonArray.from_polygons(polygons[:4])] +
+                polygons[4:]),
+            plane=plane))
+        expected, expected_source_indices = split_by_plane(
+            object_to_split=polygons,
+            plane=plane)
+        assert actual == expected
+        assert_array_equal(source_indices, expected_source_indices)
+
+    def test_NoPolygons_YieldNothing(self, plane):
+        assert list(iter_split_by_plane(polygons=[], plane=plane)) == []
+
+
+class TestSplitByParallelPlanes:
+
+    @pytest.fixture
+    def polygon(self):
+        return SimplePolygon(
+            vertices=array([
+                (0, 0, 0),
+                (3, 0, 0),
+                (3, 1, 0),
+                (0, 1, 0)
+            ]))
+
+    def test_Rectangle_ReturnSlabsInOrder(self, polygon):
+        actual, slab_indices = split_by_parallel_planes(
+            object_to_split=polygon,
+            normal_vector=array([1, 0, 0]),
+            offsets=array([-1, 1, 2, 4]))
+        expected = [
+            SimplePolygon(
+                vertices=array([
+                    (1, 1, 0),
+                    (0, 1, 0),
+                    (0, 0, 0),
+                    (1, 0, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (1, 0, 0),
+                    (2, 0, 0),
+                    (2, 1, 0),
+                    (1, 1, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (2, 0, 0),
+                    (3, 0, 0),
+                    (3, 1, 0),
+                    (2, 1, 0)
+                ]))
+        ]
+        assert actual == expected
+        assert_array_equal(slab_indices, [1, 2, 3])
+
+    def test_PlanesThroughVertices_ReturnPolygonUnchanged(self, polygon):
+        actual, slab_indices = split_by_parallel_planes(
+            object_to_split=polygon,
+            normal_vector=array([1, 0, 0]),
+            offsets=array([0, 3]))
+        assert actual == [polygon]
+        assert_array_equal(slab_indices, [1])
+
+    def test_PolygonWithTwoMergeGroups_ReturnFragmentsBetweenPlanes(self):
+        polygon = SimplePolygon(
+            vertices=array([
+                (2, -2, 0),
+                (7, -2, 0),
+                (7, 1, 0),
+                (8, 1, 0),
+                (8, -1, 0),
+                (9, -1, 0),
+                (9, 2, 0),
+                (6, 2, 0),
+                (6, -1, 0),
+                (3, -1, 0),
+                (3, 2, 0),
+                (0, 2, 0),
+                (0, -1, 0),
+                (1, -1, 0),
+                (1, 1, 0),
+                (2, 1, 0)
+            ]))
+        actual, slab_indices = split_by_parallel_planes(
+            object_to_split=polygon,
+            normal_vector=array([0, 1, 0]),
+            offsets=array([-1.5, 0, 1.5]))
+        assert_array_equal(slab_indices, [0, 1, 1, 1, 2, 2, 3, 3])
+        assert sum(
+            split_polygon.area for split_polygon in actual
+        ) == pytest.approx(polygon.area)
+        for offset, slab_index in zip([-1.5, 0, 1.5], range(3)):
+            plane = Plane(
+                point_in_plane=array([0, offset, 0]),
+                normal_vector=array([0, 1, 0]))
+            for split_polygon, other_index in zip(actual, slab_indices):
+                distances = plane.distance(split_polygon.vertices)
+                if other_index <= slab_index:
+                    assert (distances < 1e-12).all()
+                else:
+                    assert (distances > -1e-12).all()
+
+    def test_PolygonList_ReturnSourceAndSlabIndices(self, polygon):
+        polygons = [
+            polygon,
+            SimplePolygon(
+                vertices=array([
+                    (5, 0, 0),
+                    (6, 0, 0),
+                    (6, 1, 0)
+                ]))
+        ]
+        actual, source_indices, slab_indices = split_by_parallel_planes(
+            object_to_split=polygons,
+            normal_vector=array([1, 0, 0]),
+            offsets=array([1, 2]))
+        assert len(actual) == 4
+        assert actual[-1] is polygons[-1]
+        assert_array_equal(source_indices, [0, 0, 0, 1])
+        assert_array_equal(slab_indices, [0, 1, 2, 2])
+
+    def test_SimplePolygonArray_ReturnSameAsPolygonList(self, polygon):
+        polygons = [polygon, polygon]
+        actual = split_by_parallel_planes(
+            object_to_split=SimplePolygonArray.from_polygons(polygons),
+            normal_vector=array([1, 1, 0]),
+            offsets=array([1, 2, 3]))
+        expected = split_by_parallel_planes(
+            object_to_split=polygons,
+            normal_vector=array([1, 1, 0]),
+            offsets=array([1, 2, 3]))
+        assert actual[0] == expected[0]
+        assert_array_equal(actual[1], expected[1])
+        assert_array_equal(actual[2], expected[2])
+
+    def test_Workers_ReturnSameAsSingleProcess(self, polygon):
+        polygons = SimplePolygonArray.from_polygons([polygon]*5)
+        actual = split_by_parallel_planes(
+            object_to_split=polygons,
+            normal_vector=array([1, 1, 0]),
+            offsets=array([1, 2, 3]),
+            workers=2)
+        expected = split_by_parallel_planes(
+            object_to_split=polygons,
+            normal_vector=array([1, 1, 0]),
+            offsets=array([1, 2, 3]))
+        assert actual[0] == expected[0]
+        assert_array_equal(actual[1], expected[1])
+        assert_array_equal(actual[2], expected[2])
+
+    def test_UnsortedOffsets_RaiseValueError(self, polygon):
+        with pytest.raises(ValueError):
+            split_by_parallel_planes(
+                object_to_split=polygon,
+                normal_vector=array([1, 0, 0]),
+                offsets=array([2, 1]))
+
+
+class TestSplitByGrid:
+
+    @pytest.fixture
+    def polygon(self):
+        return SimplePolygon(
+            vertices=array([
+                (0.5, 0.5, 0.5),
+                (1.5, 0.5, 0.5),
+                (1.5, 1.5, 0.5),
+                (0.5, 1.5, 0.5)
+            ]))
+
+    def test_Square_ReturnFragmentsInCells(self, polygon):
+        actual, cell_indices = split_by_grid(
+            object_to_split=polygon,
+            origin=array([0, 0, 0]),
+            spacing=1,
+            shape=(2, 2, 2))
+        assert_array_equal(
+            cell_indices, [(0, 0, 0), (0, 1, 0), (1, 0, 0), (1, 1, 0)])
+        for split_polygon, cell_index in zip(actual, cell_indices):
+            assert split_polygon.area == pytest.approx(0.25)
+            assert (split_polygon.vertices >= cell_index - 1e-12).all()
+            assert (split_polygon.vertices <= cell_index + 1 + 1e-12).all()
+
+    def test_PolygonInsideCell_ReturnPolygonUnchanged(self, polygon):
+        actual, cell_indices = split_by_grid(
+            object_to_split=polygon,
+            origin=array([0, 0, 0]),
+            spacing=array([2, 2, 1]),
+            shape=(3, 3, 3))
+        assert len(actual) == 1
+        assert actual[0] is polygon
+        assert_array_equal(cell_indices, [(0, 0, 0)])
+
+    def test_PolygonPartlyOutsideOfGrid_ReturnPartsInside(self, polygon):
+        actual, cell_indices = split_by_grid(
+            object_to_split=polygon,
+            origin=array([1, 0, 0]),
+            spacing=1,
+            shape=(2, 1, 1))
+        assert_array_equal(cell_indices, [(0, 0, 0)])
+        assert actual[0].area == pytest.approx(0.25)
+
+    def test_PolygonInGridPlane_ReturnCellAbove(self):
+        polygon = SimplePolygon(
+            vertices=array([
+                (0.5, 0.5, 1),
+                (0.8, 0.5, 1),
+                (0.8, 0.8, 1)
+            ]))
+        actual, cell_indices = split_by_grid(
+            object_to_split=polygon,
+            origin=array([0, 0, 0]),
+            spacing=1,
+            shape=(2, 2, 2))
+        assert actual == [polygon]
+        assert_array_equal(cell_indices, [(0, 0, 1)])
+
+    def test_TiltedPolygons_ReturnAreaOfPolygons(self):
+        angles = 2*pi*arange(12)/12
+        polygons = [
+            SimplePolygon(
+                vertices=stack([
+                    2.5 + 1.5*cos(angles),
+                    2.5 + 1.5*sin(angles),
+                    2.5 + shift + 0.5*cos(angles)], axis=1))
+            for shift in [-0.3, 0, 0.3]]
+        actual, source_indices, cell_indices = split_by_grid(
+            object_to_split=polygons,
+            origin=array([0, 0, 0]),
+            spacing=1,
+            shape=(5, 5, 5))
+        for i, polygon in enumerate(polygons):
+            assert sum(
+                split_polygon.area
+                for split_polygon, source_index in zip(actual, source_indices)
+                if source_index == i) == pytest.approx(polygon.area)
+        for split_polygon, cell_index in zip(actual, cell_indices):
+            assert (split_polygon.vertices >= cell_index - 1e-12).all()
+            assert (split_polygon.vertices <= cell_index + 1 + 1e-12).all()
+
+    def test_Workers_ReturnSameAsSingleProcess(self, polygon):
+        actual, source_indices, cell_indices = split_by_grid(
+            object_to_split=[polygon]*5,
+            origin=array([0, 0, 0]),
+            spacing=1,
+            shape=(2, 2, 2),
+            workers=2)
+        expected, expected_source_indices, expected_cell_indices = (
+            split_by_grid(
+                object_to_split=[polygon]*5,
+                origin=array([0, 0, 0]),
+                spacing=1,
+                shape=(2, 2, 2)))
+        assert actual == expected
+        assert_array_equal(source_indices, expected_source_indices)
+        assert_array_equal(cell_indices, expected_cell_indices)
+
+    def test_NonPositiveSpacing_RaiseValueError(self, polygon):
+        with pytest.raises(ValueError):
+            split_by_grid(
+                object_to_split=polygon,
+                origin=array([0, 0, 0]),
+                spacing=array([1, 0, 1]),
+                shape=(2, 2, 2))
+
+
+class TestBinarySpacePartitioningTree:
+
+    @pytest.fixture
+    def polygons(self):
+        return [
+            SimplePolygon(
+                vertices=array([
+                    (0, 0, 0),
+                    (2, 0, 0),
+                    (2, 2, 0),
+                    (0, 2, 0)
+                ])),
+            SimplePolygon(
+                vertices=array([
+                    (3, 0, 0),
+                    (4, 0, 0),
+                    (4, 1, 0)
+                ]))
+        ]
+
+    @pytest.fixture
+    def tree(self, polygons):
+        return BinarySpacePartitioningTree(
+            polygons=polygons,
+            planes=[
+                Plane(
+                    point_in_plane=array([1, 0, 0]),
+                    normal_vector=array([1, 0, 0])),
+                Plane(
+                    point_in_plane=array([0, 1, 0]),
+                    normal_vector=array([0, 1, 0]))
+            ])
+
+    def test_SinglePlane_ReturnSameAsSplitByPlane(self, polygons):
+        plane = Plane(
+            point_in_plane=array([1, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        tree = BinarySpacePartitioningTree(polygons=polygons)
+        assert tree.insert_plane(plane) == 1
+        actual = [
+            fragment
+            for _, fragments, _ in tree.iter_leaves()
+            for fragment in fragments]
+        expected, _ = split_by_plane(
+            object_to_split=polygons,
+            plane=plane)
+        assert sorted(actual, key=lambda p: p.vertices.min(0).tolist()) == (
+            sorted(expected, key=lambda p: p.vertices.min(0).tolist()))
+
+    def test_TwoPlanes_ReturnQuartersAndSourceIndices(self, tree):
+        leaves = list(tree.iter_leaves())
+        actual_areas = [
+            [fragment.area for fragment in fragments]
+            for _, fragments, _ in leaves]
+        actual_source_indices = [
+            source_indices for _, _, source_indices in leaves]
+        assert actual_areas == [[1], [1], [1, 0.5], [1]]
+        assert actual_source_indices == [[0], [0], [0, 1], [0]]
+
+    def test_PlaneNotSeparatingAnyLeaf_ReturnNoSplits(self, tree):
+        leaf_count = len(list(tree.iter_leaves()))
+        actual = tree.insert_plane(Plane(
+            point_in_plane=array([0, 0, 5]),
+            normal_vector=array([0, 0, 1])))
+        assert actual == 0
+        assert len(list(tree.iter_leaves())) == leaf_count
+        assert len(tree.planes) == 3
+
+    @pytest.mark.parametrize(
+        ('point', 'expected_area'),
+        [
+            (array([0.5, 0.5, 0]), 1),
+            (array([1.5, 1.5, 0]), 1),
+            (array([3.5, 0.5, 0]), 1.5),
+            (array([1, 1, 0]), 1),
+        ])
+    def test_Point_ReturnLeafContainingPoint(
+            self, tree, point, expected_area):
+        leaf = tree.locate_point(point)
+        fragments = dict(
+            (leaf, fragments) for leaf, fragments, _ in tree.iter_leaves())
+        actual = fragments[leaf]
+        assert sum(fragment.area for fragment in actual) == pytest.approx(
+            expected_area)
+        assert any(
+            (fragment.bounds[0] <= point).all() and
+            (point <= fragment.bounds[1]).all()
+            for fragment in actual)
+
+    def test_Polygon_ReturnLeavesOverlappingPolygon(self, tree):
+        polygon = SimplePolygon(
+            vertices=array([
+                (0.5, 0.5, 0),
+                (1.5, 0.5, 0),
+                (1.5, 0.9, 0)
+            ]))
+        actual = tree.locate_polygon(polygon)
+        expected = sorted([
+            tree.locate_point(array([0.5, 0.5, 0])),
+            tree.locate_point(array([1.5, 0.5, 0]))])
+        assert actual == expected
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+from itertools import combinations
+
+import pytest
+from numpy import array, zeros
+from numpy.random import RandomState
+from numpy.testing import assert_allclose, assert_array_equal
+
+from python_geometry.bound_vector import BoundVector
+from python_geometry.line_segment import LineSegment
+from python_geometry.sweep_line import get_all_intersections
+from python_geometry.utilities import (
+    INTERSECTION_LINE_SEGMENT, INTERSECTION_POINT, get_intersection)
+
+
+def _get_all_intersections_brute_force(
+        initial_points, terminal_points, initial_points_included=True,
+        terminal_points_included=True):
+    bound_vectors = [
+        BoundVector(
+            initial_point=initial_point,
+            terminal_point=terminal_point,
+            initial_point_included=initial_points_included,
+            terminal_point_included=terminal_points_included)
+        for initial_point, terminal_point in zip(
+            initial_points, terminal_points)]
+    return [
+        (i, j)
+        for (i, bound_vector_i), (j, bound_vector_j) in combinations(
+            enumerate(bound_vectors), 2)
+        if get_intersection(bound_vector_i, bound_vector_j) is not None]
+
+
+class TestGetAllIntersections(object):
+
+    def test_SquareWithDiagonals_ReturnAllPairs(self):
+        initial_points = array([
+            (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 0), (1, 0, 0)])
+        terminal_points = array([
+            (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 0), (1, 1, 0), (0, 1, 0)])
+        pairs, intersections = get_all_intersections(
+            initial_points, terminal_points)
+        assert_array_equal(
+            pairs,
+            [
+                (0, 1), (0, 3), (0, 4), (0, 5), (1, 2), (1, 4), (1, 5),
+                (2, 3), (2, 4), (2, 5), (3, 4), (3, 5), (4, 5)
+            ])
+        assert (intersections.kind == INTERSECTION_POINT).all()
+        assert_allclose(intersections.end_point_0[-1], (0.5, 0.5, 0))
+
+    def test_ExcludedEndPoints_ReturnSameAsBruteForce(self):
+        initial_points = array([
+            (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 0), (1, 0, 0)])
+        terminal_points = array([
+            (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 0), (1, 1, 0), (0, 1, 0)])
+        pairs, _ = get_all_intersections(
+            initial_points, terminal_points,
+            initial_points_included=False,
+            terminal_points_included=False)
+        assert [tuple(pair) for pair in pairs.tolist()] == (
+            _get_all_intersections_brute_force(
+                initial_points, terminal_points,
+                initial_points_included=False,
+                terminal_points_included=False))
+
+    def test_CollinearOverlappingBoundVectors_ReturnAllPairs(self):
+        initial_points = array([(0, 0, 0), (5, 0, 0), (2, 0, 0)])
+        terminal_points = array([(10, 0, 0), (1, 0, 0), (8, 0, 0)])
+        pairs, intersections = get_all_intersections(
+            initial_points, terminal_points)
+        assert_array_equal(pairs, [(0, 1), (0, 2), (1, 2)])
+        assert intersections.kind[0] == INTERSECTION_LINE_SEGMENT
+        assert intersections.get(2) == LineSegment(
+            end_point_0=(5, 0, 0), end_point_1=(2, 0, 0))
+
+    def test_NoBoundVectors_ReturnEmptyResult(self):
+        pairs, intersections = get_all_intersections(
+            zeros((0, 3)), zeros((0, 3)))
+        assert pairs.shape == (0, 2)
+        assert intersections.kind.shape == (0,)
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_RandomBoundVectorsInTiltedPlane_ReturnSameAsBruteForce(
+            self, seed):
+        random_state = RandomState(seed)
+        initial_points = random_state.randint(0, 5, size=(40, 3)).astype(float)
+        terminal_points = random_state.randint(0, 5, size=(40, 3)).astype(
+            float)
+        initial_points[:, 2] = initial_points[:, 0] + initial_points[:, 1]
+        terminal_points[:, 2] = terminal_points[:, 0] + terminal_points[:, 1]
+        mask = (initial_points != terminal_points).any(axis=1)
+        initial_points = initial_points[mask]
+        terminal_points = terminal_points[mask]
+        pairs, _ = get_all_intersections(initial_points, terminal_points)
+        assert [tuple(pair) for pair in pairs.tolist()] == (
+            _get_all_intersections_brute_force(
+                initial_points, terminal_points))
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_RandomBoundVectorsWithExcludedEndPoints_ReturnSameAsBruteForce(
+            self, seed):
+        random_state = RandomState(seed)
+        initial_points = random_state.rand(30, 3)
+        terminal_points = random_state.rand(30, 3)
+        initial_points[:, 2] = 1
+        terminal_points[:, 2] = 1
+        pairs, _ = get_all_intersections(
+            initial_points, terminal_points,
+            initial_points_included=False, normal_vector=(0, 0, 1))
+        assert [tuple(pair) for pair in pairs.tolist()] == (
+            _get_all_intersections_brute_force(
+                initial_points, terminal_points,
+                initial_points_included=False))
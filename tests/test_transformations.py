@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 import pytest
-from numpy import array, sqrt
-from numpy.testing import assert_allclose
+from numpy import (
+    arange, array, concatenate, einsum, empty, float32, int64, sqrt, stack,
+    zeros)
+from numpy.linalg import inv
+from numpy.testing import assert_allclose, assert_array_equal
 
+from python_geometry.config import config
 from python_geometry.transformations import (
-    _build_row_vector_matrix, AffineTransformation, OrthogonalTransformation)
+    _build_row_vector_matrix, AffineTransformation, HomogeneousTransformation,
+    OrthogonalTransformation, TransformationArray)
 
 
 class TestBuildRowVectorMatrix(object):
@@ -92,6 +97,222 @@ class TestAffineTransformation(object):
             transformation.pullback(vectors), expected, atol=1e-8)
 
 
+class TestCompose(object):
+
+    @pytest.fixture
+    def rotation(self):
+        return OrthogonalTransformation(x=(0, 1, 0), y=(-1, 0, 0))
+
+    @pytest.fixture
+    def affine_transformation(self):
+        return AffineTransformation(
+            x=(-2, 0, 2), y=(-1, 2, -1), z=(-1, -1, -1))
+
+    @pytest.fixture
+    def vectors(self):
+        return array([
+            (1, 0, 0),
+            (1.5, -1, 0),
+            (0, 2, 1)
+        ])
+
+    def test_Pushforward_GivenComposition_ReturnSuccessivePushforwards(
+            self, rotation, affine_transformation, vectors):
+        composition = rotation.compose(affine_transformation)
+        assert_allclose(
+            composition.pushforward(vectors),
+            affine_transformation.pushforward(rotation.pushforward(vectors)))
+
+    def test_Pullback_GivenComposition_ReturnSuccessivePullbacks(
+            self, rotation, affine_transformation, vectors):
+        composition = rotation.compose(affine_transformation)
+        assert_allclose(
+            composition.pullback(vectors),
+            rotation.pullback(affine_transformation.pullback(vectors)))
+
+    def test_Compose_GivenOrthogonalTransformations_ReturnOrthogonal(
+            self, rotation):
+        composition = rotation.compose(rotation)
+        assert isinstance(composition, OrthogonalTransformation)
+        assert_allclose(
+            composition.pushforward(array([1, 0, 0])), array([-1, 0, 0]),
+            atol=1e-12)
+
+    def test_Compose_GivenAffineTransformation_ReturnAffine(
+            self, rotation, affine_transformation):
+        composition = affine_transformation.compose(rotation)
+        assert not isinstance(composition, OrthogonalTransformation)
+
+    def test_Matmul_GivenTransformations_ReturnComposition(
+            self, rotation, affine_transformation, vectors):
+        composition = rotation.__matmul__(affine_transformation)
+        assert_allclose(
+            composition.transformation_matrix,
+            rotation.compose(affine_transformation).transformation_matrix)
+
+    def test_Matmul_GivenVectors_ReturnNotImplemented(
+            self, rotation, vectors):
+        assert rotation.__matmul__(vectors) is NotImplemented
+
+    def test_InverseMatrix_GivenNoPullback_IsNotComputed(
+            self, affine_transformation):
+        assert affine_transformation._inverse_transformation_matrix is None
+        affine_transformation.pullback(array([1, 0, 0]))
+        assert (
+            affine_transformation._inverse_transformation_matrix is not None)
+
+    def test_InverseMatrix_GivenKnownInverses_ReuseThem(
+            self, rotation, affine_transformation):
+        affine_transformation.pullback(array([1, 0, 0]))
+        rotation.pullback(array([1, 0, 0]))
+        composition = rotation.compose(affine_transformation)
+        assert composition._inverse_transformation_matrix is not None
+        assert_allclose(
+            composition.inverse_transformation_matrix.dot(
+                composition.transformation_matrix),
+            array([[1, 0, 0], [0, 1, 0], [0, 0, 1]]),
+            atol=1e-12)
+
+    def test_InverseMatrix_GivenAssignedInverse_ReturnIt(
+            self, affine_transformation):
+        inverse_matrix = inv(affine_transformation.transformation_matrix)
+        affine_transformation.inverse_transformation_matrix = inverse_matrix
+        assert_allclose(
+            affine_transformation.inverse_transformation_matrix,
+            inverse_matrix)
+        affine_transformation.inverse_transformation_matrix = None
+        assert affine_transformation._inverse_transformation_matrix is None
+
+    def test_Compose_GivenTransformationArray_ReturnTransformationArray(
+            self, rotation, affine_transformation, vectors):
+        transformation_array = TransformationArray.from_transformations(
+            [rotation, affine_transformation])
+        composition = transformation_array.compose(rotation)
+        assert_allclose(
+            composition.pushforward(vectors[:2], indices=[0, 1]),
+            rotation.pushforward(
+                transformation_array.pushforward(
+                    vectors[:2], indices=[0, 1])))
+        composition = rotation.compose(transformation_array)
+        assert_allclose(
+            composition.pullback(vectors[:2], indices=[0, 1]),
+            rotation.pullback(
+                transformation_array.pullback(vectors[:2], indices=[0, 1])))
+
+
+class TestTransformInChunks(object):
+
+    @pytest.fixture
+    def transformation(self):
+        return AffineTransformation(
+            x=(-2, 0, 2), y=(-1, 2, -1), z=(-1, -1, -1))
+
+    @pytest.fixture
+    def vectors(self):
+        return arange(60, dtype=float).reshape(20, 3) % 7 - 3
+
+    def test_Pushforward_GivenOut_WriteResultToOut(
+            self, transformation, vectors):
+        out = empty(vectors.shape)
+        actual = transformation.pushforward(vectors, out=out)
+        assert actual is out
+        assert_allclose(out, transformation.pushforward(vectors))
+
+    def test_Pushforward_GivenVectorsAsOut_TransformInPlace(
+            self, transformation, vectors):
+        expected = transformation.pushforward(vectors)
+        transformation.pushforward(vectors, out=vectors, chunk_size=3)
+        assert_allclose(vectors, expected)
+
+    def test_Pullback_GivenSmallChunks_ReturnSameAsAtOnce(
+            self, transformation, vectors):
+        actual = transformation.pullback(
+            vectors.reshape(4, 5, 3), chunk_size=4)
+        assert_allclose(
+            actual, transformation.pullback(vectors).reshape(4, 5, 3))
+
+    def test_Pushforward_GivenSingleVectorAndOut_WriteResultToOut(
+            self, transformation):
+        out = empty(3)
+        transformation.pushforward(array([1, 0, 0]), out=out)
+        assert_allclose(out, [-2, 0, 2])
+
+    def test_Pushforward_GivenFloat32Out_WriteResultToOut(
+            self, transformation, vectors):
+        out = empty(vectors.shape, dtype=float32)
+        transformation.pushforward(vectors, out=out, chunk_size=7)
+        assert_allclose(out, transformation.pushforward(vectors))
+
+    def test_Pushforward_GivenOutOfWrongShape_RaiseValueError(
+            self, transformation, vectors):
+        with pytest.raises(ValueError):
+            transformation.pushforward(vectors, out=empty((3, 20)))
+
+    def test_Pushforward_GivenIntegerOut_RaiseTypeError(
+            self, transformation, vectors):
+        out = zeros(vectors.shape, dtype=int64)
+        with pytest.raises(TypeError):
+            transformation.pushforward(vectors, out=out, chunk_size=6)
+        assert not out.any()
+
+    def test_Pushforward_GivenIntegerPointsAsOut_RaiseTypeError(self):
+        transformation = HomogeneousTransformation(
+            x=(0, 1, 0), y=(-1, 0, 0), z=(0, 0, 1), translation=(1, 2, 3))
+        vectors = arange(60, dtype=int64).reshape(20, 3)
+        with pytest.raises(TypeError):
+            transformation.pushforward(
+                vectors, out=vectors, chunk_size=6, points=True)
+        assert_allclose(vectors, arange(60).reshape(20, 3))
+
+    def test_Pushforward_GivenPointsAsOut_TranslateInPlace(self, vectors):
+        transformation = HomogeneousTransformation(
+            x=(0, 1, 0), y=(-1, 0, 0), z=(0, 0, 1), translation=(1, 2, 3))
+        expected = transformation.pushforward(vectors, points=True)
+        transformation.pushforward(
+            vectors, points=True, out=vectors, chunk_size=6)
+        assert_allclose(vectors, expected)
+        transformation.pullback(
+            vectors, points=True, out=vectors, chunk_size=6)
+        assert_allclose(
+            vectors, arange(60).reshape(20, 3) % 7 - 3, atol=1e-12)
+
+    def test_Pushforward_GivenLargeStridedVectors_ReturnSameAsEinsum(
+            self, transformation, vectors, monkeypatch):
+        monkeypatch.setitem(config, 'chunk_size', 4)
+        strided_vectors = concatenate([vectors, vectors], axis=1)[:, ::2]
+        assert not strided_vectors.flags.c_contiguous
+        assert_allclose(
+            transformation.pushforward(strided_vectors),
+            einsum(
+                '...i,ij->...j',
+                strided_vectors,
+                transformation.transformation_matrix))
+
+    def test_Pushforward_GivenIntegerVectors_ReturnIntegerVectors(
+            self, transformation, vectors):
+        actual = transformation.pushforward(vectors.astype(int64))
+        assert actual.dtype.kind == 'i'
+        assert_allclose(actual, transformation.pushforward(vectors))
+
+    @pytest.mark.parametrize('kwargs', [
+        {'indices': arange(20) % 3},
+        {'offsets': array([0, 4, 4, 20])},
+        {}
+    ])
+    def test_TransformationArray_GivenVectorsAsOut_TransformInPlace(
+            self, transformation, vectors, kwargs):
+        transformation_array = TransformationArray.from_transformations([
+            transformation,
+            OrthogonalTransformation(x=(0, 1, 0), y=(-1, 0, 0)),
+            OrthogonalTransformation(x=(0, 0, 1), y=(0, 1, 0))])
+        if not kwargs:
+            vectors = vectors[:18].reshape(3, 6, 3)
+        expected = transformation_array.pushforward(vectors, **kwargs)
+        transformation_array.pushforward(
+            vectors, out=vectors, chunk_size=5, **kwargs)
+        assert_allclose(vectors, expected)
+
+
 class TestOrthogonalTransformation(object):
 
     def test_Pushforward_GivenUnitBasis_ReturnOriginalVectors(self):
@@ -286,3 +507,236 @@ class TestOrthogonalTransformation(object):
         )
         assert_allclose(
             transformation.pullback(vectors), expected_vectors, atol=1e-8)
+
+
+class TestHomogeneousTransformation(object):
+
+    @pytest.fixture
+    def transformation(self):
+        return HomogeneousTransformation(
+            x=(0, 1, 0), y=(-1, 0, 0), z=(0, 0, 1), translation=(1, 2, 3))
+
+    @pytest.fixture
+    def vectors(self):
+        return array([
+            (1, 0, 0),
+            (1.5, -1, 0),
+            (0, 2, 1)
+        ])
+
+    def test_Pushforward_GivenPoints_ReturnTranslatedPoints(
+            self, transformation, vectors):
+        actual = transformation.pushforward(vectors, points=True)
+        expected = array([
+            (1, 3, 3),
+            (2, 3.5, 3),
+            (-1, 2, 4)
+        ])
+        assert_allclose(actual, expected)
+
+    def test_Pushforward_GivenDirections_ReturnRotatedDirections(
+            self, transformation, vectors):
+        actual = transformation.pushforward(vectors)
+        expected = array([
+            (0, 1, 0),
+            (1, 1.5, 0),
+            (-2, 0, 1)
+        ])
+        assert_allclose(actual, expected)
+
+    @pytest.mark.parametrize('method', ['pushforward', 'pullback'])
+    def test_GivenPositionalOut_ReturnSameAsBaseClass(
+            self, transformation, vectors, method):
+        actual = empty(vectors.shape)
+        getattr(transformation, method)(vectors, actual, 2)
+        expected = getattr(super(HomogeneousTransformation, transformation),
+                           method)(vectors)
+        assert_allclose(actual, expected)
+
+    def test_Pullback_GivenPushedForwardPoints_ReturnOriginalPoints(
+            self, transformation, vectors):
+        actual = transformation.pullback(
+            transformation.pushforward(vectors, points=True), points=True)
+        assert_allclose(actual, vectors, atol=1e-12)
+
+    def test_HomogeneousMatrix_GivenPoints_ReturnSameAsPushforward(
+            self, transformation, vectors):
+        homogeneous_points = concatenate(
+            [vectors, array([[1], [1], [1]])], axis=1)
+        actual = homogeneous_points.dot(transformation.homogeneous_matrix)
+        assert_allclose(
+            actual[:, :3], transformation.pushforward(vectors, points=True))
+        assert_allclose(actual[:, 3], 1)
+
+    def test_FromHomogeneousMatrix_GivenMatrix_ReturnSameTransformation(
+            self, transformation, vectors):
+        actual = HomogeneousTransformation.from_homogeneous_matrix(
+            transformation.homogeneous_matrix)
+        assert_allclose(
+            actual.pushforward(vectors, points=True),
+            transformation.pushforward(vectors, points=True))
+
+    def test_FromHomogeneousMatrix_GivenProjectiveMatrix_RaiseValueError(
+            self):
+        with pytest.raises(ValueError):
+            HomogeneousTransformation.from_homogeneous_matrix(
+                array([
+                    (1, 0, 0, 0),
+                    (0, 1, 0, 0),
+                    (0, 0, 1, 1),
+                    (0, 0, 0, 1)
+                ]))
+
+    @pytest.mark.parametrize('other', [
+        HomogeneousTransformation(
+            x=(-2, 0, 2), y=(-1, 2, -1), z=(-1, -1, -1),
+            translation=(0, -1, 0.5)),
+        AffineTransformation(x=(-2, 0, 2), y=(-1, 2, -1), z=(-1, -1, -1)),
+        OrthogonalTransformation(x=(0, 0, 1), y=(0, 1, 0))
+    ])
+    def test_Compose_GivenTransformations_ReturnSuccessivePushforwards(
+            self, transformation, vectors, other):
+        for first, second in [
+                (transformation, other), (other, transformation)]:
+            composition = first.compose(second)
+            assert isinstance(composition, HomogeneousTransformation)
+            for points in [False, True]:
+                if isinstance(first, HomogeneousTransformation):
+                    expected = first.pushforward(vectors, points=points)
+                else:
+                    expected = first.pushforward(vectors)
+                if isinstance(second, HomogeneousTransformation):
+                    expected = second.pushforward(expected, points=points)
+                else:
+                    expected = second.pushforward(expected)
+                assert_allclose(
+                    composition.pushforward(vectors, points=points),
+                    expected)
+
+    def test_Compose_GivenTransformationArray_RaiseNotImplementedError(
+            self, transformation):
+        transformation_array = TransformationArray.from_transformations(
+            [OrthogonalTransformation(x=(0, 0, 1), y=(0, 1, 0))])
+        with pytest.raises(NotImplementedError):
+            transformation.compose(transformation_array)
+        with pytest.raises(NotImplementedError):
+            transformation_array.compose(transformation)
+
+    def test_repr_GivenTranslation_ReturnCorrectRepr(self):
+        transformation = HomogeneousTransformation(
+            x=(1, 0, 0), y=(0, 1, 0), z=(0, 0, 1), translation=(1, 2, 3))
+        assert repr(transformation).startswith(
+            'HomogeneousTransformation(x=(1, 0, 0), y=(0, 1, 0), '
+            'z=(0, 0, 1), translation=array(')
+
+
+class TestTransformationArray(object):
+
+    @pytest.fixture
+    def transformations(self):
+        return [
+            OrthogonalTransformation(x=(0, 1, 0), y=(-1, 0, 0)),
+            AffineTransformation(x=(-2, 0, 2), y=(-1, 2, -1), z=(-1, -1, -1)),
+            OrthogonalTransformation(x=(1, 0, 0), y=(0, 1, 0), z=(0, 0, 1))
+        ]
+
+    @pytest.fixture
+    def vectors(self):
+        return array([
+            (1, 0, 0),
+            (1.5, -1, 0),
+            (0, 2, 1),
+            (-0.5, -3, 0),
+            (1, 1, 1)
+        ])
+
+    def test_Pushforward_GivenIndices_ReturnVectorsOfEachTransformation(
+            self, transformations, vectors):
+        indices = array([2, 0, 1, 0, 1])
+        actual = TransformationArray.from_transformations(
+            transformations).pushforward(vectors, indices=indices)
+        expected = [
+            transformations[i].pushforward(vector)
+            for i, vector in zip(indices, vectors)]
+        assert_allclose(actual, expected)
+
+    def test_Pushforward_GivenOffsets_ReturnVectorsOfEachTransformation(
+            self, transformations, vectors):
+        offsets = array([0, 2, 2, 5])
+        actual = TransformationArray.from_transformations(
+            transformations).pushforward(vectors, offsets=offsets)
+        expected = concatenate([
+            transformation.pushforward(vectors[start:stop]).reshape(-1, 3)
+            for transformation, start, stop in zip(
+                transformations, offsets[:-1], offsets[1:])])
+        assert_allclose(actual, expected)
+
+    def test_Pushforward_GivenStackedVectors_ReturnVectorsOfEachTransformation(
+            self, transformations, vectors):
+        stacked_vectors = stack([vectors[:2], vectors[2:4], vectors[3:]])
+        actual = TransformationArray.from_transformations(
+            transformations).pushforward(stacked_vectors)
+        expected = [
+            transformation.pushforward(vectors)
+            for transformation, vectors in zip(
+                transformations, stacked_vectors)]
+        assert_allclose(actual, expected)
+
+    def test_Pullback_GivenIndices_ReturnOriginalVectors(
+            self, transformations, vectors):
+        transformation_array = TransformationArray.from_transformations(
+            transformations)
+        indices = array([1, 1, 0, 2, 0])
+        actual = transformation_array.pullback(
+            transformation_array.pushforward(vectors, indices=indices),
+            indices=indices)
+        assert_allclose(actual, vectors, atol=1e-12)
+
+    def test_Init_GivenMatrices_ComputeInverseMatrices(self, transformations):
+        actual = TransformationArray(
+            stack([t.transformation_matrix for t in transformations]))
+        assert_allclose(
+            actual.inverse_transformation_matrices,
+            stack([t.inverse_transformation_matrix for t in transformations]),
+            atol=1e-12)
+
+    def test_FromTransformations_GivenUnknownInverse_InvertOnFirstUse(
+            self, transformations):
+        actual = TransformationArray.from_transformations(transformations)
+        assert actual._inverse_transformation_matrices is None
+        assert all(
+            t._inverse_transformation_matrix is None
+            for t in transformations[1:])
+        assert_allclose(
+            actual.inverse_transformation_matrices,
+            stack([t.inverse_transformation_matrix for t in transformations]),
+            atol=1e-12)
+
+    def test_FromTransformations_GivenKnownInverses_ReuseThem(
+            self, transformations):
+        for transformation in transformations:
+            transformation.pullback(array([1, 0, 0]))
+        actual = TransformationArray.from_transformations(transformations)
+        assert_array_equal(
+            actual._inverse_transformation_matrices,
+            stack([t.inverse_transformation_matrix for t in transformations]))
+
+    def test_Pushforward_GivenIndicesAndOffsets_RaiseValueError(
+            self, transformations, vectors):
+        with pytest.raises(ValueError):
+            TransformationArray.from_transformations(
+                transformations).pushforward(
+                    vectors, indices=arange(5) % 3, offsets=[0, 1, 2, 5])
+
+    def test_Pushforward_GivenWrongOffsets_RaiseValueError(
+            self, transformations, vectors):
+        with pytest.raises(ValueError):
+            TransformationArray.from_transformations(
+                transformations).pushforward(vectors, offsets=[0, 2, 5])
+
+    def test_FromTransformations_GivenNoTransformations_ReturnEmptyArray(
+            self):
+        actual = TransformationArray.from_transformations([])
+        assert len(actual) == 0
+        assert actual.pushforward(
+            zeros((0, 3)), offsets=[0]).shape == (0, 3)
@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
+import multiprocessing
+from itertools import product
+
 import pytest
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_array_equal
 from numpy import array, sqrt
+from numpy.random import RandomState
 
 from python_geometry.utilities import (
-    get_intersection, get_normal_vector, get_tangent_vectors)
+    INTERSECTION_BOUND_VECTOR, INTERSECTION_LINE_SEGMENT, INTERSECTION_NONE,
+    INTERSECTION_POINT, get_intersection,
+    get_intersections_bound_vectors_bound_vectors,
+    get_intersections_segments_planes, get_normal_vector, get_tangent_vectors,
+    register_intersection)
+from python_geometry import parallel, utilities
+from python_geometry.config import config
 from python_geometry.plane import Plane
 from python_geometry.bound_vector import BoundVector
 from python_geometry.line_segment import LineSegment
@@ -969,3 +979,419 @@ class TestGetIntersection(object):
         actual = get_intersection(bound_vector, plane)
         expected = bound_vector
         assert actual == expected
+
+    @pytest.mark.parametrize(
+        ('initial_point_included', 'terminal_point_included', 'expected'),
+        [
+            (True, True, array([0, 0, 0])),
+            (False, True, None),
+            (True, False, array([0, 0, 0])),
+            (False, False, None)
+        ])
+    def test_BoundVectorThatStartsOnPlane_ReturnPointIfIncluded(
+            self, initial_point_included, terminal_point_included, expected):
+        bound_vector = BoundVector(
+            initial_point=array([0, 0, 0]),
+            terminal_point=array([1, 0, 0]),
+            initial_point_included=initial_point_included,
+            terminal_point_included=terminal_point_included)
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        _assert_same_intersection(
+            get_intersection(bound_vector, plane), expected)
+
+    @pytest.mark.parametrize(
+        ('initial_point_included', 'terminal_point_included', 'expected'),
+        [
+            (True, True, array([1, 0, 0])),
+            (False, True, array([1, 0, 0])),
+            (True, False, None),
+            (False, False, None)
+        ])
+    def test_BoundVectorThatEndsOnPlane_ReturnPointIfIncluded(
+            self, initial_point_included, terminal_point_included, expected):
+        bound_vector = BoundVector(
+            initial_point=array([0, 0, 0]),
+            terminal_point=array([1, 0, 0]),
+            initial_point_included=initial_point_included,
+            terminal_point_included=terminal_point_included)
+        plane = Plane(
+            point_in_plane=array([1, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        _assert_same_intersection(
+            get_intersection(bound_vector, plane), expected)
+
+
+def _assert_same_intersection(actual, expected):
+    if expected is None:
+        assert actual is None
+    elif isinstance(expected, (BoundVector, LineSegment)):
+        assert actual == expected
+    else:
+        assert_allclose(actual, expected)
+
+
+class TestGetIntersectionsBoundVectorsBoundVectors(object):
+
+    def test_CollinearBoundVectorsWithAllInclusions_ReturnSameAsScalar(self):
+        direction = array([1, 2, 0])
+        cases = [
+            (a, b, c, d, flags)
+            for a, b, c, d in product(range(4), repeat=4)
+            if a != b and c != d
+            for flags in product([True, False], repeat=4)]
+        initial_points_0 = array([a*direction for a, _, _, _, _ in cases])
+        terminal_points_0 = array([b*direction for _, b, _, _, _ in cases])
+        initial_points_1 = array([c*direction for _, _, c, _, _ in cases])
+        terminal_points_1 = array([d*direction for _, _, _, d, _ in cases])
+        flags = array([flags for _, _, _, _, flags in cases]).T
+        actual = get_intersections_bound_vectors_bound_vectors(
+            initial_points_0, terminal_points_0,
+            initial_points_1, terminal_points_1,
+            *flags)
+        for i in range(len(cases)):
+            expected = get_intersection(
+                BoundVector(
+                    initial_point=initial_points_0[i],
+                    terminal_point=terminal_points_0[i],
+                    initial_point_included=flags[0, i],
+                    terminal_point_included=flags[1, i]),
+                BoundVector(
+                    initial_point=initial_points_1[i],
+                    terminal_point=terminal_points_1[i],
+                    initial_point_included=flags[2, i],
+                    terminal_point_included=flags[3, i]))
+            _assert_same_intersection(actual.get(i), expected)
+
+    def test_RandomBoundVectorsInPlane_ReturnSameAsScalar(self):
+        random_state = RandomState(0)
+        points = random_state.randint(-2, 3, size=(4, 500, 3))
+        points[..., 2] = 0
+        flags = random_state.randint(0, 2, size=(4, 500)).astype(bool)
+        actual = get_intersections_bound_vectors_bound_vectors(
+            *list(points) + list(flags))
+        for i in range(500):
+            if (points[0, i] == points[1, i]).all() or (
+                    points[2, i] == points[3, i]).all():
+                continue
+            expected = get_intersection(
+                BoundVector(points[0, i], points[1, i], *flags[:2, i]),
+                BoundVector(points[2, i], points[3, i], *flags[2:, i]))
+            _assert_same_intersection(actual.get(i), expected)
+
+    def test_ZeroLengthBoundVectors_ReturnSameAsScalar(self):
+        random_state = RandomState(1)
+        points = random_state.randint(-1, 2, size=(4, 300, 3))
+        points[..., 2] = 0
+        points[1, ::2] = points[0, ::2]
+        points[3, ::3] = points[2, ::3]
+        flags = random_state.randint(0, 2, size=(4, 300)).astype(bool)
+        actual = get_intersections_bound_vectors_bound_vectors(
+            *list(points) + list(flags))
+        for i in range(300):
+            expected = get_intersection(
+                BoundVector(points[0, i], points[1, i], *flags[:2, i]),
+                BoundVector(points[2, i], points[3, i], *flags[2:, i]))
+            _assert_same_intersection(actual.get(i), expected)
+
+    def test_MixedPairs_ReturnCorrectKinds(self):
+        actual = get_intersections_bound_vectors_bound_vectors(
+            initial_points_0=[
+                (0, 1, 0), (0, 0, 0), (0, 0, 0), (0, 0, 0), (1, 0, 0)],
+            terminal_points_0=[
+                (2, 1, 0), (2, 0, 0), (2, 0, 0), (1, 0, 0), (2, 0, 0)],
+            initial_points_1=[
+                (1, 0, 0), (1, 0, 0), (3, 0, 0), (2, 0, 0), (0, 1, 1)],
+            terminal_points_1=[
+                (1, 2, 0), (3, 0, 0), (1, 0, 0), (3, 0, 0), (0, 2, 1)])
+        assert_array_equal(
+            actual.kind,
+            [
+                INTERSECTION_POINT, INTERSECTION_BOUND_VECTOR,
+                INTERSECTION_LINE_SEGMENT, INTERSECTION_NONE,
+                INTERSECTION_NONE
+            ])
+        assert_allclose(actual.end_point_0[0], (1, 1, 0))
+        assert_allclose(actual.end_point_0[1], (1, 0, 0))
+        assert_allclose(actual.end_point_1[1], (2, 0, 0))
+
+    def test_BroadcastInput_ReturnResultsOfBroadcastShape(self):
+        actual = get_intersections_bound_vectors_bound_vectors(
+            initial_points_0=[[(0, 1, 0)], [(0, 3, 0)]],
+            terminal_points_0=[[(2, 1, 0)], [(2, 3, 0)]],
+            initial_points_1=[(1, 0, 0), (3, 0, 0), (1, 0, 0)],
+            terminal_points_1=[(1, 2, 0), (3, 2, 0), (1, 4, 0)],
+            initial_points_0_included=False)
+        assert actual.kind.shape == (2, 3)
+        assert actual.end_point_0.shape == (2, 3, 3)
+        assert_array_equal(
+            actual.kind,
+            [
+                [INTERSECTION_POINT, INTERSECTION_NONE, INTERSECTION_POINT],
+                [INTERSECTION_NONE, INTERSECTION_NONE, INTERSECTION_POINT]
+            ])
+
+    def test_Workers_ReturnSameAsSingleProcess(self):
+        random_state = RandomState(2)
+        points = random_state.randint(-2, 3, size=(4, 5, 7, 3))
+        included = random_state.randint(0, 2, size=(4, 5, 7)) == 1
+        expected = get_intersections_bound_vectors_bound_vectors(
+            *points, initial_points_0_included=included[0],
+            terminal_points_1_included=included[1])
+        actual = get_intersections_bound_vectors_bound_vectors(
+            *points, initial_points_0_included=included[0],
+            terminal_points_1_included=included[1], workers=2)
+        for actual_field, expected_field in zip(actual, expected):
+            assert_array_equal(actual_field, expected_field)
+
+
+class TestGetIntersectionsSegmentsPlanes(object):
+
+    def test_RandomSegmentsAndPlanes_ReturnSameAsScalar(self):
+        random_state = RandomState(0)
+        segments = random_state.randint(-2, 3, size=(60, 2, 3))
+        points_in_plane = random_state.randint(-2, 3, size=(7, 3))
+        normal_vectors = random_state.randint(-1, 2, size=(7, 3))
+        initial_points_included = random_state.randint(0, 2, 60) == 1
+        terminal_points_included = random_state.randint(0, 2, 60) == 1
+        actual = get_intersections_segments_planes(
+            segments, points_in_plane, normal_vectors,
+            initial_points_included=initial_points_included,
+            terminal_points_included=terminal_points_included)
+        assert actual.params.shape == (60, 7)
+        assert actual.points.shape == (60, 7, 3)
+        for i, j in product(range(60), range(7)):
+            if (normal_vectors[j] == 0).all():
+                continue
+            bound_vector = BoundVector(
+                initial_point=segments[i, 0],
+                terminal_point=segments[i, 1],
+                initial_point_included=initial_points_included[i],
+                terminal_point_included=terminal_points_included[i])
+            expected = get_intersection(
+                bound_vector,
+                Plane(points_in_plane[j], normal_vectors[j]))
+            if expected is bound_vector:
+                assert actual.in_plane[i, j]
+                assert not actual.intersects[i, j]
+            elif expected is None:
+                assert not actual.in_plane[i, j]
+                assert not actual.intersects[i, j]
+            else:
+                assert actual.intersects[i, j]
+                assert_allclose(actual.points[i, j], expected)
+
+    def test_EndPointsOnUnitNormalPlanes_ReturnSameAsScalar(self):
+        random_state = RandomState(1)
+        normal_vectors = array([
+            vector for vector in product([-1, 0, 1], repeat=3)
+            if any(vector)], dtype=float)
+        normal_vectors /= sqrt((normal_vectors**2).sum(axis=1))[:, None]
+        points_in_plane = random_state.randint(-2, 3, size=(26, 3))
+        segments = random_state.randint(-2, 3, size=(200, 2, 3))
+        initial_points_included = random_state.randint(0, 2, 200) == 1
+        terminal_points_included = random_state.randint(0, 2, 200) == 1
+        actual = get_intersections_segments_planes(
+            segments, points_in_plane, normal_vectors,
+            initial_points_included=initial_points_included,
+            terminal_points_included=terminal_points_included)
+        end_points_on_plane = 0
+        for i, j in product(range(200), range(26)):
+            plane = Plane(points_in_plane[j], normal_vectors[j])
+            end_points_on_plane += sum(
+                abs(plane.distance(segments[i])) < 1e-9)
+            bound_vector = BoundVector(
+                initial_point=segments[i, 0],
+                terminal_point=segments[i, 1],
+                initial_point_included=initial_points_included[i],
+                terminal_point_included=terminal_points_included[i])
+            expected = get_intersection(bound_vector, plane)
+            if expected is bound_vector:
+                assert actual.in_plane[i, j]
+            elif expected is None:
+                assert not actual.intersects[i, j]
+            else:
+                assert actual.intersects[i, j]
+                assert_allclose(
+                    actual.points[i, j], expected, atol=1e-12)
+        assert end_points_on_plane > 100
+
+    @pytest.mark.parametrize(
+        'segment, initial_point_included, terminal_point_included, point', [
+            ([[0, 1, 2], [-1, 0, 1]], True, True, [-1, 0, 1]),
+            ([[0, 1, 2], [-1, 0, 1]], True, False, None),
+            ([[0, -2, -2], [2, -2, 2]], False, True, [2, -2, 2]),
+            ([[2, -2, 2], [0, -2, -2]], False, True, None)])
+    def test_EndPointOnPlane_ReturnAccordingToInclusion(
+            self, segment, initial_point_included, terminal_point_included,
+            point):
+        actual = get_intersections_segments_planes(
+            [segment], [[-1, -1, 0]], [array([1, 1, -1]) / sqrt(3)],
+            initial_points_included=initial_point_included,
+            terminal_points_included=terminal_point_included)
+        if point is None:
+            assert not actual.intersects[0, 0]
+        else:
+            assert actual.intersects[0, 0]
+            assert_allclose(actual.points[0, 0], point, atol=1e-12)
+
+    @pytest.mark.parametrize('reverse', [False, True])
+    def test_EndPointNearPlane_ReturnSameInBothDirections(self, reverse):
+        segment = [(0, 0, 0), (1, 0, 0)]
+        if reverse:
+            segment = segment[::-1]
+        plane = Plane(array([0.999995, 0, 0]), array([1, 0, 0]))
+        actual = get_intersections_segments_planes(
+            [segment], plane.point_in_plane, plane.normal_vector,
+            initial_points_included=not reverse,
+            terminal_points_included=reverse)
+        expected = get_intersection(
+            BoundVector(
+                initial_point=array(segment[0], dtype=float),
+                terminal_point=array(segment[1], dtype=float),
+                initial_point_included=not reverse,
+                terminal_point_included=reverse),
+            plane)
+        assert actual.intersects[0, 0]
+        assert_allclose(actual.points[0, 0], (0.999995, 0, 0))
+        assert_allclose(expected, (0.999995, 0, 0))
+
+    def test_SmallChunks_ReturnSameAsSingleChunk(self):
+        random_state = RandomState(1)
+        segments = random_state.rand(50, 2, 3)
+        points_in_plane = random_state.rand(4, 3)
+        normal_vectors = random_state.rand(4, 3)
+        expected = get_intersections_segments_planes(
+            segments, points_in_plane, normal_vectors)
+        actual = get_intersections_segments_planes(
+            segments, points_in_plane, normal_vectors, chunk_size=9)
+        assert_array_equal(actual.params, expected.params)
+        assert_array_equal(actual.intersects, expected.intersects)
+        assert_array_equal(actual.in_plane, expected.in_plane)
+        assert_array_equal(actual.points, expected.points)
+
+    def test_Workers_ReturnSameAsSingleProcess(self):
+        random_state = RandomState(3)
+        segments = random_state.rand(50, 2, 3)
+        points_in_plane = random_state.rand(4, 3)
+        normal_vectors = random_state.rand(4, 3)
+        expected = get_intersections_segments_planes(
+            segments, points_in_plane, normal_vectors)
+        actual = get_intersections_segments_planes(
+            segments, points_in_plane, normal_vectors, chunk_size=9,
+            workers=3)
+        assert_array_equal(actual.params, expected.params)
+        assert_array_equal(actual.intersects, expected.intersects)
+        assert_array_equal(actual.in_plane, expected.in_plane)
+        assert_array_equal(actual.points, expected.points)
+
+    @pytest.mark.skipif(
+        not hasattr(multiprocessing, 'get_context'),
+        reason='Start methods cannot be chosen.')
+    def test_SpawnedWorkers_UseCallersConfig(self, monkeypatch):
+        monkeypatch.setitem(
+            config, 'numbers_close_kwargs',
+            dict(config['numbers_close_kwargs'], atol=0.1))
+        monkeypatch.setattr(
+            parallel, 'Pool', multiprocessing.get_context('spawn').Pool)
+        segments = [[(0.05, y, 0), (0.05, y, 1)] for y in range(4)]
+        expected = get_intersections_segments_planes(
+            segments, (0, 0, 0), (1, 0, 0))
+        actual = get_intersections_segments_planes(
+            segments, (0, 0, 0), (1, 0, 0), workers=2)
+        assert expected.in_plane.all()
+        assert_array_equal(actual.in_plane, expected.in_plane)
+
+    def test_SinglePlane_ReturnOneColumn(self):
+        actual = get_intersections_segments_planes(
+            segments=[
+                [(-1, 0, 0), (1, 0, 0)],
+                [(1, 0, 0), (2, 0, 0)],
+                [(0, 0, 0), (0, 1, 0)]
+            ],
+            points_in_plane=(0, 0, 0),
+            normal_vectors=(1, 0, 0))
+        assert_allclose(actual.params[:, 0], [0.5, -1, 0])
+        assert_array_equal(actual.intersects[:, 0], [True, False, False])
+        assert_array_equal(actual.in_plane[:, 0], [False, False, True])
+        assert_allclose(actual.points[0, 0], (0, 0, 0))
+
+
+class TestIntersectionDispatch(object):
+
+    def test_LineSegmentAndPlane_ReturnPoint(self):
+        line_segment = LineSegment(
+            end_point_0=array([-1, 0, 0]),
+            end_point_1=array([1, 0, 0]))
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        assert_allclose(get_intersection(line_segment, plane), (0, 0, 0))
+        assert_allclose(get_intersection(plane, line_segment), (0, 0, 0))
+
+    def test_LineSegmentInPlane_ReturnLineSegment(self):
+        line_segment = LineSegment(
+            end_point_0=array([0, 0, 0]),
+            end_point_1=array([0, 1, 0]))
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        assert get_intersection(plane, line_segment) is line_segment
+
+    def test_OverlappingLineSegments_ReturnLineSegment(self):
+        line_segment_0 = LineSegment(
+            end_point_0=array([0, 0, 0]),
+            end_point_1=array([2, 0, 0]),
+            end_point_0_included=False)
+        line_segment_1 = LineSegment(
+            end_point_0=array([1, 0, 0]),
+            end_point_1=array([3, 0, 0]),
+            end_point_1_included=False)
+        expected = LineSegment(
+            end_point_0=array([1, 0, 0]),
+            end_point_1=array([2, 0, 0]))
+        assert get_intersection(line_segment_0, line_segment_1) == expected
+
+    def test_LineSegmentOverlappingBoundVector_ReturnLineSegment(self):
+        line_segment = LineSegment(
+            end_point_0=array([0, 0, 0]),
+            end_point_1=array([2, 0, 0]))
+        bound_vector = BoundVector(
+            initial_point=array([1, 0, 0]),
+            terminal_point=array([3, 0, 0]))
+        expected = LineSegment(
+            end_point_0=array([1, 0, 0]),
+            end_point_1=array([2, 0, 0]))
+        assert get_intersection(line_segment, bound_vector) == expected
+        assert get_intersection(bound_vector, line_segment) == expected
+
+    def test_UnregisteredPair_RaiseNotImplementedError(self):
+        plane = Plane(
+            point_in_plane=array([0, 0, 0]),
+            normal_vector=array([1, 0, 0]))
+        with pytest.raises(NotImplementedError):
+            get_intersection(plane, plane)
+
+    def test_RegisteredPair_DispatchToRegisteredFunction(self):
+        class Point(object):
+            pass
+
+        class SpecialPoint(Point):
+            pass
+
+        @register_intersection(Point, Plane)
+        def intersect_point_plane(point, plane):
+            return point
+
+        try:
+            plane = Plane(
+                point_in_plane=array([0, 0, 0]),
+                normal_vector=array([1, 0, 0]))
+            point = SpecialPoint()
+            assert get_intersection(point, plane) is point
+            assert get_intersection(plane, point) is point
+        finally:
+            del utilities._intersection_functions[(Point, Plane)]
+            del utilities._intersection_functions[(Plane, Point)]
+            utilities._intersection_functions_cache.clear()
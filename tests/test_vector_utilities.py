@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
+from numpy import (
+    allclose, array, array_equal, cross, dot, inf, isclose, isnan, nan)
+from numpy.linalg import det, norm
+from numpy.random import RandomState
 import pytest
 
-from python_geometry.vector_utilities import are_parallel
+from python_geometry.vector_utilities import (
+    _cross, _det, _divide, _dot, _isclose, _nanmean, _norm, are_antiparallel,
+    are_antiparallel_mask, are_parallel, are_parallel_mask)
 
 
 class TestAreParallel:
@@ -19,3 +25,112 @@ class TestAreParallel:
     )
     def test_GivenVectors_ReturnAreParallel(self, a, b, expected):
         assert are_parallel(a, b) == expected
+
+    @pytest.mark.parametrize(
+        ('a', 'b', 'expected'),
+        [
+            ((1., 0), (2., 0), True),
+            ((1, 1), (-3, -3), True),
+            ((1, 0), (1, 1), False),
+            ((1, 0), (0, 0), False)
+        ]
+    )
+    def test_GivenTwoDimensionalVectors_ReturnAreParallel(
+            self, a, b, expected):
+        assert are_parallel(array(a), array(b)) == expected
+
+
+class TestAreAntiparallel:
+
+    @pytest.mark.parametrize(
+        ('a', 'b', 'expected'),
+        [
+            ((1, 0, 0), (1, 0, 0), False),
+            ((1, 0, 0), (-2, 0, 0), True),
+            ((1, 2, 3), (-2, -4, -6), True),
+            ((1, 0, 0), (0, 0, 0), False),
+            ((1, 0, 0), (-1, 1, 0), False)
+        ]
+    )
+    def test_GivenVectors_ReturnAreAntiparallel(self, a, b, expected):
+        assert are_antiparallel(a, b) == expected
+
+    @pytest.mark.parametrize(
+        ('a', 'b', 'expected'),
+        [
+            ((1., 0), (-2., 0), True),
+            ((1, 1), (1, 1), False),
+            ((1, 0), (0, 0), False)
+        ]
+    )
+    def test_GivenTwoDimensionalVectors_ReturnAreAntiparallel(
+            self, a, b, expected):
+        assert are_antiparallel(array(a), array(b)) == expected
+
+
+class TestAreParallelMask:
+
+    def test_GivenVectorArrays_ReturnSameAsAreParallel(self):
+        a = array([[1, 0, 0], [1, 2, 3], [1, 0, 0], [0, 0, 0], [1, 0, 0]])
+        b = array([[-2, 0, 0], [2, 4, 6], [1, 1, 0], [0, 0, 0], [0, 0, 0]])
+        expected = [are_parallel(a_i, b_i) for a_i, b_i in zip(a, b)]
+        assert array_equal(are_parallel_mask(a, b), expected)
+
+    def test_GivenBroadcastableVectors_ReturnBroadcastShape(self):
+        a = RandomState(0).uniform(-1, 1, (4, 1, 3))
+        b = array([[1, 0, 0], [0, 1, 0]])
+        assert are_parallel_mask(a, b).shape == (4, 2)
+        assert are_parallel_mask(a, a).all()
+
+    def test_GivenFourDimensionalVectors_RaiseValueError(self):
+        with pytest.raises(ValueError):
+            are_parallel_mask(array([1, 0, 0, 0]), array([1, 0, 0, 0]))
+
+
+class TestAreAntiparallelMask:
+
+    def test_GivenVectorArrays_ReturnSameAsAreAntiparallel(self):
+        a = array([[1, 0, 0], [1, 2, 3], [1, 0, 0], [0, 0, 0], [1, 0, 0]])
+        b = array([[-2, 0, 0], [2, 4, 6], [-1, 1, 0], [0, 0, 0], [0, 0, 0]])
+        expected = [
+            are_antiparallel(a_i, b_i) for a_i, b_i in zip(a, b)]
+        assert array_equal(are_antiparallel_mask(a, b), expected)
+        assert array_equal(expected, [True, False, False, False, False])
+
+    def test_GivenBroadcastableVectors_ReturnBroadcastShape(self):
+        a = RandomState(0).uniform(-1, 1, (4, 1, 3))
+        b = array([[1, 0, 0], [0, 1, 0]])
+        assert are_antiparallel_mask(a, b).shape == (4, 2)
+        assert are_antiparallel_mask(a, -a).all()
+
+
+class TestScalarKernels:
+
+    def test_GivenRandomVectors_ReturnSameAsNumPy(self):
+        random_state = RandomState(0)
+        for a, b, c in random_state.uniform(-10, 10, (100, 3, 3)):
+            assert allclose(_cross(a, b), cross(a, b))
+            assert isclose(_dot(a, b), dot(a, b))
+            assert isclose(_norm(a), norm(a))
+            assert isclose(_det(a, b, c), det([a, b, c]))
+
+    @pytest.mark.parametrize(
+        ('a', 'b'),
+        [
+            (0.0, 0.0),
+            (1.0, 1.0 + 1e-9),
+            (1.0, 1.1),
+            (1e-9, 0.0),
+            (inf, inf),
+            (inf, -inf),
+            (nan, 0.0),
+            (nan, nan)
+        ]
+    )
+    def test_GivenNumbers_ReturnSameAsNumPyIsClose(self, a, b):
+        assert _isclose(a, b) == isclose(a, b)
+
+    def test_GivenZeroDivisors_ReturnSameAsNumPy(self):
+        assert _divide([1.0, -1.0, 0.0], [0.0, 0.0, 0.0])[:2] == [inf, -inf]
+        assert _nanmean(_divide([0.0, 2.0, 0.0], [0.0, 1.0, 0.0])) == 2.0
+        assert isnan(_nanmean(_divide([0.0, 0.0, 0.0], [0.0, 0.0, 0.0])))